@@ -35,7 +35,8 @@ async function fetchSnapshot(version) {
 export default async function handler() {
   const headers = {
     'Content-Type': 'application/json',
-    'Cache-Control': 's-maxage=300, stale-while-revalidate=900'
+    // currency-api publishes one snapshot a day; an hour at the edge is plenty fresh.
+    'Cache-Control': 's-maxage=3600, stale-while-revalidate=86400'
   };
 
   try {
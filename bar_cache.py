@@ -0,0 +1,102 @@
+"""Persistent per-ticker cache of completed daily sessions.
+
+`apply_completed_close_changes` only needs the last two completed closes and
+the latest session's high/low, so once a ticker's year of history is stored
+each build asks Yahoo for a few days and merges them in. A full year is
+fetched again only when the cache is missing, has a gap the short window
+cannot bridge, or Yahoo reports a split or dividend (which can rewrite
+history).
+
+Bars live in the columnar price store (see price_store); only the set of
+corporate actions already folded in is kept alongside, as `actions.json`.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import threading
+from datetime import date
+from typing import Any
+
+from price_store import FIELDS, PRICE_STORE, PriceStore, session_stamp, stamp_date
+from stage_scheduler import abandoned
+
+FULL_RANGE = "1y"
+RECENT_RANGE = "5d"
+# A 5-trading-day window safely bridges this many calendar days.
+MAX_GAP_DAYS = 5
+
+
+class BarCache:
+    def __init__(self, prices: PriceStore) -> None:
+        self.prices = prices
+        self._lock = threading.Lock()
+
+    def load(self, ticker: str) -> list[dict[str, Any]]:
+        columns = self.prices.read(ticker)
+        bars = []
+        for index, stamp in enumerate(columns["timestamp"].tolist()):
+            bar = {"date": stamp_date(stamp).isoformat(), "timestamp": stamp}
+            for field in FIELDS:
+                if field != "timestamp":
+                    value = float(columns[field][index])
+                    bar[field] = None if math.isnan(value) else value
+            bars.append(bar)
+        return bars
+
+    def known_actions(self, ticker: str) -> set[str]:
+        try:
+            return set(json.loads((self.prices.folder_for(ticker) / "actions.json").read_text(encoding="utf-8")))
+        except (OSError, ValueError):
+            return set()
+
+    def _store_actions(self, ticker: str, actions: set[str]) -> None:
+        if abandoned():
+            return
+        path = self.prices.folder_for(ticker) / "actions.json"
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(sorted(actions)), encoding="utf-8")
+            os.replace(tmp, path)
+        except OSError:
+            tmp.unlink(missing_ok=True)
+
+    def range_for(self, ticker: str, today: date) -> str:
+        """Yahoo chart range needed to bring `ticker` up to date."""
+        stamps = self.prices.read(ticker)["timestamp"]
+        if not len(stamps):
+            return FULL_RANGE
+        last = stamp_date(int(stamps[-1]))
+        return RECENT_RANGE if (today - last).days <= MAX_GAP_DAYS else FULL_RANGE
+
+    def merge(
+        self,
+        ticker: str,
+        fresh: list[dict[str, Any]],
+        *,
+        actions: set[str] = frozenset(),
+        replace: bool = False,
+    ) -> list[dict[str, Any]]:
+        """Fold freshly fetched completed sessions into the cache and return all bars.
+
+        `replace` discards the stored history (after a full re-fetch).
+        """
+        rows = [{**bar, "timestamp": session_stamp(date.fromisoformat(bar["date"]))} for bar in fresh]
+        with self._lock:
+            self.prices.upsert(ticker, rows, replace=replace)
+            known = self.known_actions(ticker)
+            if set(actions) - known:
+                self._store_actions(ticker, known | set(actions))
+        return self.load(ticker)
+
+
+def corporate_actions(result: dict[str, Any]) -> set[str]:
+    """Split and dividend events in a Yahoo chart result, as stable keys."""
+    events = result.get("events") or {}
+    return {f"{kind}:{stamp}" for kind in ("splits", "dividends") for stamp in (events.get(kind) or {})}
+
+
+BAR_CACHE = BarCache(PRICE_STORE)
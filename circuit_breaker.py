@@ -0,0 +1,132 @@
+"""Per-host circuit breaker persisted between builds.
+
+A host that fails `FAILURE_THRESHOLD` times in a row is opened: requests to
+it are refused immediately for `COOL_DOWN_SECONDS` instead of burning a full
+timeout each. After the cool-down the breaker is half-open and requests go
+through again, so a whole fan-out batch gets its trial together; the first
+success closes the breaker, the first failure re-opens it. The cool-down is
+shorter than the 4h Signal Feed cadence, so each scheduled run retries.
+
+Hosts that front independent resources (one Nitter timeline per account)
+are keyed by host plus leading path segments (`circuit_key`), so one dead
+account cannot open the breaker for the rest.
+
+State is kept in `.cache/circuit_breaker.json` so the site build and the
+Signal Feed job both remember which upstreams were dead last run.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlsplit
+
+import requests
+
+from response_cache import CACHE_DIR
+
+FAILURE_THRESHOLD = 3
+COOL_DOWN_SECONDS = 3 * 60 * 60
+# Leading path segments that identify an independent upstream on these hosts.
+PATH_SCOPED_HOSTS = {"nitter.net": 1}
+# Statuses that mean "this host will not serve us right now".
+FAILURE_STATUSES = {402, 403, 429}
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Raised instead of contacting a host whose breaker is open."""
+
+
+def circuit_key(url: str) -> str:
+    """Breaker key for `url`: its host, plus leading path segments on PATH_SCOPED_HOSTS."""
+    parts = urlsplit(url)
+    host = parts.hostname or ""
+    depth = PATH_SCOPED_HOSTS.get(host)
+    if not depth:
+        return host
+    segments = [segment for segment in parts.path.split("/") if segment][:depth]
+    return "/".join([host, *segments])
+
+
+class CircuitBreaker:
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._hosts: dict[str, dict[str, Any]] | None = None
+        self._dirty: set[str] = set()
+        self.skipped: dict[str, int] = {}
+
+    def _state(self) -> dict[str, dict[str, Any]]:
+        if self._hosts is None:
+            try:
+                self._hosts = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                self._hosts = {}
+        return self._hosts
+
+    def before_request(self, host: str) -> None:
+        """Raise CircuitOpenError unless a request to `host` may go out now."""
+        with self._lock:
+            entry = self._state().get(host)
+            if not entry or not entry.get("opened_at"):
+                return
+            if time.time() - entry["opened_at"] < COOL_DOWN_SECONDS:
+                self.skipped[host] = self.skipped.get(host, 0) + 1
+                raise CircuitOpenError(f"circuit open for {host} after {entry['failures']} failures")
+            # Half-open: let requests through until one of them reports back.
+
+    def record(self, host: str, ok: bool) -> None:
+        with self._lock:
+            hosts = self._state()
+            entry = hosts.get(host) or {"failures": 0, "opened_at": None}
+            if ok:
+                if not entry["failures"] and not entry["opened_at"]:
+                    return
+                if entry["opened_at"]:
+                    print(f"    🔌 {host} recovered; circuit closed")
+                hosts.pop(host, None)
+            else:
+                entry["failures"] += 1
+                if entry["opened_at"] or entry["failures"] >= FAILURE_THRESHOLD:
+                    if not entry["opened_at"]:
+                        print(f"    🔌 {host} failed {entry['failures']}x; circuit open for {COOL_DOWN_SECONDS // 3600}h")
+                    entry["opened_at"] = time.time()
+                hosts[host] = entry
+            self._dirty.add(host)
+        self.save()
+
+    def save(self) -> None:
+        """Merge this process's changes into the state file atomically."""
+        with self._lock:
+            if not self._dirty:
+                return
+            try:
+                on_disk = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                on_disk = {}
+            hosts = self._state()
+            for host in self._dirty:
+                if host in hosts:
+                    on_disk[host] = hosts[host]
+                else:
+                    on_disk.pop(host, None)
+            self._dirty.clear()
+            tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp.write_text(json.dumps(on_disk, indent=2, sort_keys=True), encoding="utf-8")
+                os.replace(tmp, self.path)
+            except OSError:
+                tmp.unlink(missing_ok=True)
+
+    def summary(self) -> dict[str, Any]:
+        with self._lock:
+            open_hosts = sorted(host for host, entry in self._state().items() if entry.get("opened_at"))
+            return {"open": open_hosts, "skipped": dict(self.skipped)}
+
+
+BREAKER = CircuitBreaker(CACHE_DIR / "circuit_breaker.json")
@@ -4,15 +4,17 @@ from datetime import date, datetime
 from html import escape
 from pathlib import Path
 
+from keyword_matcher import matcher_for
+
 MARKET_TERMS = ("stocks", "futures", "yields", "bonds", "wall street", "nasdaq", "s&p", "dow ", "fed sends", "dollar jumps", "dollar dumps")
 GEO_TERMS = ("china", "russia", "ukraine", "iran", "israel", "war", "tariff", "sanction", "nato", "taiwan", "oil")
 
 
 def _pick(items, terms, skip=None):
     skip = skip or set()
+    matcher = matcher_for(tuple(terms))
     for item in items or []:
-        title = str(item.get("title", ""))
-        if item.get("url") not in skip and any(term in title.lower() for term in terms):
+        if item.get("url") not in skip and matcher.matches(str(item.get("title", ""))):
             return item
     return next((item for item in (items or []) if item.get("url") not in skip), {"title": "No verified headline available", "url": "#"})
 
@@ -127,7 +129,7 @@ def render_daily_html(*, portfolio_data, holdings, tracker_model, kraken_meta, c
     cards = "".join(_account_card(model, net_worth_previous_cad) for model in models)
 
     market = _pick(zh_news, MARKET_TERMS)
-    if not any(term in str(market.get("title", "")).lower() for term in MARKET_TERMS):
+    if not matcher_for(MARKET_TERMS).matches(str(market.get("title", ""))):
         market = {"title": "Market-close report pending the 4:15 PM ET scan", "url": "#"}
     geopolitical = _pick(zh_news, GEO_TERMS, {market.get("url")})
     movers = []
@@ -0,0 +1,160 @@
+"""Incremental RSS/Atom parsing shared by every feed consumer.
+
+Feeds are pushed through an `XMLPullParser` in chunks and each `<item>` or
+`<entry>` is yielded as soon as it closes, then dropped from the tree. A
+consumer that stops iterating stops the parse, so "the latest 20 items" of
+a long feed never reads past item 20. HTML summaries are reduced to text
+with a regex pass rather than a DOM.
+
+Every item is a dict:
+
+- `title`, `link`, `guid`, `summary` and `source` as whitespace-normalized text
+- `published` as an aware datetime, or None
+- `fields`: the first text of every descendant tag, keyed by local name
+  (e.g. `videoId`)
+- `attrs`: the attributes of every descendant tag that has any (e.g. the
+  `statistics` views)
+"""
+
+from __future__ import annotations
+
+import html
+import re
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Iterable, Iterator
+from xml.etree.ElementTree import Element, ParseError, XMLPullParser
+
+CHUNK_SIZE = 64 * 1024
+ITEM_TAGS = frozenset({"item", "entry"})
+SUMMARY_TAGS = ("description", "summary", "content", "encoded")
+DATE_TAGS = ("pubDate", "published", "updated", "date")
+
+_SKIPPED_HTML = re.compile(r"<(script|style)\b.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+_HTML_TAG = re.compile(r"<[^>]+>")
+_LEADING_JUNK = re.compile(rb"^(\xef\xbb\xbf|\s)+")
+
+
+class FeedError(ValueError):
+    """The feed could not be parsed into a single item."""
+
+
+def local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1].rsplit(":", 1)[-1]
+
+
+def squash(text: str | None) -> str:
+    return " ".join((text or "").split())
+
+
+def strip_html(text: str | None) -> str:
+    """Plain text from an HTML fragment without building a DOM."""
+    if not text:
+        return ""
+    text = _HTML_TAG.sub(" ", _SKIPPED_HTML.sub(" ", text))
+    return squash(html.unescape(text))
+
+
+def parse_date(raw: str | None) -> datetime | None:
+    """RFC 822 (RSS) or ISO 8601 (Atom) timestamp as an aware datetime."""
+    raw = (raw or "").strip()
+    if not raw:
+        return None
+    try:
+        stamp = parsedate_to_datetime(raw)
+    except (TypeError, ValueError, IndexError):
+        try:
+            stamp = datetime.fromisoformat(raw.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    return stamp if stamp.tzinfo else stamp.replace(tzinfo=timezone.utc)
+
+
+def _item(element: Element) -> dict[str, Any]:
+    fields: dict[str, str] = {}
+    attrs: dict[str, dict[str, str]] = {}
+    link = ""
+    for child in element.iter():
+        if child is element:
+            continue
+        name = local_name(child.tag)
+        text = (child.text or "").strip()
+        if text:
+            fields.setdefault(name, text)
+        if child.attrib:
+            attrs.setdefault(name, {local_name(key): value for key, value in child.attrib.items()})
+        if name == "link" and not link:
+            # RSS carries the URL as text; Atom as href on the alternate link.
+            if text:
+                link = text
+            elif child.get("href") and child.get("rel", "alternate") == "alternate":
+                link = child.get("href")
+    summary = next((fields[tag] for tag in SUMMARY_TAGS if tag in fields), "")
+    published = next((parse_date(fields[tag]) for tag in DATE_TAGS if tag in fields), None)
+    return {
+        "title": squash(fields.get("title")),
+        "link": link or fields.get("guid") or fields.get("id") or "",
+        "guid": fields.get("guid") or fields.get("id") or "",
+        "summary": strip_html(summary),
+        "source": squash(fields.get("source")),
+        "published": published,
+        "fields": fields,
+        "attrs": attrs,
+    }
+
+
+def _chunks(source: bytes | str | Iterable[bytes]) -> Iterator[bytes]:
+    if isinstance(source, str):
+        source = source.encode("utf-8")
+    if isinstance(source, (bytes, bytearray)):
+        data = _LEADING_JUNK.sub(b"", bytes(source))
+        for start in range(0, len(data), CHUNK_SIZE):
+            yield data[start:start + CHUNK_SIZE]
+        return
+    first = True
+    for chunk in source:
+        if first and chunk:
+            chunk = _LEADING_JUNK.sub(b"", chunk)
+            first = not chunk
+        if chunk:
+            yield chunk
+
+
+def iter_feed(source: bytes | str | Iterable[bytes]) -> Iterator[dict[str, Any]]:
+    """Yield normalized items from an RSS or Atom document as they close.
+
+    `source` is the raw document or an iterable of byte chunks (e.g.
+    `response.iter_content()`). A document that breaks after some items
+    yields those items and stops; one that yields nothing raises FeedError.
+    """
+    parser = XMLPullParser(events=("start", "end"))
+    stack: list[Element] = []
+    produced = 0
+    try:
+        for chunk in _chunks(source):
+            parser.feed(chunk)
+            for event, element in parser.read_events():
+                if event == "start":
+                    stack.append(element)
+                    continue
+                stack.pop()
+                if local_name(element.tag) in ITEM_TAGS:
+                    item = _item(element)
+                    if stack:
+                        stack[-1].remove(element)
+                    produced += 1
+                    yield item
+        parser.close()
+    except ParseError as exc:
+        if not produced:
+            raise FeedError(f"unparseable feed: {exc}") from exc
+
+
+def parse_feed(source: bytes | str | Iterable[bytes], limit: int | None = None) -> list[dict[str, Any]]:
+    """The first `limit` items (all when None); parsing stops once they are read."""
+    items = []
+    for item in iter_feed(source):
+        items.append(item)
+        if limit is not None and len(items) >= limit:
+            break
+    return items
@@ -22,7 +22,8 @@ from portfolio_tracker import (
     SHEET_ID as PORTFOLIO_SHEET_ID,
     TFSA_GID,
     _fetch_sheet_rows,
-    fetch_rrsp_totals,
+    fetch_rrsp_rows,
+    parse_rrsp_rows,
     build_tracker_model,
     fetch_kraken_totals,
     load_history as load_portfolio_history,
@@ -31,6 +32,22 @@ from portfolio_tracker import (
     upsert_daily_snapshot,
 )
 from daily_brief import write_daily
+import http_client
+import response_cache
+from bar_cache import BAR_CACHE, FULL_RANGE, corporate_actions
+from circuit_breaker import BREAKER
+from feed_parser import iter_feed, parse_feed
+from headline_store import HEADLINES
+from keyword_matcher import KeywordMatcher
+from price_store import PRICE_STORE, bars_from_chart
+from quote_plan import CLOSE, HISTORY, LAST, RANGE, QuotePlan
+from quote_providers import QUOTES, QuoteProvider
+from hedging import hedged, summary as hedging_summary
+from rate_limiter import RATE_LIMITER
+from run_trace import TRACE
+from run_cache import RUN_CACHE, run_cached
+from stage_scheduler import LastGoodStore, Stage, run_stages
+from valuation import daily_pnl, group_totals, value_positions
 import warnings
 warnings.filterwarnings("ignore", category=XMLParsedAsHTMLWarning)
 
@@ -45,6 +62,23 @@ except Exception:
 # ─────────────────────────────────────────────────────────────
 OUTPUT = "/tmp/novaire-signal/index.html"
 
+# Upstream fetches run concurrently; keep the pool small enough that no single
+# provider sees a burst from one build.
+FETCH_WORKERS = 8
+DEFAULT_FX = {"usdcad": 1.365, "audusd": 0.630}
+
+# yfinance calls bypass http_client; they still take a token from Yahoo's bucket.
+YAHOO_HOST = "query1.finance.yahoo.com"
+# Yahoo's spark endpoint accepts up to 20 symbols per request.
+YAHOO_SPARK_BATCH = 20
+
+# The Actions job is killed at 20 minutes. Fetching must be done by this many
+# seconds so rendering, the Evolution Fund page and the git push still fit.
+RUN_DEADLINE_SECONDS = 15 * 60
+RUN_TRACE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "run_trace.json")
+# Stages that overrun (or fail) fall back to the last good result stored here.
+STAGE_CACHE_DIR = os.path.join(response_cache.CACHE_DIR, "stages")
+
 MARKET_FUTURES = {
     "ES=F": {"label": "S&P 500", "short": "S&P FUT"},
     "NQ=F": {"label": "Nasdaq 100", "short": "NASDAQ FUT"},
@@ -62,6 +96,21 @@ CRYPTO_BINANCE_PAIRS = {
     "TON": "GRAMUSDT", "SUI": "SUIUSDT", "ZEC": "ZECUSDT", "NIGHT": "NIGHTUSDT",
 }
 
+EVO_HOLDINGS = [
+    {"ticker": "PHYS",  "name": "Gold (Sprott)",         "shares": 16827, "avg_entry": 36.95},
+    {"ticker": "URNM",  "name": "Uranium",               "shares": 6000,  "avg_entry": 67.72},
+    {"ticker": "GRID",  "name": "Grid Infrastructure",   "shares": 2177,  "avg_entry": 176.81},
+    {"ticker": "PSLV",  "name": "Silver (Sprott)",       "shares": 8545,  "avg_entry": 29.02},
+    {"ticker": "COPX",  "name": "Copper Miners",         "shares": 2000,  "avg_entry": 83.96},
+    {"ticker": "COPP",  "name": "Copper",                "shares": 5047,  "avg_entry": 43.60},
+    {"ticker": "URNJ",  "name": "Jr Uranium",            "shares": 3151,  "avg_entry": 34.91},
+    {"ticker": "SGDJ",  "name": "Gold Miners",           "shares": 1002,  "avg_entry": 109.73},
+    {"ticker": "AAPL",  "name": "Apple",                 "shares": 31,    "avg_entry": 261.55},
+    {"ticker": "CEG",   "name": "Constellation Energy",  "shares": 177,   "avg_entry": 312.30},
+    {"ticker": "VST",   "name": "Vistra Energy",         "shares": 322,   "avg_entry": 170.54},
+]
+EVO_BTC = {"shares": 6.72, "avg_entry": 65500.00, "name": "Bitcoin (8% alloc)"}
+
 # PERMANENT PRODUCT RULE — explicitly rejected by Novaire (2026-08-15):
 # The five-lane daily product-voting module is retired. Never restore, rename,
 # redesign, or regenerate it. Daily Action Steps come only from the Keystone.
@@ -181,22 +230,24 @@ def fetch_live_instagram_metrics(item):
         return item
     shortcode = match.group(1)
     try:
-        session = requests.Session()
-        session.headers.update({
+        # Shared transport, so the run deadline and circuit breaker apply; the
+        # home page's cookies ride along explicitly on the GraphQL calls.
+        headers = {
             "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 Chrome/138 Safari/537.36",
             "X-IG-App-ID": "936619743392459",
-        })
-        session.get("https://www.instagram.com/", timeout=20).raise_for_status()
-        csrf = session.cookies.get("csrftoken", "")
-        headers = {"X-CSRFToken": csrf, "Referer": item["url"]}
+        }
+        home = http_client.get("https://www.instagram.com/", headers=headers, timeout=20)
+        home.raise_for_status()
+        cookies = home.cookies
+        headers = {**headers, "X-CSRFToken": cookies.get("csrftoken", ""), "Referer": item["url"]}
         variables = {
             "shortcode": shortcode,
             "__relay_internal__pv__PolarisAIGMMediaWebLabelEnabledrelayprovider": False,
         }
-        response = session.post(
+        response = http_client.post(
             "https://www.instagram.com/graphql/query",
             data={"doc_id": "27128499623469141", "variables": json.dumps(variables, separators=(",", ":"))},
-            headers=headers, timeout=20,
+            headers=headers, cookies=cookies, timeout=20,
         )
         response.raise_for_status()
         items = (((response.json().get("data") or {}).get("xdt_api__v1__media__shortcode__web_info") or {}).get("items") or [])
@@ -207,10 +258,10 @@ def fetch_live_instagram_metrics(item):
         current["views"] = _safe_int(media.get("play_count") or media.get("view_count"))
         if current["views"] is None and (media.get("user") or {}).get("pk"):
             clips_vars = {"data": {"include_feed_video": True, "page_size": 12, "target_user_id": str(media["user"]["pk"])}}
-            clips = session.post(
+            clips = http_client.post(
                 "https://www.instagram.com/graphql/query",
                 data={"doc_id": "27234427476213202", "variables": json.dumps(clips_vars, separators=(",", ":"))},
-                headers=headers, timeout=20,
+                headers=headers, cookies=cookies, timeout=20,
             )
             clips.raise_for_status()
             edges = (((clips.json().get("data") or {}).get("xdt_api__v1__clips__user__connection_v2") or {}).get("edges") or [])
@@ -249,28 +300,25 @@ def fetch_latest_novaire_content():
         "instagram": instagram,
     }
     try:
-        response = requests.get(
+        response = http_client.get(
             SECOND_RENAISSANCE_FEED,
             headers={"User-Agent": "NovaireSignal/1.0"},
             timeout=10,
         )
         response.raise_for_status()
-        soup = BeautifulSoup(response.text, "xml")
         entries = []
-        for entry in soup.find_all("entry"):
-            video_id = entry.find("yt:videoId") or entry.find("videoId")
-            title = entry.find("title")
-            description = entry.find("media:description") or entry.find("description")
-            stats = entry.find("media:statistics") or entry.find("statistics")
-            rating = entry.find("media:starRating") or entry.find("starRating")
-            if not video_id or not title:
+        for entry in iter_feed(response.content):
+            video_id = entry["fields"].get("videoId")
+            if not video_id or not entry["title"]:
                 continue
+            stats = entry["attrs"].get("statistics")
+            rating = entry["attrs"].get("starRating")
             entries.append({
-                "title": title.get_text(strip=True),
-                "url": f"https://www.youtube.com/watch?v={video_id.get_text(strip=True)}",
+                "title": entry["title"],
+                "url": f"https://www.youtube.com/watch?v={video_id}",
                 "views": _safe_int(stats.get("views")) if stats else None,
                 "likes": _safe_int(rating.get("count")) if rating else None,
-                "description": description.get_text(" ", strip=True) if description else "",
+                "description": entry["summary"],
             })
 
         if entries:
@@ -306,6 +354,10 @@ RADAR_MOONSHOT_SUBS = [
 
 RADAR_CRYPTO_KEYWORDS  = {"coin","token","crypto","blockchain","gem","defi","layer","launch","project","airdrop","protocol","nft","dao","yield","swap","staking","presale","altcoin","bull","pump"}
 RADAR_RESOURCE_KEYWORDS = {"stock","mining","uranium","silver","gold","exploration","drill","cap","copper","lithium","junior","ounce","resource","deposit","mineral","graphene","platinum","vanadium","zinc"}
+RADAR_MATCHERS = {
+    "crypto": KeywordMatcher(RADAR_CRYPTO_KEYWORDS),
+    "resource": KeywordMatcher(RADAR_RESOURCE_KEYWORDS),
+}
 
 RADAR_STATIC_FALLBACK = [
     {"title": "New AI crypto infrastructure projects launching weekly — scan r/CryptoMoonShots daily for sub-$50M cap gems.", "source": ""},
@@ -315,6 +367,7 @@ RADAR_STATIC_FALLBACK = [
     {"title": "DeFi protocol with real yield and sub-$10M TVL — early entry before any major exchange listing.", "source": ""},
 ]
 
+@run_cached
 def fetch_fed_signal():
     """Hardcoded Fed Signal data. Update when FOMC decisions change."""
     from datetime import date as _date
@@ -348,20 +401,21 @@ def fetch_radar_moonshots():
     cutoff = now - timedelta(hours=24)
     posts  = {"crypto": [], "resource": []}
 
-    for sub, category in RADAR_MOONSHOT_SUBS:
+    responses = http_client.get_many(
+        [f"https://www.reddit.com/r/{sub}/hot.json?limit=15" for sub, _ in RADAR_MOONSHOT_SUBS],
+        headers={"User-Agent": "NovaireSignal/1.0"},
+        timeout=8,
+    )
+    for (sub, category), r in zip(RADAR_MOONSHOT_SUBS, responses):
         try:
-            r = requests.get(
-                f"https://www.reddit.com/r/{sub}/hot.json?limit=15",
-                headers={"User-Agent": "NovaireSignal/1.0"},
-                timeout=8,
-            )
+            if isinstance(r, Exception):
+                raise r
             for post in r.json().get("data", {}).get("children", []):
                 d       = post.get("data", {})
                 created = datetime.fromtimestamp(d.get("created_utc", 0), tz=timezone.utc)
                 title   = (d.get("title") or "").strip()
                 score   = d.get("score", 0)
-                kws     = RADAR_CRYPTO_KEYWORDS if category == "crypto" else RADAR_RESOURCE_KEYWORDS
-                relevant = any(kw in title.lower() for kw in kws)
+                relevant = RADAR_MATCHERS[category].matches(title)
                 if (created >= cutoff and not d.get("stickied")
                         and len(title) > 25 and score >= 5 and relevant):
                     posts[category].append({
@@ -761,26 +815,9 @@ def daily_signal_edition(value=None):
 
 def position_weighted_daily_gain_loss(positions):
     """Return daily dollar P&L and return from current values plus daily % moves."""
-    current_total = 0.0
-    previous_total = 0.0
-    for position in positions or []:
-        value = position.get("value")
-        change = position.get("change")
-        if value is None or change is None:
-            continue
-        try:
-            value = float(value)
-            change = float(change)
-        except (TypeError, ValueError):
-            continue
-        divisor = 1.0 + change / 100.0
-        if divisor <= 0:
-            continue
-        current_total += value
-        previous_total += value / divisor
-    amount = current_total - previous_total
-    percent = (amount / previous_total * 100.0) if previous_total else 0.0
-    return amount, percent
+    positions = positions or []
+    return daily_pnl([position.get("value") for position in positions],
+                     [position.get("change") for position in positions])
 
 def show_biweekly_monday_section():
     """Show low-frequency strategic sections only every two weeks on Monday, Bangkok time."""
@@ -883,7 +920,6 @@ def is_fresh_news(pub_str, market_days=2):
 
 def fetch_weather():
     results = []
-    session = requests.Session()
     headers = {"User-Agent": "NovaireSignal/1.0 (+https://novairesignal.com)"}
     cache_path = os.path.join(os.path.dirname(__file__), "weather_cache.json")
     try:
@@ -896,7 +932,7 @@ def fetch_weather():
         last_err = None
         for attempt in range(attempts):
             try:
-                r = session.get(url, headers=headers, timeout=timeout)
+                r = http_client.get(url, headers=headers, timeout=timeout)
                 r.raise_for_status()
                 return r.json()
             except Exception as e:
@@ -966,21 +1002,47 @@ def fetch_weather():
         print(f"    ⚠️  Weather cache write failed: {e}")
     return results
 
+EXPAT_RELEVANT_TERMS = (
+    "visa", "immigration", "expat", "foreigner", "foreign", "tourist", "bangkok",
+    "phuket", "pattaya", "chiang mai", "arrest", "scam", "police", "crime",
+    "crackdown", "overstay", "tax", "condo", "rent", "baht", "airport", "safety",
+    "nightlife", "cannabis", "alcohol", "digital wallet", "health insurance",
+)
+EXPAT_REJECT_TERMS = (
+    "lottery", "football", "volleyball", "monk", "temple fair", "rice", "durian",
+    "school sports", "village chief",
+)
+EXPAT_VISA_TERMS = frozenset({"visa", "immigration", "overstay", "foreigner", "expat"})
+EXPAT_CRIME_TERMS = frozenset({"arrest", "scam", "police", "crime", "crackdown"})
+EXPAT_CITY_TERMS = frozenset({"bangkok", "phuket", "pattaya", "chiang mai"})
+# +3 per relevant term, -4 per reject term; the group bonuses ride the same scan.
+EXPAT_MATCHER = KeywordMatcher({**dict.fromkeys(EXPAT_RELEVANT_TERMS, 3), **dict.fromkeys(EXPAT_REJECT_TERMS, -4)})
+
+
+def expat_score(title, summary=""):
+    """Rank a Thailand headline for expat relevance in one keyword scan."""
+    found = EXPAT_MATCHER.found(title + " " + summary)
+    points = sum(EXPAT_MATCHER.weights[term] for term in found)
+    if found & EXPAT_VISA_TERMS:
+        points += 8
+    if found & EXPAT_CRIME_TERMS:
+        points += 5
+    if found & EXPAT_CITY_TERMS:
+        points += 2
+    return points
+
+
 def fetch_bangkok_post():
-    """Return expat-relevant Thailand headlines, not random local filler."""
-    headlines = []
+    """Return expat-relevant Thailand headlines, not random local filler.
+
+    Items go through HEADLINES, so only headlines no earlier run has seen
+    are scored. If this run's feeds are too thin, the last two days of
+    stored headlines stand in.
+    """
+    run_started = datetime.now(timezone.utc)
+    items = []
     seen = set()
     headers = {"User-Agent": "Mozilla/5.0 (compatible; Googlebot/2.1)"}
-    relevant_terms = [
-        "visa", "immigration", "expat", "foreigner", "foreign", "tourist", "bangkok",
-        "phuket", "pattaya", "chiang mai", "arrest", "scam", "police", "crime",
-        "crackdown", "overstay", "tax", "condo", "rent", "baht", "airport", "safety",
-        "nightlife", "cannabis", "alcohol", "digital wallet", "health insurance"
-    ]
-    reject_terms = [
-        "lottery", "football", "volleyball", "monk", "temple fair", "rice", "durian",
-        "school sports", "village chief"
-    ]
     sources = [
         ("The Thaiger", "https://thethaiger.com/feed"),
         ("Thai Examiner", "https://www.thaiexaminer.com/feed/"),
@@ -988,19 +1050,7 @@ def fetch_bangkok_post():
         ("Bangkok Post", "https://www.bangkokpost.com/rss/data/topstories.xml"),
     ]
 
-    def score(title, summary=""):
-        text = (title + " " + summary).lower()
-        points = sum(3 for term in relevant_terms if term in text)
-        points -= sum(4 for term in reject_terms if term in text)
-        if any(term in text for term in ["visa", "immigration", "overstay", "foreigner", "expat"]):
-            points += 8
-        if any(term in text for term in ["arrest", "scam", "police", "crime", "crackdown"]):
-            points += 5
-        if any(term in text for term in ["bangkok", "phuket", "pattaya", "chiang mai"]):
-            points += 2
-        return points
-
-    def add_item(title, url, source, summary=""):
+    def add_item(title, url, source, summary="", published=None):
         title = " ".join((title or "").split())
         if len(title) < 28:
             return
@@ -1008,49 +1058,33 @@ def fetch_bangkok_post():
         if key in seen:
             return
         seen.add(key)
-        headlines.append({
+        items.append({
             "title": title,
             "url": url or "#",
             "source": source,
-            "summary": " ".join((summary or "").split())[:180],
-            "score": score(title, summary),
+            "summary": " ".join((summary or "").split()),
+            "published": published,
         })
 
+    def current():
+        HEADLINES.ingest("expat", items, score=lambda item: expat_score(item["title"], item["summary"]))
+        items.clear()
+        return HEADLINES.recent("expat", seen_since=run_started, order="score")
+
     for source, url in sources:
         try:
-            r = requests.get(url, headers=headers, timeout=12)
+            r = http_client.get(url, headers=headers, timeout=12)
             r.raise_for_status()
-            soup = BeautifulSoup(r.text, "html.parser")
-            items = soup.find_all("item") or soup.find_all("entry")
-            for item in items[:20]:
-                title_el = item.find("title")
-                link_el = item.find("link")
-                desc_el = item.find("description") or item.find("summary")
-                guid_el = item.find("guid")
-                title = title_el.get_text(" ", strip=True) if title_el else ""
-                href = ""
-                if link_el:
-                    href = link_el.get("href") or link_el.get_text(" ", strip=True)
-                    # Bangkok Post RSS currently emits a self-closing <link/> tag
-                    # followed by the URL as a text sibling, which BeautifulSoup's
-                    # HTML parser leaves outside link_el.get_text(). Preserve the
-                    # live source URL instead of degrading to '#'.
-                    if not href and getattr(link_el, "next_sibling", None):
-                        sibling = str(link_el.next_sibling).strip()
-                        if sibling.startswith("http"):
-                            href = sibling
-                if (not href or href == "#") and guid_el:
-                    href = guid_el.get_text(" ", strip=True)
-                raw_summary = desc_el.get_text(" ", strip=True) if desc_el else ""
-                summary = BeautifulSoup(raw_summary, "html.parser").get_text(" ", strip=True)
-                add_item(title, href, source, summary)
+            for item in parse_feed(r.content, limit=20):
+                add_item(item["title"], item["link"], source, item["summary"], item["published"])
         except Exception as e:
             print(f"    ⚠️  {source} expat feed unavailable: {e}")
+    stored = current()
 
     # Fallback scrape if RSS feeds are thin or blocked.
-    if len(headlines) < 3:
+    if len(stored) < 3:
         try:
-            r = requests.get("https://www.bangkokpost.com/thailand", headers=headers, timeout=12)
+            r = http_client.get("https://www.bangkokpost.com/thailand", headers=headers, timeout=12)
             soup = BeautifulSoup(r.text, "html.parser")
             for a in soup.find_all("a", href=True):
                 txt = a.get_text(" ", strip=True)
@@ -1059,12 +1093,21 @@ def fetch_bangkok_post():
                     href = "https://www.bangkokpost.com" + href
                 if "bangkokpost.com" in href or href.startswith("http"):
                     add_item(txt, href, "Bangkok Post")
-                if len(headlines) >= 8:
+                if len(stored) + len(items) >= 8:
                     break
         except Exception as e:
             print(f"    ⚠️  Bangkok Post fallback unavailable: {e}")
-
-    ranked = sorted(headlines, key=lambda x: x.get("score", 0), reverse=True)
+        stored = current()
+    if len(stored) < 3:
+        stored = HEADLINES.recent("expat", published_since=run_started - timedelta(hours=48), order="score")
+
+    ranked = []
+    titles = set()
+    for row in stored:
+        if row["title"].lower() not in titles:
+            titles.add(row["title"].lower())
+            ranked.append({"title": row["title"], "url": row["url"], "source": row["source"],
+                           "summary": row["summary"][:180], "score": row["score"] or 0})
     relevant = [h for h in ranked if h.get("score", 0) > 0]
     if relevant:
         return relevant[:3]
@@ -1090,7 +1133,7 @@ def fetch_trending_recs():
     # ── Movie: FlixPatrol trending → OMDB description ──
     try:
         hdrs = {"User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"}
-        r = requests.get("https://flixpatrol.com/top10/netflix/world/today/", headers=hdrs, timeout=10)
+        r = http_client.get("https://flixpatrol.com/top10/netflix/world/today/", headers=hdrs, timeout=10)
         soup = BeautifulSoup(r.text, "html.parser")
         tables = soup.find_all("table")
         candidates = []  # (title, platform, table_idx)
@@ -1109,7 +1152,7 @@ def fetch_trending_recs():
             raise ValueError("FlixPatrol returned no usable titles")
         movie_title, movie_platform = candidates[0]
         # Fetch OMDB description
-        omdb = requests.get(f"http://www.omdbapi.com/?t={requests.utils.quote(movie_title)}&apikey=trilogy", timeout=8).json()
+        omdb = http_client.get(f"http://www.omdbapi.com/?t={requests.utils.quote(movie_title)}&apikey=trilogy", timeout=8).json()
         if omdb.get("Response") == "True":
             genre = omdb.get("Genre", "")
             year  = omdb.get("Year", "")
@@ -1126,7 +1169,7 @@ def fetch_trending_recs():
     # ── Book: Amazon Business Bestsellers → Open Library description ──
     try:
         hdrs2 = {"User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36", "Accept-Language": "en-US,en;q=0.9"}
-        rb = requests.get("https://www.amazon.com/gp/bestsellers/books/2581/", headers=hdrs2, timeout=12)
+        rb = http_client.get("https://www.amazon.com/gp/bestsellers/books/2581/", headers=hdrs2, timeout=12)
         soup2 = BeautifulSoup(rb.text, "html.parser")
         book_title = None
         seen_b = set()
@@ -1140,7 +1183,7 @@ def fetch_trending_recs():
                     break
         if book_title:
             # Open Library search for description
-            ol = requests.get(f"https://openlibrary.org/search.json?q={requests.utils.quote(book_title)}&limit=1", timeout=8).json()
+            ol = http_client.get(f"https://openlibrary.org/search.json?q={requests.utils.quote(book_title)}&limit=1", timeout=8).json()
             docs = ol.get("docs", [])
             if docs:
                 doc = docs[0]
@@ -1159,49 +1202,50 @@ def fetch_trending_recs():
 
 
 def fetch_zerohedge():
-    """Fetch the latest ZeroHedge pool for the close-to-close Daily."""
-    import xml.etree.ElementTree as ET
+    """Fetch the latest ZeroHedge pool for the close-to-close Daily.
+
+    RSS items are kept in HEADLINES, so stories that have already rolled
+    out of the 25-item feed still fill the pool for 36 hours.
+    """
     headlines = []
     try:
         headers = {"User-Agent": "Mozilla/5.0 (compatible; Googlebot/2.1)"}
-        r = requests.get("https://feeds.feedburner.com/zerohedge/feed", headers=headers, timeout=12)
-        root = ET.fromstring(r.text)
-        cutoff = datetime.now(timezone.utc) - timedelta(hours=36)
-        for item in root.findall(".//item"):
-            title_el = item.find("title")
-            link_el  = item.find("link")
-            pub_el   = item.find("pubDate")
-            if title_el is None or link_el is None:
-                continue
-            title = title_el.text.strip()
-            link  = link_el.text.strip() if link_el.text else "#"
-            # Parse pubDate and filter
-            if pub_el is not None and pub_el.text:
-                try:
-                    from email.utils import parsedate_to_datetime
-                    pub_dt = parsedate_to_datetime(pub_el.text)
-                    if pub_dt < cutoff:
-                        continue  # skip anything older than 24h
-                except Exception:
-                    pass
-            if len(title) > 20:
-                headlines.append({"title": title, "url": link})
-            if len(headlines) >= 12:
-                break
+        run_started = datetime.now(timezone.utc)
+        cutoff = run_started - timedelta(hours=36)
+        try:
+            r = http_client.get("https://feeds.feedburner.com/zerohedge/feed", headers=headers, timeout=12)
+            HEADLINES.ingest("zerohedge", (
+                {"title": item["title"], "url": item["link"] or "#", "published": item["published"]}
+                for item in iter_feed(r.content) if len(item["title"]) > 20
+            ))
+        except Exception as e:
+            print(f"    ⚠️  ZeroHedge RSS unavailable; using stored headlines: {e}")
+        rss = [{"title": row["title"], "url": row["url"]}
+               for row in HEADLINES.recent("zerohedge", published_since=cutoff)]
+        headlines = rss[:12]
         # ZeroHedge's category page retains the 4:15 PM ET market wrap after it
         # has rolled out of the very fast-moving 25-item RSS window.
-        market_page = requests.get("https://www.zerohedge.com/markets", headers={"User-Agent": "Mozilla/5.0"}, timeout=12)
-        if market_page.ok:
-            soup = BeautifulSoup(market_page.text, "html.parser")
-            seen = {item["url"] for item in headlines}
-            for anchor in soup.select('a[href^="/markets/"]'):
-                title = " ".join(anchor.get_text(" ", strip=True).split())
-                link = "https://www.zerohedge.com" + str(anchor.get("href") or "")
-                if len(title) > 20 and link not in seen:
-                    headlines.append({"title": title, "url": link})
-                    seen.add(link)
-                if len(headlines) >= 40:
-                    break
+        try:
+            market_page = http_client.get("https://www.zerohedge.com/markets", headers={"User-Agent": "Mozilla/5.0"}, timeout=12)
+            if market_page.ok:
+                soup = BeautifulSoup(market_page.text, "html.parser")
+                anchors = []
+                for anchor in soup.select('a[href^="/markets/"]'):
+                    title = " ".join(anchor.get_text(" ", strip=True).split())
+                    if len(title) > 20:
+                        anchors.append({"title": title, "url": "https://www.zerohedge.com" + str(anchor.get("href") or "")})
+                HEADLINES.ingest("zerohedge_markets", anchors)
+        except Exception as e:
+            print(f"    ⚠️  ZeroHedge markets page unavailable; using stored headlines: {e}")
+        seen = {item["url"] for item in headlines}
+        markets = [{"title": row["title"], "url": row["url"]}
+                   for row in HEADLINES.recent("zerohedge_markets", seen_since=cutoff)]
+        for item in markets + rss[12:]:
+            if item["url"] not in seen:
+                headlines.append(item)
+                seen.add(item["url"])
+            if len(headlines) >= 40:
+                break
     except Exception as e:
         headlines = [{"title": f"ZeroHedge unavailable", "url": "#"}]
     return headlines[:40] if headlines else [{"title": "No headlines in last 36h", "url": "#"}]
@@ -1267,7 +1311,7 @@ def fetch_holdings_from_gsheet():
     holdings = []
     meta     = {}
     seen     = set()
-    allocation_totals = {}
+    allocation_rows = []
 
     for row in rows:
         while len(row) < 16:
@@ -1317,7 +1361,7 @@ def fetch_holdings_from_gsheet():
         # Covered-call rows are a separate strategy block and are intentionally
         # excluded from the sheet chart even though they remain in holdings.
         if note.casefold() != "ccalls" and allocation_pct and sector:
-            allocation_totals[sector] = allocation_totals.get(sector, 0.0) + allocation_pct
+            allocation_rows.append((sector, allocation_pct))
 
         display = DISPLAY_OVERRIDES.get(ticker, ticker.split(".")[0])
 
@@ -1334,6 +1378,8 @@ def fetch_holdings_from_gsheet():
             h["fallback_price"] = cur_price
         holdings.append(h)
 
+    allocation_totals = group_totals([sector for sector, _ in allocation_rows],
+                                     [percent for _, percent in allocation_rows])
     if allocation_totals:
         allocations = sorted(
             ((sector, round(percent, 2)) for sector, percent in allocation_totals.items()),
@@ -1351,6 +1397,7 @@ def fetch_holdings_from_gsheet():
     return holdings, meta
 
 
+@run_cached
 def fetch_official_cse_hg_quote():
     """Return HydroGraph's official CSE closing auction price.
 
@@ -1362,7 +1409,7 @@ def fetch_official_cse_hg_quote():
     import re
     try:
         url = "https://thecse.com/listings/hydrograph-clean-power-inc/"
-        response = requests.get(
+        response = http_client.get(
             url,
             headers={"User-Agent": "Mozilla/5.0", "Cache-Control": "no-cache"},
             timeout=20,
@@ -1396,15 +1443,15 @@ def fetch_official_cse_hg_quote():
         return None
 
 
-def fetch_portfolio(usdcad=1.365, audusd=0.63):
-    """Fetch Sheet holdings/totals first, then enrich prices with yfinance when available."""
-    def to_usd(amount, currency):
-        if currency == "CAD": return amount / usdcad
-        if currency == "AUD": return amount * audusd
-        return amount  # USD
+def fetch_portfolio(usdcad=1.365, audusd=0.63, sheet=None, quotes=None):
+    """Fetch Sheet holdings/totals first, then enrich prices with yfinance when available.
 
+    `sheet` is an already fetched (holdings, meta) pair and `quotes` the
+    run's quote universe (see fetch_quote_universe); either is fetched here
+    when omitted.
+    """
     # Load holdings from Google Sheet; fall back to hardcoded list
-    gs_holdings, gs_meta = fetch_holdings_from_gsheet()
+    gs_holdings, gs_meta = sheet or fetch_holdings_from_gsheet()
     if gs_holdings:
         holdings_source = gs_holdings
         # Update module-level SECTORS from sheet data
@@ -1427,6 +1474,15 @@ def fetch_portfolio(usdcad=1.365, audusd=0.63):
 
     results = {}
     official_hg = fetch_official_cse_hg_quote()
+    # One multi-symbol request per YAHOO_SPARK_BATCH holdings; anything the
+    # batch misses drops through to the per-ticker yfinance path below.
+    batch_tickers = [h["ticker"] for h in holdings_source
+                     if not h["ticker"].startswith("_") and not (h["ticker"] == "HG.CN" and official_hg)]
+    if quotes is None:
+        batch_closes = fetch_yahoo_daily_closes(batch_tickers)
+    else:
+        batch_closes = {ticker: closes for ticker in batch_tickers
+                        if ticker in quotes and (closes := valid_closes(quotes[ticker]["result"]))}
     for h in holdings_source:
         ticker   = h["ticker"]
         shares   = h["shares"]
@@ -1436,12 +1492,9 @@ def fetch_portfolio(usdcad=1.365, audusd=0.63):
         # closing-auction print rather than Yahoo's 15:59 continuous-session
         # trade, which can differ materially on volatile days.
         if ticker == "HG.CN" and official_hg:
-            p = official_hg["price"]
-            value_usd = to_usd(p * shares, currency)
             results[ticker] = {
-                "price": p,
+                "price": official_hg["price"],
                 "change": official_hg["change"],
-                "value": value_usd,
                 "currency": currency,
                 "fallback": False,
                 "source": official_hg["source"],
@@ -1452,11 +1505,18 @@ def fetch_portfolio(usdcad=1.365, audusd=0.63):
         if ticker.startswith("_"):
             p = sheet_fallbacks.get(ticker) or FALLBACK_PRICES.get(ticker)
             if p:
-                value_usd = to_usd(p * shares, currency)
-                results[ticker] = {"price": p, "change": None, "value": value_usd, "currency": currency, "fallback": True}
+                results[ticker] = {"price": p, "change": None, "currency": currency, "fallback": True}
                 continue
 
+        closes = batch_closes.get(ticker)
+        if closes:
+            p = closes[-1]
+            chg = (p - closes[-2]) / closes[-2] * 100 if len(closes) >= 2 and closes[-2] else None
+            results[ticker] = {"price": p, "change": chg, "currency": currency, "fallback": False}
+            continue
+
         try:
+            RATE_LIMITER.acquire(YAHOO_HOST)
             t = yf.Ticker(ticker)
             hist = t.history(period="5d", auto_adjust=True)
             hist = hist[hist["Close"].notna()]
@@ -1483,78 +1543,244 @@ def fetch_portfolio(usdcad=1.365, audusd=0.63):
                         pass
 
             if p and p > 0:
-                value_usd = to_usd(p * shares, currency)
-                results[ticker] = {"price": p, "change": chg, "value": value_usd, "currency": currency, "fallback": False}
+                results[ticker] = {"price": p, "change": chg, "currency": currency, "fallback": False}
             else:
-                results[ticker] = {"price": None, "change": None, "value": None, "currency": currency, "fallback": False}
+                results[ticker] = {"price": None, "change": None, "currency": currency, "fallback": False}
         except Exception:
-            results[ticker] = {"price": None, "change": None, "value": None, "currency": currency, "fallback": False}
+            results[ticker] = {"price": None, "change": None, "currency": currency, "fallback": False}
+
+    # Every holding is converted to USD in one vectorized pass once prices are in.
+    valued = value_positions(
+        [h["shares"] for h in holdings_source],
+        [results.get(h["ticker"], {}).get("price") for h in holdings_source],
+        currencies=[h.get("currency", "CAD") for h in holdings_source],
+        fx={"CAD": 1 / usdcad, "AUD": audusd},
+    )
+    for h, value in zip(holdings_source, valued["value"]):
+        results[h["ticker"]]["value"] = value
     return results, holdings_source, gs_meta
 
 
-def apply_completed_close_changes(portfolio_data, tickers):
-    """Attach official completed-session close/change fields for the Daily."""
+def yahoo_daily_chart_url(ticker, range_):
+    return (f"https://query1.finance.yahoo.com/v8/finance/chart/{quote(ticker)}"
+            f"?range={range_}&interval=1d&events=div%2Csplits")
+
+
+def completed_sessions(result, now):
+    """Completed daily sessions in a Yahoo chart result, oldest first."""
     from zoneinfo import ZoneInfo
-    now = datetime.now(timezone.utc)
-    official_hg = fetch_official_cse_hg_quote() if "HG.CN" in tickers else None
-    for ticker in tickers:
+    meta = result.get("meta", {})
+    tz = ZoneInfo(meta.get("exchangeTimezoneName") or "UTC")
+    market_today = now.astimezone(tz).date()
+    session_end = ((meta.get("currentTradingPeriod") or {}).get("regular") or {}).get("end")
+    session_closed = bool(session_end and now.timestamp() >= float(session_end))
+    timestamps = result.get("timestamp", [])
+    quote_rows = result["indicators"]["quote"][0]
+    rows = []
+    for index, stamp in enumerate(timestamps):
+        value = quote_rows.get("close", [])[index]
+        row_date = datetime.fromtimestamp(stamp, timezone.utc).astimezone(tz).date()
+        if row_date > market_today or (row_date == market_today and not session_closed):
+            continue
+        if not value or value <= 0:
+            # Yahoo occasionally nulls the latest completed small-cap
+            # daily bar overnight while retaining its official close
+            # in meta.previousClose (HG on Aug 17 was C$6.84).
+            official_close = meta.get("previousClose")
+            market_time = meta.get("regularMarketTime")
+            if market_time and datetime.fromtimestamp(float(market_time), timezone.utc).astimezone(tz).date() == row_date:
+                official_close = meta.get("regularMarketPrice") or official_close
+            if index == len(timestamps) - 1 and official_close:
+                value = official_close
+            else:
+                continue
+        rows.append({
+            "date": row_date.isoformat(),
+            "open": (quote_rows.get("open") or [None] * len(timestamps))[index],
+            "close": float(value),
+            "high": quote_rows.get("high", [None] * len(timestamps))[index],
+            "low": quote_rows.get("low", [None] * len(timestamps))[index],
+            "volume": (quote_rows.get("volume") or [None] * len(timestamps))[index],
+        })
+    return rows
+
+
+def fetch_completed_charts(tickers, now=None):
+    """Bring each ticker's completed sessions in BAR_CACHE up to date.
+
+    A warm ticker only needs Yahoo's last few days; see bar_cache for when a
+    full year is re-fetched. Returns {ticker: {"result": chart result,
+    "bars": every cached bar}}; tickers that fail are logged and absent.
+    """
+    now = now or datetime.now(timezone.utc)
+    tickers = list(tickers)
+    ranges = [BAR_CACHE.range_for(ticker, now.date()) for ticker in tickers]
+    headers = {"User-Agent": "Mozilla/5.0 NovaireSignal/1.0"}
+    responses = http_client.get_many(
+        [yahoo_daily_chart_url(ticker, range_) for ticker, range_ in zip(tickers, ranges)],
+        headers=headers,
+        timeout=10,
+    )
+    charts = {}
+    for ticker, range_, response in zip(tickers, ranges, responses):
         try:
-            url = f"https://query1.finance.yahoo.com/v8/finance/chart/{quote(ticker)}?range=1y&interval=1d&events=div%2Csplits"
-            payload = requests.get(url, headers={"User-Agent": "Mozilla/5.0 NovaireSignal/1.0"}, timeout=10).json()
-            result = payload["chart"]["result"][0]
-            meta = result.get("meta", {})
-            tz = ZoneInfo(meta.get("exchangeTimezoneName") or "UTC")
-            market_today = now.astimezone(tz).date()
-            session_end = ((meta.get("currentTradingPeriod") or {}).get("regular") or {}).get("end")
-            session_closed = bool(session_end and now.timestamp() >= float(session_end))
-            closes = []
-            completed_rows = []
-            quote_rows = result["indicators"]["quote"][0]
-            for index, stamp in enumerate(result.get("timestamp", [])):
-                value = quote_rows.get("close", [])[index]
-                row_date = datetime.fromtimestamp(stamp, timezone.utc).astimezone(tz).date()
-                if row_date > market_today or (row_date == market_today and not session_closed):
-                    continue
-                if not value or value <= 0:
-                    # Yahoo occasionally nulls the latest completed small-cap
-                    # daily bar overnight while retaining its official close
-                    # in meta.previousClose (HG on Aug 17 was C$6.84).
-                    official_close = meta.get("previousClose")
-                    market_time = meta.get("regularMarketTime")
-                    if market_time and datetime.fromtimestamp(float(market_time), timezone.utc).astimezone(tz).date() == row_date:
-                        official_close = meta.get("regularMarketPrice") or official_close
-                    if index == len(result.get("timestamp", [])) - 1 and official_close:
-                        value = official_close
-                    else:
-                        continue
-                closes.append(float(value))
-                completed_rows.append({
-                    "close": float(value),
-                    "high": quote_rows.get("high", [None] * len(result.get("timestamp", [])))[index],
-                    "low": quote_rows.get("low", [None] * len(result.get("timestamp", [])))[index],
-                })
-            if closes:
-                data = portfolio_data.setdefault(ticker, {})
-                data["close_price"] = closes[-1]
-                data["close_change"] = ((closes[-1] / closes[-2]) - 1) * 100 if len(closes) >= 2 else None
-                data["previous_close"] = closes[-2] if len(closes) >= 2 else None
-                data["day_high"] = completed_rows[-1].get("high")
-                data["day_low"] = completed_rows[-1].get("low")
-                if ticker == "HG.CN" and official_hg:
-                    if not data["day_high"] or data["day_high"] <= 0:
-                        data["day_high"] = official_hg.get("day_high")
-                    if not data["day_low"] or data["day_low"] <= 0:
-                        data["day_low"] = official_hg.get("day_low")
+            if isinstance(response, Exception):
+                raise response
+            result = response.json()["chart"]["result"][0]
+            actions = corporate_actions(result)
+            if range_ != FULL_RANGE and actions - BAR_CACHE.known_actions(ticker):
+                # A new split or dividend can rewrite history; rebuild it.
+                response = http_client.get(yahoo_daily_chart_url(ticker, FULL_RANGE), headers=headers, timeout=10)
+                result = response.json()["chart"]["result"][0]
+                range_ = FULL_RANGE
+                actions = corporate_actions(result)
+            bars = BAR_CACHE.merge(ticker, completed_sessions(result, now),
+                                   actions=actions, replace=range_ == FULL_RANGE)
+            charts[ticker] = {"result": result, "bars": bars}
         except Exception as exc:
             print(f"    ⚠️  Completed-close enrichment failed for {ticker}: {exc}")
+    return charts
+
+
+def apply_completed_close_changes(portfolio_data, tickers, charts=None):
+    """Attach official completed-session close/change fields for the Daily.
+
+    `charts` is the run's quote universe; tickers are fetched here when omitted.
+    """
+    tickers = list(tickers)
+    official_hg = fetch_official_cse_hg_quote() if "HG.CN" in tickers else None
+    if charts is None:
+        charts = fetch_completed_charts(tickers)
+    for ticker in tickers:
+        bars = (charts.get(ticker) or {}).get("bars") or []
+        closes = [bar["close"] for bar in bars[-2:]]
+        if closes:
+            data = portfolio_data.setdefault(ticker, {})
+            data["close_price"] = closes[-1]
+            data["close_change"] = ((closes[-1] / closes[-2]) - 1) * 100 if len(closes) >= 2 else None
+            data["previous_close"] = closes[-2] if len(closes) >= 2 else None
+            data["day_high"] = bars[-1].get("high")
+            data["day_low"] = bars[-1].get("low")
+            if ticker == "HG.CN" and official_hg:
+                if not data["day_high"] or data["day_high"] <= 0:
+                    data["day_high"] = official_hg.get("day_high")
+                if not data["day_low"] or data["day_low"] <= 0:
+                    data["day_low"] = official_hg.get("day_low")
     return portfolio_data
 
+
+def rrsp_yahoo_ticker(position):
+    return EXCHANGE_TO_TICKER.get(position.get("sheet_symbol"), position["symbol"])
+
+
+def plan_quotes(holdings, rrsp_positions):
+    """Declare every Yahoo symbol this run prices and the fields each consumer reads."""
+    plan = QuotePlan()
+    plan.add("portfolio", [h["ticker"] for h in holdings if not h["ticker"].startswith("_")], LAST, CLOSE, RANGE)
+    plan.add("rrsp", [rrsp_yahoo_ticker(position) for position in rrsp_positions], CLOSE, RANGE)
+    plan.add("evolution_fund", [h["ticker"] for h in EVO_HOLDINGS], CLOSE, HISTORY)
+    return plan
+
+
+def fetch_quote_universe(plan, now=None):
+    """Fetch every planned symbol once: {symbol: {"result": chart-style result, "bars": [...]}}.
+
+    Symbols that need a day range get a completed-session daily chart; the
+    rest share spark batches, with completed closes folded into BAR_CACHE
+    for symbols that asked for them. Failed symbols are absent so each
+    consumer keeps its own fallback.
+    """
+    now = now or datetime.now(timezone.utc)
+    universe = fetch_completed_charts(plan.chart_symbols(), now)
+    for symbol, result in fetch_yahoo_spark(plan.spark_symbols()).items():
+        entry = universe[symbol] = {"result": result}
+        if CLOSE in plan.fields(symbol):
+            try:
+                entry["bars"] = BAR_CACHE.merge(symbol, completed_sessions(result, now))
+            except Exception as exc:
+                print(f"    ⚠️  Completed closes unavailable for {symbol}: {exc}")
+    return universe
+
+def value_evolution_fund(crypto, now=None, quotes=None):
+    """Value every Evolution Fund position in one pass.
+
+    ETF and equity marks come from the run's quote universe (one batched
+    Yahoo spark request when `quotes` is omitted), using the latest
+    completed session like the Daily, then the last stored bar, then cost.
+    Bitcoin uses the run's crypto quote.
+    """
+    if quotes is None:
+        plan = QuotePlan()
+        plan.add("evolution_fund", [h["ticker"] for h in EVO_HOLDINGS], CLOSE, HISTORY)
+        quotes = fetch_quote_universe(plan, now)
+    positions = []
+    for h in EVO_HOLDINGS:
+        sym = h["ticker"]
+        bars = (quotes.get(sym) or {}).get("bars") or BAR_CACHE.load(sym)
+        closes = [bar["close"] for bar in bars[-2:] if bar.get("close")]
+        price = closes[-1] if closes else h["avg_entry"]
+        change = ((closes[-1] / closes[-2]) - 1) * 100 if len(closes) >= 2 else None
+        positions.append({**h, "price": price, "change": change})
+
+    # Bitcoin is an Evolution Fund position, not the removed Kraken margin book.
+    btc = crypto.get("BTC") or {}
+    positions.append({"ticker": "BTC", **EVO_BTC, "price": btc.get("price") or EVO_BTC["avg_entry"],
+                      "change": btc.get("change")})
+
+    valued = value_positions([p["shares"] for p in positions], [p["price"] for p in positions],
+                             avg_costs=[p["avg_entry"] for p in positions])
+    snapshot = {}
+    for index, position in enumerate(positions):
+        for field in ("cost", "value", "gl", "gl_pct"):
+            position[field] = valued[field][index]
+        snapshot[position["ticker"]] = {"price": round(position["price"], 2), "gl": round(position["gl_pct"], 1)}
+    return {
+        "positions": positions,
+        "total_value": valued["total_value"],
+        "total_cost": valued["total_cost"],
+        "snapshot": snapshot,
+    }
+
+# A ticker's news sources are re-crawled at most this often; between
+# crawls its card is served from HEADLINES.
+CATALYST_RECRAWL = timedelta(hours=6)
+# Company queries OR-ed into one Google News search; 1 means one search per ticker.
+GOOGLE_NEWS_BATCH_SIZE = 4
+
+
+def yahoo_news_items(yf, symbol):
+    """Dated Yahoo news for `symbol` as headline-store items."""
+    RATE_LIMITER.acquire(YAHOO_HOST)
+    items = []
+    for item in (yf.Ticker(symbol).news or []):
+        content = item.get("content", {})
+        title = content.get("title") or item.get("title", "")
+        pub_raw = content.get("pubDate") or item.get("providerPublishTime", "")
+        pub_dt = None
+        try:
+            pub_dt = (datetime.fromtimestamp(pub_raw, tz=timezone.utc) if isinstance(pub_raw, (int, float))
+                      else datetime.fromisoformat(str(pub_raw).replace("Z", "+00:00")))
+        except Exception:
+            pass
+        source = (content.get("provider", {}).get("displayName")
+                  or item.get("publisher", ""))
+        article_url = ((content.get("canonicalUrl") or {}).get("url")
+                       or (content.get("clickThroughUrl") or {}).get("url")
+                       or item.get("link") or "")
+        if title and pub_dt:
+            if pub_dt.tzinfo is None:
+                pub_dt = pub_dt.replace(tzinfo=timezone.utc)
+            items.append({"title": title, "published": pub_dt, "source": source, "url": article_url})
+    return items
+
+
 def fetch_catalysts(tickers):
     """Fetch recent verified news for every requested top holding.
 
     Yahoo often returns no news for Canadian small caps, so each symbol also
     gets an exact-company Google News RSS scan. A 14-day window retains useful
     conference and project catalysts without filling the card with old fluff.
+    Every candidate is kept in HEADLINES under `catalyst:<ticker>`.
     """
     try:
         import yfinance as yf
@@ -1584,59 +1810,80 @@ def fetch_catalysts(tickers):
         "VZLA.TO": ("vizsla silver", "panuco"),
     }
 
-    for ticker in tickers:
-        lookup_ticker = fallback_news_map.get(ticker, ticker)
+    from urllib.parse import quote_plus
+    tickers = list(tickers)
+    relevance = {ticker: KeywordMatcher(terms) for ticker, terms in relevance_terms.items()}
+    crawled = {ticker: HEADLINES.crawled_at(f"catalyst:{ticker}") for ticker in tickers}
+    stale = [ticker for ticker in tickers if (crawled[ticker] or fresh_cutoff) <= now - CATALYST_RECRAWL]
+
+    def news_days(ticker):
+        # Older stories are already stored; only ask for what appeared since the last crawl.
+        if not crawled[ticker] or crawled[ticker] <= fresh_cutoff:
+            return 14
+        return min(14, (now - crawled[ticker]).days + 2)
+
+    # Company queries are OR-grouped so Google is asked once per batch, not per ticker.
+    news_tickers = [ticker for ticker in stale if news_queries.get(ticker)]
+    queries = list(dict.fromkeys(news_queries[ticker] for ticker in news_tickers))
+    batches = [queries[start:start + GOOGLE_NEWS_BATCH_SIZE]
+               for start in range(0, len(queries), GOOGLE_NEWS_BATCH_SIZE)]
+    batch_tickers = [[ticker for ticker in news_tickers if news_queries[ticker] in batch] for batch in batches]
+    google_urls = ["https://news.google.com/rss/search?q="
+                   + quote_plus(" OR ".join(f'"{query}"' for query in batch)
+                                + f" when:{max(news_days(ticker) for ticker in members)}d")
+                   + "&hl=en-US&gl=US&ceid=US:en" for batch, members in zip(batches, batch_tickers)]
+    yahoo_tickers = [ticker for ticker in stale if not fallback_news_map.get(ticker, ticker).startswith("_")]
+    # Both sources are in flight together: the Google batch runs on the HTTP
+    # event loop from one pool slot while the yfinance calls hold the others.
+    responses, *yahoo_results = http_client.call_many([
+        lambda: http_client.get_many(google_urls, headers={"User-Agent": "NovaireSignal/1.0"}, timeout=10),
+        *((lambda symbol=fallback_news_map.get(ticker, ticker): yahoo_news_items(yf, symbol)) for ticker in yahoo_tickers),
+    ])
+    yahoo_news = dict(zip(yahoo_tickers, yahoo_results))
+    if isinstance(responses, Exception):
+        responses = [responses] * len(google_urls)
+    google_news = {}
+    for batch, members, response in zip(batches, batch_tickers, responses):
+        try:
+            if isinstance(response, Exception):
+                raise response
+            response.raise_for_status()
+            items = [{"title": item["title"],
+                      "published": item["published"].astimezone(timezone.utc),
+                      "source": item["source"] or "Google News",
+                      "url": item["link"]}
+                     for item in iter_feed(response.content) if item["title"] and item["published"]]
+        except Exception as exc:
+            google_news.update(dict.fromkeys(members, exc))
+            continue
+        for ticker in members:
+            # A batched search answers several companies; each keeps only items naming it.
+            owner = relevance.get(ticker) or KeywordMatcher([news_queries[ticker]])
+            google_news[ticker] = [item for item in items if len(batch) == 1 or owner.matches(item["title"])]
+
+    for ticker in stale:
+        feed = f"catalyst:{ticker}"
+        crawl_ok = True
         candidates = []
-        if not lookup_ticker.startswith("_"):
-            try:
-                for item in (yf.Ticker(lookup_ticker).news or []):
-                    title = item.get("content", {}).get("title") or item.get("title", "")
-                    pub_raw = item.get("content", {}).get("pubDate") or item.get("providerPublishTime", "")
-                    pub_dt = None
-                    try:
-                        pub_dt = (datetime.fromtimestamp(pub_raw, tz=timezone.utc) if isinstance(pub_raw, (int, float))
-                                  else datetime.fromisoformat(str(pub_raw).replace("Z", "+00:00")))
-                    except Exception:
-                        pass
-                    source = (item.get("content", {}).get("provider", {}).get("displayName")
-                              or item.get("publisher", ""))
-                    content = item.get("content", {})
-                    article_url = ((content.get("canonicalUrl") or {}).get("url")
-                                   or (content.get("clickThroughUrl") or {}).get("url")
-                                   or item.get("link") or "")
-                    if title and pub_dt:
-                        candidates.append({"title": title, "pub_dt": pub_dt, "source": source, "url": article_url})
-            except Exception:
-                pass
+        for items in (yahoo_news.get(ticker, []), google_news.get(ticker, [])):
+            if isinstance(items, Exception):
+                crawl_ok = False
+            else:
+                candidates.extend(items)
+        # Anything already past the freshness window can never be shown.
+        HEADLINES.ingest(feed, [c for c in candidates if c["published"] >= fresh_cutoff])
+        if crawl_ok:
+            HEADLINES.mark_crawled(feed)
 
-        query = news_queries.get(ticker)
-        if query:
-            try:
-                from urllib.parse import quote_plus
-                from email.utils import parsedate_to_datetime
-                import xml.etree.ElementTree as ET
-                url = ("https://news.google.com/rss/search?q=" + quote_plus(f'"{query}" when:14d')
-                       + "&hl=en-US&gl=US&ceid=US:en")
-                response = requests.get(url, headers={"User-Agent": "NovaireSignal/1.0"}, timeout=10)
-                response.raise_for_status()
-                for item in ET.fromstring(response.content).findall("./channel/item"):
-                    title = (item.findtext("title") or "").strip()
-                    pub_raw = item.findtext("pubDate") or ""
-                    if not title or not pub_raw:
-                        continue
-                    pub_dt = parsedate_to_datetime(pub_raw).astimezone(timezone.utc)
-                    source_node = item.find("source")
-                    source = ((source_node.text or "Google News").strip()
-                              if source_node is not None else "Google News")
-                    article_url = (item.findtext("link") or "").strip()
-                    candidates.append({"title": title, "pub_dt": pub_dt, "source": source, "url": article_url})
-            except Exception:
-                pass
+    for ticker in tickers:
+        candidates = [{**row, "pub_dt": row["published"]}
+                      for row in HEADLINES.recent(f"catalyst:{ticker}", published_since=fresh_cutoff)
+                      if row["published"]]
 
-        terms = relevance_terms.get(ticker, ())
+        matcher = relevance.get(ticker)
         candidates = [c for c in candidates
                       if fresh_cutoff <= c["pub_dt"] <= now + timedelta(hours=2)
-                      and (not terms or any(term in c["title"].lower() for term in terms))]
+                      and (not matcher or matcher.matches(c["title"]))]
         if candidates:
             best = max(candidates, key=lambda c: c["pub_dt"])
             cats[ticker] = {"title": best["title"], "date": best["pub_dt"].strftime("%b %-d"),
@@ -1645,6 +1892,90 @@ def fetch_catalysts(tickers):
             cats[ticker] = None
     return cats
 
+def store_chart_bars(symbol, payload):
+    """Fold a Yahoo daily chart payload into PRICE_STORE; never raises."""
+    try:
+        PRICE_STORE.upsert(symbol, bars_from_chart(payload["chart"]["result"][0]))
+    except Exception as exc:
+        print(f"    ⚠️  Price store update failed for {symbol}: {exc}")
+
+
+def fetch_yahoo_charts(symbols):
+    """Fetch 5-day daily Yahoo charts concurrently; one response or exception per symbol.
+
+    Every chart that parses is also kept in PRICE_STORE.
+    """
+    symbols = list(symbols)
+    responses = http_client.get_many(
+        [f"https://query1.finance.yahoo.com/v8/finance/chart/{quote(symbol, safe='')}" for symbol in symbols],
+        params={"range": "5d", "interval": "1d"},
+        headers={"User-Agent": "NovaireSignal/1.0"},
+        timeout=10,
+    )
+    for symbol, response in zip(symbols, responses):
+        if not isinstance(response, Exception) and response.status_code == 200:
+            try:
+                store_chart_bars(symbol, response.json())
+            except ValueError:
+                pass
+    return responses
+
+
+def spark_results(payload):
+    """Return {symbol: chart-style result} from a Yahoo spark payload."""
+    results = {}
+    for item in ((payload or {}).get("spark") or {}).get("result") or []:
+        symbol = item.get("symbol")
+        for response in item.get("response") or []:
+            if symbol:
+                results[symbol] = response
+    return results
+
+
+def valid_closes(result):
+    """Positive daily closes in a chart-style result, oldest first."""
+    quote_rows = ((result.get("indicators") or {}).get("quote") or [{}])[0]
+    return [float(v) for v in quote_rows.get("close") or [] if v is not None and v > 0]
+
+
+def parse_yahoo_spark(payload):
+    """Return {symbol: [valid daily closes, oldest first]} from a Yahoo spark payload."""
+    return {symbol: closes for symbol, result in spark_results(payload).items()
+            if (closes := valid_closes(result))}
+
+
+def fetch_yahoo_spark(symbols, range_="5d"):
+    """Batch daily charts for many symbols via Yahoo's multi-symbol spark endpoint.
+
+    Returns {symbol: chart-style result}. Symbols Yahoo omits (or whole
+    batches that fail) are simply absent so callers can fall back per ticker.
+    """
+    symbols = list(dict.fromkeys(symbols))
+    batches = [symbols[i:i + YAHOO_SPARK_BATCH] for i in range(0, len(symbols), YAHOO_SPARK_BATCH)]
+    responses = http_client.get_many(
+        [f"https://{YAHOO_HOST}/v8/finance/spark?symbols={quote(','.join(batch), safe=',')}"
+         f"&range={range_}&interval=1d" for batch in batches],
+        headers={"User-Agent": "NovaireSignal/1.0"},
+        timeout=10,
+    )
+    results = {}
+    for batch, response in zip(batches, responses):
+        try:
+            if isinstance(response, Exception):
+                raise response
+            response.raise_for_status()
+            results.update(spark_results(response.json()))
+        except Exception as exc:
+            print(f"    ⚠️  Yahoo batch quote failed for {len(batch)} symbols: {exc}")
+    return results
+
+
+def fetch_yahoo_daily_closes(symbols, range_="5d"):
+    """Batch daily closes, oldest first, for many symbols; see fetch_yahoo_spark."""
+    return {symbol: closes for symbol, result in fetch_yahoo_spark(symbols, range_).items()
+            if (closes := valid_closes(result))}
+
+
 def parse_yahoo_chart_quote(payload, *, period="futures session"):
     """Parse the latest two valid adjacent Yahoo chart bars."""
     try:
@@ -1732,7 +2063,7 @@ def scrape_page_text(url: str) -> str:
         elif "api.firecrawl.dev" in endpoint:
             continue
         try:
-            response = requests.post(
+            response = http_client.post(
                 endpoint,
                 headers=headers,
                 json={"url": url, "formats": ["markdown"], "onlyMainContent": True},
@@ -1760,52 +2091,52 @@ def fetch_investing_futures():
     return parse_investing_futures(markdown)
 
 
-def fetch_market_futures():
-    """Fetch canonical front-month US index futures with an exchange-only fallback."""
-    investing = {}
-    try:
-        investing = fetch_investing_futures()
-    except Exception:
-        pass
-    results = {}
-    for symbol, meta in MARKET_FUTURES.items():
+def yahoo_chart_quotes(symbols, *, period="futures session"):
+    """Latest adjacent-bar quote per symbol from concurrent Yahoo daily charts."""
+    quotes = {}
+    for symbol, response in zip(symbols, fetch_yahoo_charts(symbols)):
         try:
-            response = requests.get(
-                f"https://query1.finance.yahoo.com/v8/finance/chart/{quote(symbol, safe='')}",
-                params={"range": "5d", "interval": "1d"},
-                headers={"User-Agent": "NovaireSignal/1.0"},
-                timeout=10,
-            )
-            parsed = parse_yahoo_chart_quote(response.json())
+            if isinstance(response, Exception):
+                raise response
+            parsed = parse_yahoo_chart_quote(response.json(), period=period)
         except Exception:
             parsed = None
-        yahoo = parsed or {
-            "price": None, "previous": None, "change": None,
-            "source": "Yahoo Finance", "period": "futures session", "quote_time": None,
-        }
-        results[symbol] = {**meta, **build_exchange_futures_quote(yahoo, investing.get(symbol))}
-    return results
+        if parsed:
+            quotes[symbol] = parsed
+    return quotes
+
+
+def yahoo_futures_quotes(symbols):
+    return {symbol: build_exchange_futures_quote(parsed)
+            for symbol, parsed in yahoo_chart_quotes(symbols).items()}
+
+
+def yahoo_index_quotes(symbols):
+    return yahoo_chart_quotes(symbols, period="cash session")
+
+
+def investing_futures_quotes(symbols):
+    investing = fetch_investing_futures()
+    blank = {"price": None, "previous": None, "change": None, "quote_time": None}
+    return {symbol: build_exchange_futures_quote(blank, investing[symbol])
+            for symbol in symbols if investing.get(symbol)}
+
+
+def fetch_market_futures():
+    """Fetch canonical front-month US index futures with an exchange-only fallback."""
+    resolved = QUOTES.resolve("futures", list(MARKET_FUTURES))
+    blank = {"price": None, "previous": None, "change": None, "quote_time": None}
+    return {symbol: {**meta, **(resolved.get(symbol) or build_exchange_futures_quote(blank))}
+            for symbol, meta in MARKET_FUTURES.items()}
 
 
 def fetch_market_indices():
     """Fetch the S&P 500, Nasdaq Composite, and Dow cash indexes."""
-    results = {}
-    for symbol, meta in MARKET_INDICES.items():
-        try:
-            response = requests.get(
-                f"https://query1.finance.yahoo.com/v8/finance/chart/{quote(symbol, safe='')}",
-                params={"range": "5d", "interval": "1d"},
-                headers={"User-Agent": "NovaireSignal/1.0"},
-                timeout=10,
-            )
-            parsed = parse_yahoo_chart_quote(response.json(), period="cash session")
-        except Exception:
-            parsed = None
-        results[symbol] = {**meta, **(parsed or {
-            "price": None, "previous": None, "change": None,
-            "source": "Yahoo Finance", "period": "cash session", "quote_time": None,
-        })}
-    return results
+    resolved = QUOTES.resolve("indices", list(MARKET_INDICES))
+    return {symbol: {**meta, **(resolved.get(symbol) or {
+        "price": None, "previous": None, "change": None,
+        "source": "Yahoo Finance", "period": "cash session", "quote_time": None,
+    })} for symbol, meta in MARKET_INDICES.items()}
 
 
 def parse_rbob_crack(rbob_payload, wti_payload):
@@ -1836,51 +2167,87 @@ def parse_rbob_crack(rbob_payload, wti_payload):
 
 def fetch_rbob_crack():
     payloads = []
-    for symbol in ("RB=F", "CL=F"):
-        response = requests.get(
-            f"https://query1.finance.yahoo.com/v8/finance/chart/{quote(symbol, safe='')}",
-            params={"range": "5d", "interval": "1d"},
-            headers={"User-Agent": "NovaireSignal/1.0"}, timeout=10)
+    for response in fetch_yahoo_charts(("RB=F", "CL=F")):
+        if isinstance(response, Exception):
+            raise response
         response.raise_for_status()
         payloads.append(response.json())
     return parse_rbob_crack(*payloads)
 
 
-def fetch_diesel():
-    """Fetch front-month NY Harbor ULSD and quote it in USD per barrel."""
-    response = requests.get(
-        f"https://query1.finance.yahoo.com/v8/finance/chart/{quote('HO=F', safe='')}",
-        params={"range": "5d", "interval": "1d"},
-        headers={"User-Agent": "NovaireSignal/1.0"}, timeout=10)
-    response.raise_for_status()
-    parsed = parse_yahoo_chart_quote(response.json())
-    if not parsed or parsed.get("price") is None:
-        raise ValueError("Diesel futures quote unavailable")
-    parsed["price"] *= 42
-    if parsed.get("previous") is not None:
-        parsed["previous"] *= 42
-    parsed.update({"source": "Yahoo Finance (NYMEX ULSD)", "period": "futures session"})
-    return parsed
+COMMODITY_YAHOO_SYMBOLS = {"GOLD": "GC=F", "SILVER": "SI=F", "COPPER": "HG=F", "WTI": "CL=F", "DIESEL": "HO=F"}
+CORE_COMMODITIES = ("GOLD", "SILVER", "COPPER", "WTI")
 
 
-def fetch_yahoo_commodity_fallback():
-    """Return core commodity quotes when the canonical Investing feed is down."""
-    mapping = {"GOLD": "GC=F", "SILVER": "SI=F", "COPPER": "HG=F", "WTI": "CL=F"}
+def investing_commodity_quotes(keys):
+    """Metals and WTI from Investing.com's real-time futures table."""
+    markdown = scrape_page_text("https://www.investing.com/commodities/real-time-futures")
+    if not markdown:
+        raise RuntimeError("Investing.com scrape empty (Firecrawl + free extract)")
+    slugs = {"GOLD": "gold", "SILVER": "silver", "COPPER": "copper", "WTI": "crude-oil"}
+    quote_time = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
     quotes = {}
-    for key, symbol in mapping.items():
-        response = requests.get(
-            f"https://query1.finance.yahoo.com/v8/finance/chart/{quote(symbol, safe='')}",
-            params={"range": "5d", "interval": "1d"},
-            headers={"User-Agent": "NovaireSignal/1.0"}, timeout=10)
-        response.raise_for_status()
-        parsed = parse_yahoo_chart_quote(response.json())
+    for key in keys:
+        if key not in slugs:
+            continue
+        marker = f"](https://www.investing.com/commodities/{slugs[key]} \""
+        row = next((line for line in markdown.splitlines() if marker in line), None)
+        if not row:
+            continue
+        cells = [cell.strip() for cell in row.strip().strip('|').split('|')]
+        try:
+            quotes[key] = {"price": float(cells[3].replace(',', '')),
+                           "change": float(cells[7].rstrip('%').replace('−', '-')),
+                           "source": "Investing.com", "period": "daily", "quote_time": quote_time}
+        except (IndexError, ValueError):
+            continue
+    return quotes
+
+
+def yahoo_commodity_quotes(keys):
+    """Front-month Yahoo futures; NY Harbor ULSD is converted from USD/gallon to USD/barrel."""
+    quotes = {}
+    by_symbol = yahoo_chart_quotes([COMMODITY_YAHOO_SYMBOLS[key] for key in keys])
+    for key in keys:
+        parsed = by_symbol.get(COMMODITY_YAHOO_SYMBOLS[key])
         if not parsed or parsed.get("price") is None:
-            raise ValueError(f"{symbol} commodity fallback unavailable")
-        parsed.update({"source": "Yahoo Finance fallback", "period": "futures session"})
+            continue
+        if key == "DIESEL":
+            parsed["price"] *= 42
+            if parsed.get("previous") is not None:
+                parsed["previous"] *= 42
+            parsed["source"] = "Yahoo Finance (NYMEX ULSD)"
+        else:
+            parsed["source"] = "Yahoo Finance fallback"
+        parsed["period"] = "futures session"
         quotes[key] = parsed
     return quotes
 
 
+def tradingeconomics_uranium_quotes(keys):
+    """Trading Economics U3O8 spot benchmark (absent from Investing.com's futures screen)."""
+    r = http_client.get("https://tradingeconomics.com/commodity/uranium",
+                        headers={"User-Agent": "Mozilla/5.0"}, timeout=10)
+    m = re.search(r'Uranium[^".]{0,160}?\bat\s+(\d+(?:\.\d+)?)\s*USD/Lbs',
+                  r.text, flags=re.IGNORECASE)
+    if not m:
+        return {}
+    return {"URANIUM_SPOT": {
+        "price": float(m.group(1)), "source": "Trading Economics",
+        "period": "spot benchmark",
+        "quote_time": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+    }}
+
+
+def fetch_yahoo_commodity_fallback():
+    """Return core commodity quotes when the canonical Investing feed is down."""
+    quotes = yahoo_commodity_quotes(CORE_COMMODITIES)
+    missing = [key for key in CORE_COMMODITIES if key not in quotes]
+    if missing:
+        raise ValueError(f"{', '.join(missing)} commodity fallback unavailable")
+    return quotes
+
+
 def fetch_commodities():
     """Fetch six resource benchmarks, including barrel-equivalent ULSD diesel."""
     symbols = {
@@ -1894,123 +2261,173 @@ def fetch_commodities():
     results = {key: {**meta, "price": None, "change": None,
                      "source": "Investing.com", "period": "daily",
                      "quote_time": None} for key, meta in symbols.items()}
+    for key, quote_ in QUOTES.resolve("commodities", list(symbols)).items():
+        results[key].update(quote_)
+    return results
+
+
+CRYPTO_COINGECKO_IDS = {
+    "bitcoin": "BTC", "ethereum": "ETH", "solana": "SOL", "cardano": "ADA",
+    "the-open-network": "TON", "sui": "SUI", "zcash": "ZEC", "midnight-3": "NIGHT",
+}
+# Binance quotes older than this are frozen pairs, not live prices.
+BINANCE_MAX_QUOTE_AGE = 300
+# Written by scripts/crypto_stream.py when the optional live daemon runs.
+CRYPTO_STREAM_SNAPSHOT = response_cache.CACHE_DIR / "crypto_stream.json"
+
+
+@run_cached
+def fetch_coingecko_markets():
+    return http_client.get("https://api.coingecko.com/api/v3/coins/markets",
+        params={"vs_currency":"usd", "ids":",".join(CRYPTO_COINGECKO_IDS), "price_change_percentage":"24h"},
+        headers={"User-Agent":"NovaireSignal/1.0"}, timeout=12).json()
+
+
+def coingecko_crypto_quotes(tickers):
+    quotes = {}
+    for row in fetch_coingecko_markets():
+        ticker = CRYPTO_COINGECKO_IDS.get(row.get("id"))
+        if ticker in tickers:
+            quotes[ticker] = {"price": row.get("current_price"),
+                "change": row.get("price_change_percentage_24h"),
+                "day_high": row.get("high_24h"), "day_low": row.get("low_24h"),
+                "market_cap": row.get("market_cap") or 0,
+                "source": "CoinGecko", "quote_time": row.get("last_updated")}
+    return quotes
+
+
+def stream_crypto_quotes(tickers):
+    """Latest quotes from the crypto_stream daemon's snapshot; no network."""
     try:
-        markdown = scrape_page_text("https://www.investing.com/commodities/real-time-futures")
-        if not markdown:
-            raise RuntimeError("Investing.com scrape empty (Firecrawl + free extract)")
-        slugs = {"GOLD": "gold", "SILVER": "silver", "COPPER": "copper",
-                 "WTI": "crude-oil"}
-        for key, slug in slugs.items():
-            marker = f"](https://www.investing.com/commodities/{slug} \""
-            row = next((line for line in markdown.splitlines() if marker in line), None)
-            if not row:
-                continue
-            cells = [cell.strip() for cell in row.strip().strip('|').split('|')]
-            if len(cells) >= 8:
-                results[key]["price"] = float(cells[3].replace(',', ''))
-                results[key]["change"] = float(cells[7].rstrip('%').replace('−', '-'))
-        results_quote_time = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
-        for item in results.values():
-            if item["price"] is not None:
-                item["quote_time"] = results_quote_time
-    except Exception:
-        # Firecrawl credits or Investing availability must never blank the card.
+        with open(CRYPTO_STREAM_SNAPSHOT, encoding="utf-8") as f:
+            quotes = json.load(f).get("quotes") or {}
+    except (OSError, ValueError):
+        return {}
+    return {ticker: quotes[ticker] for ticker in tickers if ticker in quotes}
+
+
+def parse_binance_ticker(d):
+    return {
+        "price": float(d["lastPrice"]),
+        "change": float(d["priceChangePercent"]),
+        "day_high": float(d["highPrice"]) if d.get("highPrice") is not None else None,
+        "day_low": float(d["lowPrice"]) if d.get("lowPrice") is not None else None,
+        "source": "Binance",
+        "quote_time": datetime.fromtimestamp(
+            int(d["closeTime"]) / 1000, timezone.utc
+        ).isoformat().replace("+00:00", "Z"),
+    }
+
+
+def binance_crypto_quotes(tickers):
+    """Binance 24h tickers, the faster live-price layer, in one multi-symbol call.
+
+    Binance rejects the whole batch if any pair is unknown, so a rejected
+    batch falls back to one request per pair; an unreachable Binance fails
+    the provider and the chain moves on to CoinGecko. TON trades on Binance under its
+    active GRAM successor pair; the retired TONUSDT endpoint is stale. XRP
+    stays excluded.
+    """
+    by_pair = {CRYPTO_BINANCE_PAIRS[ticker]: ticker for ticker in tickers}
+    rows = http_client.get(
+        "https://api.binance.com/api/v3/ticker/24hr?symbols="
+        + quote(json.dumps(list(by_pair), separators=(",", ":")), safe=""),
+        timeout=8,
+    ).json()
+    if not isinstance(rows, list):
+        print(f"    ⚠️  Binance batch ticker rejected, fetching pairs singly: {rows}")
+        rows = []
+        responses = http_client.get_many(
+            [f"https://api.binance.com/api/v3/ticker/24hr?symbol={pair}" for pair in by_pair],
+            timeout=8,
+        )
+        for pair, response in zip(by_pair, responses):
+            try:
+                if isinstance(response, Exception):
+                    raise response
+                rows.append({"symbol": pair, **response.json()})
+            except Exception:
+                pass
+    quotes = {}
+    for d in rows:
+        ticker = by_pair.get(d.get("symbol")) if isinstance(d, dict) else None
         try:
-            for key, parsed in fetch_yahoo_commodity_fallback().items():
-                results[key].update(parsed)
+            if ticker:
+                quotes[ticker] = parse_binance_ticker(d)
         except Exception:
             pass
+    return quotes
 
-    # Front-month NY Harbor ULSD, converted from USD/gallon to USD/barrel.
-    try:
-        results["DIESEL"].update(fetch_diesel())
-    except Exception:
-        pass
 
-    # Uranium is absent from Investing.com's futures screen. Preserve the
-    # pre-migration Trading Economics U3O8 benchmark rather than silently
-    # shrinking the user's approved commodity set to one provider's list.
+def fetch_crypto():
+    results = {ticker: {"price": None, "change": None, "market_cap": 0,
+                        "source": None, "quote_time": None} for ticker in CRYPTO_COINGECKO_IDS.values()}
+    for ticker, quote_ in QUOTES.resolve("crypto", list(results)).items():
+        results[ticker].update(quote_)
+    # Binance has no market caps; CoinGecko stays their source whoever priced
+    # the coin, unless the stream snapshot already carried them.
+    if all(item.get("market_cap") for item in results.values()):
+        return results
     try:
-        r = requests.get("https://tradingeconomics.com/commodity/uranium",
-                         headers={"User-Agent": "Mozilla/5.0"}, timeout=10)
-        m = re.search(r'Uranium[^".]{0,160}?\bat\s+(\d+(?:\.\d+)?)\s*USD/Lbs',
-                      r.text, flags=re.IGNORECASE)
-        if m:
-            results["URANIUM_SPOT"].update({
-                "price": float(m.group(1)), "source": "Trading Economics",
-                "period": "spot benchmark",
-                "quote_time": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
-            })
+        for row in fetch_coingecko_markets():
+            ticker = CRYPTO_COINGECKO_IDS.get(row.get("id"))
+            if ticker and row.get("market_cap"):
+                results[ticker]["market_cap"] = row["market_cap"]
     except Exception:
         pass
     return results
 
-def quote_timestamp_is_fresh(close_time_ms, *, now_ms=None, max_age_seconds=300):
-    """Return True only for an exchange quote updated within the allowed age."""
-    try:
-        close_time_ms = int(close_time_ms)
-        now_ms = int(now_ms if now_ms is not None else datetime.now(timezone.utc).timestamp() * 1000)
-    except (TypeError, ValueError):
-        return False
-    age_ms = now_ms - close_time_ms
-    return 0 <= age_ms <= max_age_seconds * 1000
-
 
-def fetch_crypto():
-    ids = {"bitcoin":"BTC", "ethereum":"ETH", "solana":"SOL", "cardano":"ADA",
-           "the-open-network":"TON", "sui":"SUI", "zcash":"ZEC", "midnight-3":"NIGHT"}
-    results = {ticker: {"price": None, "change": None, "market_cap": 0,
-                        "source": None, "quote_time": None} for ticker in ids.values()}
-    try:
-        rows = requests.get("https://api.coingecko.com/api/v3/coins/markets",
-            params={"vs_currency":"usd", "ids":",".join(ids), "price_change_percentage":"24h"},
-            headers={"User-Agent":"NovaireSignal/1.0"}, timeout=12).json()
-        for row in rows:
-            ticker = ids.get(row.get("id"))
-            if ticker:
-                results[ticker] = {"price": row.get("current_price"),
-                    "change": row.get("price_change_percentage_24h"),
-                    "day_high": row.get("high_24h"), "day_low": row.get("low_24h"),
-                    "market_cap": row.get("market_cap") or 0,
-                    "source": "CoinGecko", "quote_time": row.get("last_updated")}
-    except Exception:
-        pass
+# Ordered provider chains, best first; see quote_providers. Firecrawl credits
+# or Investing availability must never blank a card, so Yahoo backs it up.
+# Uranium keeps the pre-migration Trading Economics U3O8 benchmark rather
+# than shrinking the approved commodity set to one provider's list.
+QUOTES.register("crypto", [
+    QuoteProvider("Binance stream", stream_crypto_quotes, max_age=BINANCE_MAX_QUOTE_AGE,
+                  covers=frozenset(CRYPTO_BINANCE_PAIRS)),
+    QuoteProvider("Binance", binance_crypto_quotes, max_age=BINANCE_MAX_QUOTE_AGE,
+                  covers=frozenset(CRYPTO_BINANCE_PAIRS)),
+    QuoteProvider("CoinGecko", coingecko_crypto_quotes),
+])
+QUOTES.register("futures", [
+    QuoteProvider("Yahoo Finance", yahoo_futures_quotes),
+    QuoteProvider("Investing.com", investing_futures_quotes),
+])
+QUOTES.register("indices", [
+    QuoteProvider("Yahoo Finance", yahoo_index_quotes),
+])
+QUOTES.register("commodities", [
+    QuoteProvider("Investing.com", investing_commodity_quotes, covers=frozenset(CORE_COMMODITIES)),
+    QuoteProvider("Yahoo Finance", yahoo_commodity_quotes, covers=frozenset(COMMODITY_YAHOO_SYMBOLS)),
+    QuoteProvider("Trading Economics", tradingeconomics_uranium_quotes, required=("price",),
+                  covers=frozenset({"URANIUM_SPOT"})),
+])
+
+POLYMARKET_PROXY = "0xC1541b2af765e4d1013337084D889d0DB302Aa0e"
+
+
+@run_cached
+def fetch_polymarket_positions():
+    """Download the raw Polymarket positions list once per build for both pages."""
+    cache_bust = int(datetime.now(timezone.utc).timestamp())
+    url = f"https://data-api.polymarket.com/positions?user={POLYMARKET_PROXY}&_t={cache_bust}"
+    response = http_client.get(url, headers={
+        "User-Agent": "Mozilla/5.0",
+        "Cache-Control": "no-cache",
+        "Pragma": "no-cache",
+    }, timeout=10)
+    response.raise_for_status()
+    return response.json()
 
-    # Binance is the faster live-price layer; CoinGecko remains the market-cap
-    # source and the fallback quote. TON trades on Binance under its active
-    # GRAM successor pair; the retired TONUSDT endpoint is stale. XRP stays excluded.
-    for ticker, pair in CRYPTO_BINANCE_PAIRS.items():
-        try:
-            d = requests.get(f"https://api.binance.com/api/v3/ticker/24hr?symbol={pair}", timeout=8).json()
-            if quote_timestamp_is_fresh(d.get("closeTime")):
-                results[ticker]["price"] = float(d["lastPrice"])
-                results[ticker]["change"] = float(d["priceChangePercent"])
-                results[ticker]["day_high"] = float(d["highPrice"])
-                results[ticker]["day_low"] = float(d["lowPrice"])
-                results[ticker]["source"] = "Binance"
-                results[ticker]["quote_time"] = datetime.fromtimestamp(
-                    int(d["closeTime"]) / 1000, timezone.utc
-                ).isoformat().replace("+00:00", "Z")
-        except Exception:
-            pass
-    return results
 
+@run_cached
 def fetch_polymarket():
     """Fetch Barron147 live positions from Polymarket with % P&L"""
     INCEPTION_COST = 222.00  # total funds deposited into Polymarket — confirmed by Novaire Mar 15
     INCEPTION_TS = 1772496000  # epoch: 2026-03-03 00:00 UTC — ignore all activity before this
     try:
-        import urllib.request, json
-        PROXY = "0xC1541b2af765e4d1013337084D889d0DB302Aa0e"
-        cache_bust = int(datetime.now(timezone.utc).timestamp())
-        url = f"https://data-api.polymarket.com/positions?user={PROXY}&_t={cache_bust}"
-        req = urllib.request.Request(url, headers={
-            "User-Agent": "Mozilla/5.0",
-            "Cache-Control": "no-cache",
-            "Pragma": "no-cache",
-        })
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            positions = json.loads(resp.read())
+        PROXY = POLYMARKET_PROXY
+        positions = fetch_polymarket_positions()
 
         # Get cash balance. Polymarket trading cash can sit in CLOB collateral
         # rather than plain wallet USDC.e, so check the authenticated CLOB balance
@@ -2073,13 +2490,14 @@ def fetch_polymarket():
         print(f"  ⚠ Polymarket fetch failed: {e}")
         return {"positions": [], "total_account": 0, "inception_roi": 0}
 
+@run_cached
 def fetch_alpaca():
     """Fetch Alpaca positions: Tier 1 = Volume Scalp (executor.py), Tier 2 = Livermore Darvas Microcap"""
     TIER1_INCEPTION = 250.0  # Tier 1 — Alpaca Volume Scalp (automated momentum)
     TIER2_INCEPTION = 250.0  # Tier 2 — Livermore Darvas Microcap (Darvas box breakout)
     TOTAL_INCEPTION = 500.0
     try:
-        import urllib.request, json as _json, os as _os
+        import json as _json, os as _os
         KEY = _os.getenv("ALPACA_API_KEY") or _os.getenv("APCA_API_KEY_ID")
         SECRET = _os.getenv("ALPACA_SECRET_KEY") or _os.getenv("APCA_API_SECRET_KEY")
         BASE = (_os.getenv("ALPACA_BASE_URL") or "https://api.alpaca.markets").rstrip("/")
@@ -2088,10 +2506,10 @@ def fetch_alpaca():
             raise RuntimeError("Missing Alpaca API credentials in environment")
 
         def alpaca_get(url, timeout=10):
-            req = urllib.request.Request(url, headers={
-                "APCA-API-KEY-ID": KEY, "APCA-API-SECRET-KEY": SECRET})
-            with urllib.request.urlopen(req, timeout=timeout) as resp:
-                return _json.loads(resp.read())
+            response = http_client.get(url, headers={
+                "APCA-API-KEY-ID": KEY, "APCA-API-SECRET-KEY": SECRET}, timeout=timeout)
+            response.raise_for_status()
+            return response.json()
 
         def close_based_price(symbol, fallback):
             """Alpaca positions can show stale marks after-hours; prefer daily close/latest trade."""
@@ -2217,7 +2635,7 @@ def fetch_alpaca():
             # Scheduled generation does not always inherit Alpaca credentials, while the
             # Vercel endpoint does. Use that canonical live endpoint instead of silently
             # deleting the Novairecito account from both rendered surfaces.
-            summary = requests.get(
+            summary = http_client.get(
                 "https://novairesignal.com/api/alpaca-summary",
                 headers={"User-Agent": "NovaireSignalGenerator/1.0"},
                 timeout=15,
@@ -2263,25 +2681,60 @@ def fetch_alpaca():
                     "t1_realized": 0, "t2_realized": 0, "t1_trade_count": 0, "t2_trade_count": 0,
                     "inception_roi": 0, "equity": 0, "cash": 0, "funded": False, "positions": []}
 
+FX_CURRENCIES = ("CAD", "THB", "AUD", "COP", "EUR", "RUB", "KRW", "JPY")
+
+
+@run_cached
+def fetch_fx_snapshot(version):
+    """One 1-USD currency-api snapshot: "latest" or a dated YYYY-MM-DD one.
+
+    Dated snapshots never change, so response_cache keeps them for good and
+    a warm build pays for the `latest` request only. Both stages that need
+    FX share that request through the run cache.
+    """
+    if version == "latest":
+        urls = (
+            "https://cdn.jsdelivr.net/npm/@fawazahmed0/currency-api@latest/v1/currencies/usd.min.json",
+            "https://latest.currency-api.pages.dev/v1/currencies/usd.min.json",
+        )
+    else:
+        urls = (
+            f"https://cdn.jsdelivr.net/npm/@fawazahmed0/currency-api@{version}/v1/currencies/usd.min.json",
+            f"https://{version}.currency-api.pages.dev/v1/currencies/usd.min.json",
+        )
+
+    def download(url):
+        response = http_client.get(url, timeout=12, headers={"User-Agent": "NovaireSignal/1.0"})
+        response.raise_for_status()
+        payload = response.json()
+        if payload.get("date") and isinstance(payload.get("usd"), dict):
+            return payload
+        raise ValueError("Malformed FX snapshot")
+
+    # jsdelivr and pages.dev mirror the same snapshot; hedge the slow tail.
+    key = "currency-api:latest" if version == "latest" else "currency-api:dated"
+    return hedged(lambda: download(urls[0]), lambda: download(urls[1]), key=key)
+
+
+def usd_rate(snapshot, currency):
+    rate = float(snapshot["usd"][currency.lower()])
+    if not math.isfinite(rate) or rate <= 0:
+        raise ValueError(f"Invalid FX rate for {currency}")
+    return rate
+
+
 def fetch_fx():
+    """USD/CAD and AUD/USD for portfolio conversion, from the shared FX snapshot."""
     try:
-        import yfinance as yf
-        r = yf.Ticker("CADUSD=X").history(period="2d")
-        usdcad = 1.0 / float(r["Close"].iloc[-1]) if len(r) >= 1 else 1.365
-    except Exception:
-        usdcad = 1.365
-    try:
-        import yfinance as yf
-        r2 = yf.Ticker("AUDUSD=X").history(period="2d")
-        audusd = float(r2["Close"].iloc[-1]) if len(r2) >= 1 else 0.630
-    except Exception:
-        audusd = 0.630
-    return {"usdcad": usdcad, "audusd": audusd}
+        latest = fetch_fx_snapshot("latest")
+        return {"usdcad": usd_rate(latest, "CAD"), "audusd": 1.0 / usd_rate(latest, "AUD")}
+    except Exception as exc:
+        print(f"    ⚠️ FX snapshot unavailable, using defaults: {exc}")
+        return dict(DEFAULT_FX)
 
 
 def fetch_fx_rates():
     """Fetch 1 USD rates and prior-trading-day moves from one consistent daily source."""
-    currencies = ("CAD", "THB", "AUD", "COP", "EUR", "RUB", "KRW", "JPY")
     icons = {
         "CAD": "🇨🇦", "THB": "🇹🇭", "AUD": "🇦🇺",
         "COP": "🇨🇴", "EUR": "🇪🇺", "RUB": "🇷🇺", "KRW": "🇰🇷", "JPY": "🇯🇵",
@@ -2291,43 +2744,16 @@ def fetch_fx_rates():
         "COP": "$", "EUR": "€", "RUB": "₽", "KRW": "₩", "JPY": "¥",
     }
 
-    def fetch_snapshot(version):
-        if version == "latest":
-            urls = (
-                "https://cdn.jsdelivr.net/npm/@fawazahmed0/currency-api@latest/v1/currencies/usd.min.json",
-                "https://latest.currency-api.pages.dev/v1/currencies/usd.min.json",
-            )
-        else:
-            urls = (
-                f"https://cdn.jsdelivr.net/npm/@fawazahmed0/currency-api@{version}/v1/currencies/usd.min.json",
-                f"https://{version}.currency-api.pages.dev/v1/currencies/usd.min.json",
-            )
-        last_error = None
-        for url in urls:
-            try:
-                response = requests.get(url, timeout=12, headers={"User-Agent": "NovaireSignal/1.0"})
-                response.raise_for_status()
-                payload = response.json()
-                if payload.get("date") and isinstance(payload.get("usd"), dict):
-                    return payload
-                raise ValueError("Malformed FX snapshot")
-            except Exception as exc:
-                last_error = exc
-        raise last_error or RuntimeError("FX source unavailable")
-
     try:
-        latest = fetch_snapshot("latest")
+        latest = fetch_fx_snapshot("latest")
         latest_date = datetime.strptime(latest["date"], "%Y-%m-%d").date()
         weekday = latest_date.weekday()  # Monday=0
         days_back = 3 if weekday == 0 else 2 if weekday == 6 else 1
-        previous = fetch_snapshot((latest_date - timedelta(days=days_back)).isoformat())
+        previous = fetch_fx_snapshot((latest_date - timedelta(days=days_back)).isoformat())
         results = {}
-        for currency in currencies:
-            key = currency.lower()
-            rate = float(latest["usd"][key])
-            previous_rate = float(previous["usd"][key])
-            if not math.isfinite(rate) or rate <= 0 or not math.isfinite(previous_rate) or previous_rate <= 0:
-                raise ValueError(f"Invalid FX history for {currency}")
+        for currency in FX_CURRENCIES:
+            rate = usd_rate(latest, currency)
+            previous_rate = usd_rate(previous, currency)
             change = ((rate / previous_rate) - 1.0) * 100.0
             if rate >= 1000:
                 fmt = f"{rate:,.0f}"
@@ -2572,8 +2998,6 @@ def render_html(weather, bangkok_news, zh_news, portfolio_data, catalysts,
     next_tsx_str = next((f"{n} · {d.strftime('%b %d')}" for d, n in _tsx if d > _today), "None scheduled")
 
     # ── Portfolio calculations ──
-    total_usd   = 0
-    sector_totals = {}
     port_sorted = []
 
     for h in (holdings_source or HOLDINGS):
@@ -2587,11 +3011,9 @@ def render_html(weather, bangkok_news, zh_news, portfolio_data, catalysts,
 
     port_sorted.sort(key=lambda x: (x[3] or 0), reverse=True)
 
-    for ticker, h, price, value, change, is_fallback in port_sorted:
-        if value:
-            total_usd += value
-            sector = SECTORS.get(ticker, "Other")
-            sector_totals[sector] = sector_totals.get(sector, 0) + value
+    sector_totals = group_totals([SECTORS.get(row[0], "Other") for row in port_sorted],
+                                 [row[3] or None for row in port_sorted])
+    total_usd = sum(sector_totals.values())
 
     total_cad  = total_usd * fx["usdcad"]
     roi_pct    = ((total_cad - PORT_BASIS_CAD) / PORT_BASIS_CAD * 100) if PORT_BASIS_CAD else 0
@@ -4044,18 +4466,27 @@ renderActionSteps();
   var coins={{"BTC":"BTCUSDT","ETH":"ETHUSDT","SOL":"SOLUSDT","ADA":"ADAUSDT","TON":"GRAMUSDT","SUI":"SUIUSDT","ZEC":"ZECUSDT","NIGHT":"NIGHTUSDT"}};
   var ids={{"bitcoin":"BTC","ethereum":"ETH","solana":"SOL","cardano":"ADA","the-open-network":"TON","sui":"SUI","zcash":"ZEC","midnight-3":"NIGHT"}};
   function fmt(p){{return p>=1000?"$"+p.toFixed(0).replace(/\\B(?=(\\d{{3}})+(?!\\d))/g,","):p>=1?"$"+p.toFixed(2):"$"+p.toFixed(4)}}
+  function paint(c,d){{
+    if(!d||!d.closeTime||Date.now()-Number(d.closeTime)>300000)return;
+    var el=document.querySelector('[data-crypto-price="'+c+'"]');
+    var ce=document.querySelector('[data-crypto-chg="'+c+'"]');
+    if(el)el.textContent=fmt(parseFloat(d.lastPrice));
+    if(ce){{var ch=parseFloat(d.priceChangePercent);ce.innerHTML='<span class="'+(ch>=0?"positive":"negative")+'">'+(ch>=0?"+":"")+ch.toFixed(2)+"%</span>"}}
+  }}
+  function getJson(url){{return fetch(url,{{cache:"no-store"}}).then(function(r){{if(!r.ok)throw new Error("HTTP "+r.status);return r.json()}})}}
   function updCrypto(){{
-    Object.keys(coins).forEach(function(c){{
-      fetch("https://api.binance.com/api/v3/ticker/24hr?symbol="+coins[c],{{cache:"no-store"}})
-        .then(function(r){{if(!r.ok)throw new Error("HTTP "+r.status);return r.json()}})
-        .then(function(d){{
-          if(!d.closeTime || Date.now()-Number(d.closeTime)>300000)return;
-          var el=document.querySelector('[data-crypto-price="'+c+'"]');
-          var ce=document.querySelector('[data-crypto-chg="'+c+'"]');
-          if(el)el.textContent=fmt(parseFloat(d.lastPrice));
-          if(ce){{var ch=parseFloat(d.priceChangePercent);ce.innerHTML='<span class="'+(ch>=0?"positive":"negative")+'">'+(ch>=0?"+":"")+ch.toFixed(2)+"%</span>"}}
-        }}).catch(function(){{}})
-    }})
+    // One multi-symbol request; Binance rejects it whole if a pair is unknown, so fall back per pair.
+    var pairs=Object.keys(coins).map(function(c){{return coins[c]}});
+    getJson("https://api.binance.com/api/v3/ticker/24hr?symbols="+encodeURIComponent(JSON.stringify(pairs)))
+      .then(function(rows){{
+        var bySymbol={{}};rows.forEach(function(d){{bySymbol[d.symbol]=d}});
+        Object.keys(coins).forEach(function(c){{paint(c,bySymbol[coins[c]])}});
+      }})
+      .catch(function(){{
+        Object.keys(coins).forEach(function(c){{
+          getJson("https://api.binance.com/api/v3/ticker/24hr?symbol="+coins[c]).then(function(d){{paint(c,d)}}).catch(function(){{}})
+        }})
+      }})
   }}
   function reorderCrypto(){{
     fetch("https://api.coingecko.com/api/v3/coins/markets?vs_currency=usd&ids="+Object.keys(ids).join(","))
@@ -4159,8 +4590,6 @@ def render_portfolio_html(portfolio_data, catalysts, fx, holdings_source=None, g
     gen_time  = now.strftime("%H:%M ICT")
 
     # ── Portfolio calculations (same as main) ──
-    total_usd   = 0
-    sector_totals = {}
     port_sorted = []
 
     for h in (holdings_source or HOLDINGS):
@@ -4174,11 +4603,9 @@ def render_portfolio_html(portfolio_data, catalysts, fx, holdings_source=None, g
 
     port_sorted.sort(key=lambda x: (x[3] or 0), reverse=True)
 
-    for ticker, h, price, value, change, is_fallback in port_sorted:
-        if value:
-            total_usd += value
-            sector = SECTORS.get(ticker, "Other")
-            sector_totals[sector] = sector_totals.get(sector, 0) + value
+    sector_totals = group_totals([SECTORS.get(row[0], "Other") for row in port_sorted],
+                                 [row[3] or None for row in port_sorted])
+    total_usd = sum(sector_totals.values())
 
     total_cad  = total_usd * fx["usdcad"]
     roi_pct    = ((total_cad - PORT_BASIS_CAD) / PORT_BASIS_CAD * 100) if PORT_BASIS_CAD else 0
@@ -4652,6 +5079,7 @@ document.querySelectorAll('.collapse-toggle').forEach(t => {{
 </html>"""
 
 
+@run_cached
 def fetch_polymarket_win_rate():
     """Calculate win rate from all Polymarket trades — buy avg vs sell avg per position."""
     try:
@@ -4660,7 +5088,7 @@ def fetch_polymarket_win_rate():
         offset = 0
         all_activity = []
         while True:
-            r = requests.get(f"https://data-api.polymarket.com/activity?user={wallet.lower()}&limit=100&offset={offset}", timeout=15)
+            r = http_client.get(f"https://data-api.polymarket.com/activity?user={wallet.lower()}&limit=100&offset={offset}", timeout=15)
             batch = r.json()
             if not batch:
                 break
@@ -4704,95 +5132,78 @@ def fetch_polymarket_win_rate():
     except Exception as e:
         print(f"  ⚠ Win rate calc failed: {e}")
         return {"win_rate": 0, "wins": 0, "losses": 0, "total": 0}
-def main():
 
-    print("🚀 Novaire Signal — generating daily brief...")
 
-    print("  📡 Fetching weather...")
-    weather = fetch_weather()
+def _stage_bangkok_post():
+    bangkok_news = fetch_bangkok_post()
+    print(f"    ✅ Bangkok Post: {len(bangkok_news)} headlines")
+    return bangkok_news
 
-    print("  📰 Scraping Bangkok Post...")
-    try:
-        bangkok_news = fetch_bangkok_post()
-        print(f"    ✅ {len(bangkok_news)} headlines")
-    except Exception as e:
-        print(f"    ❌ {e}")
-        bangkok_news = [{"title": "Bangkok Post unavailable", "url": "#"}]
 
-    print("  📰 Scraping ZeroHedge...")
-    try:
-        zh_news = fetch_zerohedge()
-        print(f"    ✅ {len(zh_news)} headlines")
-    except Exception as e:
-        print(f"    ❌ {e}")
-        zh_news = [{"title": "ZeroHedge unavailable", "url": "#"}]
+def _stage_zerohedge():
+    zh_news = fetch_zerohedge()
+    print(f"    ✅ ZeroHedge: {len(zh_news)} headlines")
+    return zh_news
 
-    print("  💱 Fetching FX rates (needed for portfolio conversion)...")
-    try:
-        fx = fetch_fx()
-        print(f"    ✅ USD/CAD={fx['usdcad']:.4f}  AUD/USD={fx['audusd']:.4f}")
-    except Exception as e:
-        print(f"    ❌ {e}")
-        fx = {"usdcad": 1.365, "audusd": 0.630}
 
-    print("  💱 Fetching extended FX rates for display...")
-    try:
-        fx_rates = fetch_fx_rates()
-        loaded_fx = sum(1 for v in fx_rates.values() if v.get("rate"))
-        print(f"    ✅ {loaded_fx} FX pairs loaded")
-    except Exception as e:
-        print(f"    ❌ {e}")
-        fx_rates = {}
+def _stage_fx():
+    fx = fetch_fx()
+    print(f"    ✅ USD/CAD={fx['usdcad']:.4f}  AUD/USD={fx['audusd']:.4f}")
+    return fx
 
-    print("  📈 Fetching portfolio data (yfinance)...")
-    holdings_source = HOLDINGS
-    try:
-        portfolio_data, holdings_source, gs_meta = fetch_portfolio(usdcad=fx["usdcad"], audusd=fx["audusd"])
-        apply_completed_close_changes(portfolio_data, [h["ticker"] for h in holdings_source])
-        loaded = sum(1 for v in portfolio_data.values() if v.get("price") is not None)
-        print(f"    ✅ {loaded}/{len(holdings_source)} tickers loaded")
-        if gs_meta:
-            def _fmt_sheet_value(value):
-                return f"{value:,}" if isinstance(value, (int, float)) else "?"
-            print(f"    📊 Sheet: CAD=${_fmt_sheet_value(gs_meta.get('total_cad'))}  USD=${_fmt_sheet_value(gs_meta.get('total_usd'))}  ROI={gs_meta.get('roi_pct_str') or '?'}  ATH=${_fmt_sheet_value(gs_meta.get('ath'))}")
-    except Exception as e:
-        print(f"    ❌ {e}")
-        portfolio_data = {}
-        gs_meta = {}
 
-    print("  ⚡ Updating net-worth close history (TFSA/WS + Kraken)...")
-    kraken_meta = fetch_kraken_totals()
-    portfolio_history = load_portfolio_history(PORTFOLIO_HISTORY_PATH)
-    if gs_meta.get("total_cad") and kraken_meta.get("total_cad") is not None:
-        portfolio_history = upsert_daily_snapshot(portfolio_history, gs_meta, kraken_meta)
-        save_portfolio_history(portfolio_history, PORTFOLIO_HISTORY_PATH)
-        print(
-            f"    ✅ TFSA C${gs_meta['total_cad']:,.2f} · "
-            f"Kraken US${kraken_meta['total_usd']:,.2f} · "
-            f"{len(portfolio_history.get('snapshots', []))} daily closes"
-        )
-    else:
-        print("    ⚠️  Incomplete Sheet totals; preserving the last verified close")
-    tracker_model = build_tracker_model(portfolio_history)
-    net_worth_tracker_html = render_tracker_html(tracker_model)
-    crypto_weighting_html = build_kraken_weighting_component(kraken_meta)
+def _stage_fx_rates():
+    fx_rates = fetch_fx_rates()
+    loaded_fx = sum(1 for v in fx_rates.values() if v.get("rate"))
+    print(f"    ✅ {loaded_fx} FX pairs loaded")
+    return fx_rates
+
+
+def _stage_holdings():
+    return fetch_holdings_from_gsheet()
+
+
+def _stage_quotes(holdings, rrsp_rows):
+    gs_holdings, _gs_meta = holdings
+    rrsp_positions = (parse_rrsp_rows(rrsp_rows) if rrsp_rows else {}).get("positions") or []
+    plan = plan_quotes(gs_holdings or HOLDINGS, rrsp_positions)
+    universe = fetch_quote_universe(plan)
+    summary = plan.summary()
+    print(f"    ✅ Quote plan: {summary['symbols']} symbols for {summary['requested']} requests "
+          f"({summary['shared']} shared) · {summary['charts']} charts, {summary['spark']} spark · "
+          f"{len(universe)} priced")
+    return universe
+
+
+def _stage_portfolio(fx, holdings, quotes):
+    portfolio_data, holdings_source, gs_meta = fetch_portfolio(
+        usdcad=fx["usdcad"], audusd=fx["audusd"], sheet=holdings, quotes=quotes)
+    apply_completed_close_changes(portfolio_data, [h["ticker"] for h in holdings_source], charts=quotes)
+    loaded = sum(1 for v in portfolio_data.values() if v.get("price") is not None)
+    print(f"    ✅ Portfolio: {loaded}/{len(holdings_source)} tickers loaded")
+    if gs_meta:
+        def _fmt_sheet_value(value):
+            return f"{value:,}" if isinstance(value, (int, float)) else "?"
+        print(f"    📊 Sheet: CAD=${_fmt_sheet_value(gs_meta.get('total_cad'))}  USD=${_fmt_sheet_value(gs_meta.get('total_usd'))}  ROI={gs_meta.get('roi_pct_str') or '?'}  ATH=${_fmt_sheet_value(gs_meta.get('ath'))}")
+    return portfolio_data, holdings_source, gs_meta
+
 
-    print("  🏦 Fetching RRSP holdings from its Google Sheet tab...")
-    rrsp_meta = fetch_rrsp_totals(usdcad=fx["usdcad"])
+def _stage_rrsp(fx, rrsp_rows, quotes):
+    rrsp_meta = parse_rrsp_rows(rrsp_rows, usdcad=fx["usdcad"]) if rrsp_rows else {}
     rrsp_quotes = {}
     if rrsp_meta.get("positions"):
-        yahoo_to_symbol = {}
-        for position in rrsp_meta["positions"]:
-            yahoo_ticker = EXCHANGE_TO_TICKER.get(position.get("sheet_symbol"), position["symbol"])
-            yahoo_to_symbol[yahoo_ticker] = position["symbol"]
+        yahoo_to_symbol = {rrsp_yahoo_ticker(position): position["symbol"] for position in rrsp_meta["positions"]}
         yahoo_quotes = {}
-        apply_completed_close_changes(yahoo_quotes, list(yahoo_to_symbol))
+        apply_completed_close_changes(yahoo_quotes, list(yahoo_to_symbol), charts=quotes)
         rrsp_quotes = {yahoo_to_symbol[ticker]: quote_data for ticker, quote_data in yahoo_quotes.items()}
         print(f"    ✅ {len(rrsp_meta['positions'])} RRSP positions · C${rrsp_meta['total_cad']:,.0f} · largest {rrsp_meta['positions'][0]['symbol']}")
     else:
         print("    ⚠️  RRSP tab returned no positions")
+    return rrsp_meta, rrsp_quotes
 
-    print("  🔍 Fetching catalysts (yfinance news)...")
+
+def _stage_catalysts(portfolio):
+    portfolio_data, holdings_source, _gs_meta = portfolio
     sorted_holdings = sorted(
         [h["ticker"] for h in (holdings_source or HOLDINGS)],
         key=lambda t: (portfolio_data.get(t, {}).get("value") or 0),
@@ -4801,60 +5212,145 @@ def main():
     top5 = sorted_holdings[:5]
     mover_tickers = [ticker for ticker in sorted_holdings if abs(portfolio_data.get(ticker, {}).get("close_change") or 0) >= 5]
     catalyst_tickers = list(dict.fromkeys(top5 + mover_tickers))
-    try:
-        catalysts = fetch_catalysts(catalyst_tickers)
-        found = sum(1 for value in catalysts.values() if value)
-        print(f"    ✅ Catalysts for {', '.join(catalyst_tickers)} ({found}/{len(catalyst_tickers)} with verified news ≤14d)")
-    except Exception as e:
-        print(f"    ❌ {e}")
-        catalysts = {}
+    catalysts = fetch_catalysts(catalyst_tickers)
+    found = sum(1 for value in catalysts.values() if value)
+    print(f"    ✅ Catalysts for {', '.join(catalyst_tickers)} ({found}/{len(catalyst_tickers)} with verified news ≤14d)")
+    return catalysts
 
-    print("  🪙 Fetching commodities (Investing.com)...")
-    try:
-        commodities = fetch_commodities()
-        loaded_c = sum(1 for v in commodities.values() if v.get("price"))
-        print(f"    ✅ {loaded_c}/{len(commodities)} commodities loaded")
-    except Exception as e:
-        print(f"    ❌ {e}")
-        commodities = {}
 
-    print("  🌐 Fetching crypto (Binance)...")
-    try:
-        crypto = fetch_crypto()
-        loaded_cr = sum(1 for v in crypto.values() if v.get("price"))
-        print(f"    ✅ {loaded_cr} crypto prices loaded")
-    except Exception as e:
-        print(f"    ❌ {e}")
-        crypto = {}
+def _stage_commodities():
+    commodities = fetch_commodities()
+    loaded_c = sum(1 for v in commodities.values() if v.get("price"))
+    print(f"    ✅ {loaded_c}/{len(commodities)} commodities loaded")
+    return commodities
 
-    print("  📊 Fetching Wall Street index futures...")
-    try:
-        market_futures = fetch_market_futures()
-        loaded_f = sum(1 for v in market_futures.values() if v.get("price") is not None)
-        print(f"    ✅ {loaded_f}/{len(MARKET_FUTURES)} futures loaded")
-    except Exception as e:
-        print(f"    ❌ {e}")
-        market_futures = {}
 
-    print("  📉 Fetching major cash indexes...")
-    try:
-        market_indices = fetch_market_indices()
-        loaded_i = sum(1 for v in market_indices.values() if v.get("price") is not None)
-        print(f"    ✅ {loaded_i}/{len(MARKET_INDICES)} cash indexes loaded")
-    except Exception as e:
-        print(f"    ❌ {e}")
-        market_indices = {}
+def _stage_crypto():
+    crypto = fetch_crypto()
+    loaded_cr = sum(1 for v in crypto.values() if v.get("price"))
+    print(f"    ✅ {loaded_cr} crypto prices loaded")
+    return crypto
+
+
+def _stage_market_futures():
+    market_futures = fetch_market_futures()
+    loaded_f = sum(1 for v in market_futures.values() if v.get("price") is not None)
+    print(f"    ✅ {loaded_f}/{len(MARKET_FUTURES)} futures loaded")
+    return market_futures
+
+
+def _stage_market_indices():
+    market_indices = fetch_market_indices()
+    loaded_i = sum(1 for v in market_indices.values() if v.get("price") is not None)
+    print(f"    ✅ {loaded_i}/{len(MARKET_INDICES)} cash indexes loaded")
+    return market_indices
+
+
+def _stage_polymarket_win_rate(poly):
+    # Only the open-bets card uses the win rate; skip the activity crawl otherwise.
+    return fetch_polymarket_win_rate() if poly["positions"] else None
+
+
+def _stage_signal_feed():
+    import subprocess
+    result = subprocess.run(
+        ["python3", "scripts/fetch_feed.py"],
+        capture_output=True, text=True, timeout=90,
+        cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    if result.returncode == 0:
+        print("    ✅ feed.json updated")
+    else:
+        print(f"    ⚠️  fetch_feed.py: {result.stderr[-150:]}")
+
+
+def _stage_trending_recs():
+    rec_movie, rec_book = fetch_trending_recs()
+    print(f"    ✅ Movie: {rec_movie['title'][:40]} | Book: {rec_book['title'][:40]}")
+    return rec_movie, rec_book
 
-    # FX already fetched before portfolio; ensure fallback exists
-    if not fx:
-        fx = {"usdcad": 1.365, "audusd": 0.630}
+
+def build_fetch_stages():
+    """Declare every upstream fetch and the results it depends on."""
+    return [
+        Stage("weather", fetch_weather, fallback=[], budget=60),
+        Stage("bangkok_news", _stage_bangkok_post, fallback=[{"title": "Bangkok Post unavailable", "url": "#"}], budget=60),
+        Stage("zh_news", _stage_zerohedge, fallback=[{"title": "ZeroHedge unavailable", "url": "#"}], budget=60),
+        Stage("fx", _stage_fx, fallback=dict(DEFAULT_FX), budget=45),
+        Stage("fx_rates", _stage_fx_rates, fallback={}, budget=45),
+        Stage("holdings", _stage_holdings, fallback=(None, {}), budget=45),
+        Stage("rrsp_rows", fetch_rrsp_rows, fallback=[], budget=45),
+        # Every Yahoo symbol the portfolio pages need, fetched once for all of them.
+        Stage("quotes", _stage_quotes, needs=("holdings", "rrsp_rows"), fallback={}, budget=180),
+        Stage("portfolio", _stage_portfolio, needs=("fx", "holdings", "quotes"), fallback=({}, HOLDINGS, {}), budget=300),
+        Stage("kraken", fetch_kraken_totals, fallback={}, budget=30),
+        Stage("rrsp", _stage_rrsp, needs=("fx", "rrsp_rows", "quotes"), fallback=({}, {}), budget=90),
+        Stage("catalysts", _stage_catalysts, needs=("portfolio",), fallback={}, budget=180),
+        Stage("commodities", _stage_commodities, fallback={}, budget=180),
+        Stage("crypto", _stage_crypto, fallback={}, budget=45),
+        Stage("market_futures", _stage_market_futures, fallback={}, budget=150),
+        Stage("market_indices", _stage_market_indices, fallback={}, budget=45),
+        Stage("polymarket", fetch_polymarket, fallback={"positions": [], "total_account": 0, "inception_roi": 0}, budget=45),
+        Stage("polymarket_win_rate", _stage_polymarket_win_rate, needs=("polymarket",),
+              fallback={"win_rate": 0, "wins": 0, "losses": 0, "total": 0}, budget=90),
+        Stage("alpaca", fetch_alpaca, fallback={"funded": False, "positions": []}, budget=90),
+        Stage("signal_feed", _stage_signal_feed, budget=120),
+        Stage("trending_recs", _stage_trending_recs, fallback=(None, None), budget=90),
+    ]
+
+
+def build_site(deadline=None):
+
+    print("🚀 Novaire Signal — generating daily brief...")
+
+    stages = build_fetch_stages()
+    print(f"  📡 Fetching {len(stages)} upstream stages ({FETCH_WORKERS} workers)...")
+    degraded = {}
+    with TRACE.span("fetch"):
+        fetched = run_stages(stages, max_workers=FETCH_WORKERS, deadline=deadline,
+                             last_good=LastGoodStore(STAGE_CACHE_DIR), degraded=degraded)
+    if degraded:
+        print(f"  ⚠️  Degraded stages: {', '.join(sorted(degraded))}")
+    weather = fetched["weather"]
+    bangkok_news = fetched["bangkok_news"]
+    zh_news = fetched["zh_news"]
+    fx = fetched["fx"] or dict(DEFAULT_FX)
+    fx_rates = fetched["fx_rates"]
+    portfolio_data, holdings_source, gs_meta = fetched["portfolio"]
+    kraken_meta = fetched["kraken"]
+    rrsp_meta, rrsp_quotes = fetched["rrsp"]
+    catalysts = fetched["catalysts"]
+    commodities = fetched["commodities"]
+    crypto = fetched["crypto"]
+    market_futures = fetched["market_futures"]
+    market_indices = fetched["market_indices"]
+    rec_movie, rec_book = fetched["trending_recs"]
+
+    print("  ⚡ Updating net-worth close history (TFSA/WS + Kraken)...")
+    portfolio_history = load_portfolio_history(PORTFOLIO_HISTORY_PATH)
+    # A degraded stage hands back an earlier run's totals; never record them as today's close.
+    stale_totals = sorted({"portfolio", "kraken"} & set(degraded))
+    if stale_totals:
+        print(f"    ⚠️  Stale {', '.join(stale_totals)} totals; preserving the last verified close")
+    elif gs_meta.get("total_cad") and kraken_meta.get("total_cad") is not None:
+        portfolio_history = upsert_daily_snapshot(portfolio_history, gs_meta, kraken_meta)
+        save_portfolio_history(portfolio_history, PORTFOLIO_HISTORY_PATH)
+        print(
+            f"    ✅ TFSA C${gs_meta['total_cad']:,.2f} · "
+            f"Kraken US${kraken_meta['total_usd']:,.2f} · "
+            f"{len(portfolio_history.get('snapshots', []))} daily closes"
+        )
+    else:
+        print("    ⚠️  Incomplete Sheet totals; preserving the last verified close")
+    tracker_model = build_tracker_model(portfolio_history)
+    net_worth_tracker_html = render_tracker_html(tracker_model)
+    crypto_weighting_html = build_kraken_weighting_component(kraken_meta)
 
     # ── Polymarket (Novairecito) — top open bets + wins/losses only ──
-    print("  🎰 Fetching Polymarket positions...")
-    poly = fetch_polymarket()
+    poly = fetched["polymarket"]
     poly_html = ""
     if poly["positions"]:
-        pm_wr_summary = fetch_polymarket_win_rate()
+        pm_wr_summary = fetched["polymarket_win_rate"]
         bets_html = ""
         for p in poly["positions"][:4]:  # Show top 4 open bets by weight
             pnl = p["pct_pnl"]
@@ -4872,8 +5368,7 @@ def main():
 </details>'''
 
     # ── Alpaca (Novaire's bot) ──
-    print("  📈 Fetching Alpaca positions...")
-    alpaca = fetch_alpaca()
+    alpaca = fetched["alpaca"]
     alpaca_html = ""
     if alpaca["funded"]:
         def _alp_rows(positions, label):
@@ -4918,29 +5413,6 @@ def main():
     spanish_word = pick(SPANISH_WORDS, 7)
     motivation = pick(MOTIVATION_QUOTES, 11)
 
-    print("  📡 Refreshing Signal Feed (Nitter RSS → feed.json)...")
-    try:
-        import subprocess, os as _os
-        result = subprocess.run(
-            ["python3", "scripts/fetch_feed.py"],
-            capture_output=True, text=True, timeout=90,
-            cwd=_os.path.dirname(_os.path.abspath(__file__))
-        )
-        if result.returncode == 0:
-            print("    ✅ feed.json updated")
-        else:
-            print(f"    ⚠️  fetch_feed.py: {result.stderr[-150:]}")
-    except Exception as e:
-        print(f"    ⚠️  Signal feed refresh failed: {e}")
-
-    print("  🎬 Fetching trending recs...")
-    try:
-        rec_movie, rec_book = fetch_trending_recs()
-        print(f"    ✅ Movie: {rec_movie['title'][:40]} | Book: {rec_book['title'][:40]}")
-    except Exception as e:
-        print(f"    ❌ {e}")
-        rec_movie, rec_book = None, None
-
     print("  🏛️ Building Fed Signal...")
     fed_signal = fetch_fed_signal()
     print(f"    ✅ Next FOMC: {fed_signal['next_decision']} ({fed_signal['days_until']} days)")
@@ -4956,6 +5428,7 @@ def main():
     suggested_tweet = build_suggested_tweet(gs_meta=gs_meta, fed_signal=fed_signal, zh_news=zh_news)
 
     print("  🎨 Generating HTML...")
+    TRACE.begin("render_index")
     html = render_html(
         weather, bangkok_news, zh_news, portfolio_data, catalysts,
         commodities, crypto, fx, zodiac, thai_word, motivation,
@@ -4970,26 +5443,26 @@ def main():
         market_futures=market_futures,
         market_indices=market_indices
     )
+    TRACE.end("render_index")
 
     print("  📦 Generating portfolio page...")
+    TRACE.begin("portfolio_accounts")
 
     # ── Bot Accounts for Portfolio page (full $ detail) ──
     bot_accounts_html = ""
 
     # Polymarket · Novairecito
     print("  🎰 Calculating Polymarket win rate...")
-    pm_wr = fetch_polymarket_win_rate()
-    poly_full = fetch_polymarket()
+    # Reuse the stage results: re-calling a fetcher whose stage was abandoned
+    # would wait on that stage's in-flight call.
+    pm_wr = fetched["polymarket_win_rate"] or fetch_polymarket_win_rate()
+    poly_full = fetched["polymarket"]
     if poly_full["positions"] or poly_full.get("total_account", 0) > 0:
         pm_inception = 222.00  # confirmed by Novaire Mar 15  # reset 2026-03-03
         pm_rows = ""
-        # Re-fetch with full data for portfolio page
+        # Full position fields (initial value, longer titles) for the portfolio page
         try:
-            import urllib.request as _ur
-            _proxy = "0xC1541b2af765e4d1013337084D889d0DB302Aa0e"
-            _req = _ur.Request(f"https://data-api.polymarket.com/positions?user={_proxy}", headers={"User-Agent": "Mozilla/5.0"})
-            with _ur.urlopen(_req, timeout=10) as _resp:
-                _positions = json.loads(_resp.read())
+            _positions = fetch_polymarket_positions()
             pm_pos_val = 0
             open_positions = []
             for _p in _positions:
@@ -5036,7 +5509,7 @@ def main():
   </div>"""
 
     # Alpaca — unified Livermore Darvis view
-    alpaca_full = fetch_alpaca()
+    alpaca_full = fetched["alpaca"]
     if alpaca_full.get("funded"):
         all_positions = (alpaca_full.get("tier2_positions", []) + alpaca_full.get("tier1_positions", []))
         all_positions.sort(key=lambda p: float(p.get("market_value", 0)), reverse=True)
@@ -5085,80 +5558,19 @@ def main():
     evo_snapshot = {}
     evo_daily_positions = []
     try:
-        EVO_HOLDINGS = [
-            {"ticker": "PHYS",  "name": "Gold (Sprott)",         "shares": 16827, "avg_entry": 36.95},
-            {"ticker": "URNM",  "name": "Uranium",               "shares": 6000,  "avg_entry": 67.72},
-            {"ticker": "GRID",  "name": "Grid Infrastructure",   "shares": 2177,  "avg_entry": 176.81},
-            {"ticker": "PSLV",  "name": "Silver (Sprott)",       "shares": 8545,  "avg_entry": 29.02},
-            {"ticker": "COPX",  "name": "Copper Miners",         "shares": 2000,  "avg_entry": 83.96},
-            {"ticker": "COPP",  "name": "Copper",                "shares": 5047,  "avg_entry": 43.60},
-            {"ticker": "URNJ",  "name": "Jr Uranium",            "shares": 3151,  "avg_entry": 34.91},
-            {"ticker": "SGDJ",  "name": "Gold Miners",           "shares": 1002,  "avg_entry": 109.73},
-            {"ticker": "AAPL",  "name": "Apple",                 "shares": 31,    "avg_entry": 261.55},
-            {"ticker": "CEG",   "name": "Constellation Energy",  "shares": 177,   "avg_entry": 312.30},
-            {"ticker": "VST",   "name": "Vistra Energy",         "shares": 322,   "avg_entry": 170.54},
-        ]
-        EVO_BTC = {"shares": 6.72, "avg_entry": 65500.00, "name": "Bitcoin (8% alloc)"}
-
-        # Fetch live prices
-        evo_tickers = [h["ticker"] for h in EVO_HOLDINGS]
-        _evo_daily = {ticker: {} for ticker in evo_tickers}
-        apply_completed_close_changes(_evo_daily, evo_tickers)
-        import yfinance as _yf
-        _evo_data = _yf.download(evo_tickers, period="2d", progress=False)
-        _evo_close = _evo_data.get("Close", _evo_data.get(("Close",), None))
-
-        # Bitcoin is an Evolution Fund position, not the removed Kraken margin book.
-        btc_price = None
-        try:
-            _btc = _yf.Ticker("BTC-USD")
-            btc_price = float(_btc.history(period="1d")["Close"].iloc[-1])
-        except:
-            btc_price = EVO_BTC["avg_entry"]
-
+        evo = value_evolution_fund(crypto, quotes=fetched["quotes"])
+        evo_snapshot = evo["snapshot"]
+        evo_total_value = evo["total_value"]
+        evo_total_cost = evo["total_cost"]
         evo_rows = ""
-        evo_total_value = 0
-        evo_total_cost = 0
-
-        for h in EVO_HOLDINGS:
-            sym = h["ticker"]
-            shares = h["shares"]
-            avg = h["avg_entry"]
-            cost = shares * avg
-            try:
-                if _evo_daily.get(sym, {}).get("close_price") is not None:
-                    price = float(_evo_daily[sym]["close_price"])
-                elif hasattr(_evo_close, "columns") and sym in _evo_close.columns:
-                    price = float(_evo_close[sym].dropna().iloc[-1])
-                else:
-                    price = float(_evo_close[sym].dropna().iloc[-1]) if sym in str(_evo_close) else avg
-            except:
-                price = avg
-            value = shares * price
-            daily_change = _evo_daily.get(sym, {}).get("close_change")
-            gl = value - cost
-            gl_pct = (gl / cost * 100) if cost > 0 else 0
-            evo_total_value += value
-            evo_total_cost += cost
-            evo_snapshot[sym] = {"price": round(price, 2), "gl": round(gl_pct, 1)}
-            evo_daily_positions.append({"symbol": sym, "value": value, "change": daily_change})
+        for position in evo["positions"]:
+            evo_daily_positions.append({"symbol": position["ticker"], "value": position["value"], "change": position["change"]})
+            gl, gl_pct = position["gl"], position["gl_pct"]
             gl_color = "var(--green)" if gl >= 0 else "var(--red)"
             gl_str = f"+${gl:,.0f}" if gl >= 0 else f"-${abs(gl):,.0f}"
             pct_str = f"+{gl_pct:.1f}%" if gl_pct >= 0 else f"{gl_pct:.1f}%"
-            evo_rows += f'<tr><td class="ticker">{sym}</td><td style="font-size:.78rem">{h["name"]}</td><td style="text-align:right;font-size:.78rem">{shares:,}</td><td style="text-align:right;font-size:.78rem">${price:,.2f}</td><td style="text-align:right;font-size:.78rem">${value:,.0f}</td><td style="text-align:right;font-size:.78rem;color:{gl_color}">{gl_str}</td><td style="text-align:right;font-size:.78rem;color:{gl_color};font-weight:600">{pct_str}</td></tr>'
-
-        btc_cost = EVO_BTC["shares"] * EVO_BTC["avg_entry"]
-        btc_value = EVO_BTC["shares"] * btc_price
-        btc_gl = btc_value - btc_cost
-        btc_pct = (btc_gl / btc_cost * 100) if btc_cost > 0 else 0
-        evo_total_value += btc_value
-        evo_total_cost += btc_cost
-        evo_snapshot["BTC"] = {"price": round(btc_price, 2), "gl": round(btc_pct, 1)}
-        evo_daily_positions.append({"symbol": "BTC", "value": btc_value, "change": crypto.get("BTC", {}).get("change")})
-        btc_color = "var(--green)" if btc_gl >= 0 else "var(--red)"
-        btc_gl_str = f"+${btc_gl:,.0f}" if btc_gl >= 0 else f"-${abs(btc_gl):,.0f}"
-        btc_pct_str = f"+{btc_pct:.1f}%" if btc_pct >= 0 else f"{btc_pct:.1f}%"
-        evo_rows += f'<tr><td class="ticker">BTC</td><td style="font-size:.78rem">{EVO_BTC["name"]}</td><td style="text-align:right;font-size:.78rem">{EVO_BTC["shares"]}</td><td style="text-align:right;font-size:.78rem">${btc_price:,.2f}</td><td style="text-align:right;font-size:.78rem">${btc_value:,.0f}</td><td style="text-align:right;font-size:.78rem;color:{btc_color}">{btc_gl_str}</td><td style="text-align:right;font-size:.78rem;color:{btc_color};font-weight:600">{btc_pct_str}</td></tr>'
+            shares = f'{position["shares"]:,}' if isinstance(position["shares"], int) else f'{position["shares"]}'
+            evo_rows += f'<tr><td class="ticker">{position["ticker"]}</td><td style="font-size:.78rem">{position["name"]}</td><td style="text-align:right;font-size:.78rem">{shares}</td><td style="text-align:right;font-size:.78rem">${position["price"]:,.2f}</td><td style="text-align:right;font-size:.78rem">${position["value"]:,.0f}</td><td style="text-align:right;font-size:.78rem;color:{gl_color}">{gl_str}</td><td style="text-align:right;font-size:.78rem;color:{gl_color};font-weight:600">{pct_str}</td></tr>'
 
         evo_gl_total = evo_total_value - evo_total_cost
         evo_roi = (evo_gl_total / evo_total_cost * 100) if evo_total_cost > 0 else 0
@@ -5206,7 +5618,7 @@ def main():
       </div>
     </div>
   </div>"""
-        print(f"    ✅ Evolution Fund: {len(EVO_HOLDINGS)+1} positions, ${evo_total_value:,.0f} total value")
+        print(f"    ✅ Evolution Fund: {len(evo['positions'])} positions, ${evo_total_value:,.0f} total value")
     except Exception as e:
         print(f"    ❌ Evolution Fund error: {e}")
         evo_fund_html = ""
@@ -5237,12 +5649,14 @@ def main():
     except Exception as e:
         print(f"    ⚠️  Evolution CC strategy page update failed: {e}")
 
-    portfolio_html = render_portfolio_html(
-        portfolio_data, catalysts, fx, holdings_source=holdings_source, gs_meta=gs_meta,
-        bot_accounts_html=bot_accounts_html, evo_fund_html=evo_fund_html,
-        net_worth_tracker_html=net_worth_tracker_html,
-        crypto_weighting_html=crypto_weighting_html,
-    )
+    TRACE.end("portfolio_accounts")
+    with TRACE.span("render_portfolio"):
+        portfolio_html = render_portfolio_html(
+            portfolio_data, catalysts, fx, holdings_source=holdings_source, gs_meta=gs_meta,
+            bot_accounts_html=bot_accounts_html, evo_fund_html=evo_fund_html,
+            net_worth_tracker_html=net_worth_tracker_html,
+            crypto_weighting_html=crypto_weighting_html,
+        )
 
     required_thai_markers = [
         'data-thai-expat-brief="verified"',
@@ -5261,6 +5675,7 @@ def main():
             + repr(retired_hits)
         )
 
+    TRACE.begin("write")
     os.makedirs(os.path.dirname(OUTPUT), exist_ok=True)
     with open(OUTPUT, "w", encoding="utf-8") as f:
         f.write(html)
@@ -5292,6 +5707,7 @@ def main():
         zh_news=zh_news,
         catalysts=catalysts,
     )
+    TRACE.end("write")
     print(f"  ✅ HTML saved to {OUTPUT} + {repo_index} ({len(html):,} bytes)")
     print(f"  ✅ Portfolio page saved to {portfolio_path} ({len(portfolio_html):,} bytes)")
     print(f"  ✅ Portfolio Daily saved to {daily_path}")
@@ -5317,6 +5733,9 @@ def main():
                 stats_roi_pct_str = None
         if not stats_roi_pct_str and stats_total_cad and PORT_BASIS_CAD:
             stats_roi_pct_str = f"{((stats_total_cad - PORT_BASIS_CAD) / PORT_BASIS_CAD * 100):.2f}%"
+        if stale_totals:
+            # An earlier run's totals would read as today's in the cron summary.
+            stats_total_usd = stats_total_cad = stats_roi_pct_str = None
 
         stats = {
             "generated_utc": datetime.now(timezone.utc).isoformat(),
@@ -5327,7 +5746,15 @@ def main():
             },
             "polymarket": {
                 "total_account": poly.get("total_account", 0) if poly else 0,
-            }
+            },
+            "run_cache": RUN_CACHE.summary(),
+            "http": http_client.connection_stats(),
+            "http_cache": response_cache.summary(),
+            "degraded_stages": degraded,
+            "circuit_breaker": BREAKER.summary(),
+            "hedging": hedging_summary(),
+            "rate_limits": RATE_LIMITER.summary(),
+            "quote_providers": QUOTES.summary(),
         }
         stats_path = os.path.join(repo_dir, "stats.json")
         with open(stats_path, "w", encoding="utf-8") as f:
@@ -5336,5 +5763,34 @@ def main():
     except Exception as e:
         print(f"  ⚠️  stats.json failed: {e}")
 
+def write_run_trace():
+    try:
+        TRACE.write(RUN_TRACE_PATH)
+        print(f"  🧭 Run trace written to {RUN_TRACE_PATH} ({TRACE.now():.1f}s total)")
+    except Exception as e:
+        print(f"  ⚠️  run_trace.json failed: {e}")
+
+
+def main():
+    TRACE.reset()
+    deadline = time.monotonic() + RUN_DEADLINE_SECONDS
+    http_client.set_deadline(deadline)
+    response_cache.prune()
+    try:
+        with RUN_CACHE.run():
+            build_site(deadline)
+            cache = RUN_CACHE.summary()
+    finally:
+        # A failed build's trace is the one most worth reading.
+        write_run_trace()
+    print(f"  ♻️  Run cache: {cache['upstream_calls']} upstream calls, {cache['saved_calls']} duplicates saved")
+    breaker = BREAKER.summary()
+    if breaker["open"]:
+        print(f"  🔌 Circuits open: {', '.join(breaker['open'])} ({sum(breaker['skipped'].values())} requests skipped)")
+    pool = http_client.connection_stats()
+    disk = response_cache.summary()
+    print(f"  💾 HTTP cache: {disk['hits']} hits, {disk['revalidated']} revalidated, {disk['stale']} stale, {disk['stored']} stored, {disk['pruned']} pruned")
+    print(f"  🔌 HTTP pool: {pool['requests']} requests ({pool['failed']} failed) over {pool['connections']} connections ({pool['reused']} reused)")
+
 if __name__ == "__main__":
     main()
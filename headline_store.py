@@ -0,0 +1,196 @@
+"""Cross-run SQLite store of every headline the build has seen.
+
+Each headline is keyed by a fingerprint of its canonical URL (lowercase
+host, no fragment, no tracking parameters, no trailing slash) plus a hash
+of its normalized title. That makes the same story from one feed dedupe
+across runs however the link was decorated.
+
+Fetchers `ingest` whatever a feed currently lists. Only unseen items reach
+the scoring callback and get stored; items already known just have
+`last_seen` refreshed. Cards read back a window with `recent`, so a
+headline that has rolled out of a fast feed stays available until it ages
+out. `crawled_at`/`mark_crawled` let a fetcher skip re-crawling a source
+it read recently.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterable
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from response_cache import CACHE_DIR
+from stage_scheduler import abandoned
+
+RETENTION_DAYS = 30
+TRACKING_PARAMS = re.compile(r"^(utm_\w+|fbclid|gclid|mc_cid|mc_eid|ref|cmpid|ocid)$", re.IGNORECASE)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS headlines (
+    fingerprint TEXT NOT NULL,
+    feed TEXT NOT NULL,
+    title TEXT NOT NULL,
+    url TEXT NOT NULL,
+    source TEXT NOT NULL DEFAULT '',
+    summary TEXT NOT NULL DEFAULT '',
+    score REAL,
+    published TEXT,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    PRIMARY KEY (feed, fingerprint)
+);
+CREATE INDEX IF NOT EXISTS headlines_feed_seen ON headlines (feed, last_seen);
+CREATE TABLE IF NOT EXISTS crawls (
+    feed TEXT PRIMARY KEY,
+    crawled_at TEXT NOT NULL
+);
+"""
+
+
+def _iso(moment: datetime) -> str:
+    return moment.astimezone(timezone.utc).isoformat(timespec="seconds")
+
+
+def _parse(raw: str | None) -> datetime | None:
+    return datetime.fromisoformat(raw) if raw else None
+
+
+def canonical_url(url: str) -> str:
+    parts = urlsplit((url or "").strip())
+    if not parts.netloc:
+        return (url or "").strip()
+    query = urlencode(sorted((key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+                             if not TRACKING_PARAMS.match(key)))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower().removeprefix("www."),
+                       parts.path.rstrip("/") or "/", query, ""))
+
+
+def normalize_title(title: str) -> str:
+    return " ".join(re.sub(r"[^\w\s]", " ", (title or "").casefold()).split())
+
+
+def fingerprint(url: str, title: str) -> str:
+    title_hash = hashlib.sha1(normalize_title(title).encode("utf-8")).hexdigest()
+    return hashlib.sha1(f"{canonical_url(url)}\n{title_hash}".encode("utf-8")).hexdigest()
+
+
+class HeadlineStore:
+    def __init__(self, path: Path | str) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._db is None:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                db = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+                db.executescript(SCHEMA)
+            except (OSError, sqlite3.Error) as exc:
+                # Unwritable cache: keep this run's dedup in memory.
+                print(f"    ⚠️  Headline store unavailable ({exc}); using memory")
+                db = sqlite3.connect(":memory:", check_same_thread=False)
+                db.executescript(SCHEMA)
+            db.row_factory = sqlite3.Row
+            cutoff = _iso(datetime.now(timezone.utc) - timedelta(days=RETENTION_DAYS))
+            with db:
+                db.execute("DELETE FROM headlines WHERE last_seen < ?", (cutoff,))
+            self._db = db
+        return self._db
+
+    def ingest(
+        self,
+        feed: str,
+        items: Iterable[dict[str, Any]],
+        score: Callable[[dict[str, Any]], float | None] | None = None,
+        now: datetime | None = None,
+    ) -> list[dict[str, Any]]:
+        """Store unseen items (scored once) and refresh `last_seen` on known ones.
+
+        Items are dicts with `title` and `url`, plus optional `source`,
+        `summary` and `published` (datetime). Returns the newly stored items.
+        An item whose scoring raises is skipped (and retried next run); the
+        rest of the batch is still stored. An abandoned stage stores nothing.
+        """
+        if abandoned():
+            return []
+        stamp = _iso(now or datetime.now(timezone.utc))
+        fresh = []
+        with self._lock:
+            db = self._connection()
+            with db:
+                for item in items:
+                    key = fingerprint(item.get("url", ""), item.get("title", ""))
+                    touched = db.execute("UPDATE headlines SET last_seen = ? WHERE feed = ? AND fingerprint = ?",
+                                         (stamp, feed, key)).rowcount
+                    if touched:
+                        continue
+                    try:
+                        points = score(item) if score else None
+                    except Exception as exc:
+                        print(f"    ⚠️  {feed}: could not score {item.get('title', '')[:60]!r}: {exc}")
+                        continue
+                    published = item.get("published")
+                    db.execute(
+                        "INSERT INTO headlines (fingerprint, feed, title, url, source, summary, score, published,"
+                        " first_seen, last_seen) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (key, feed, item.get("title", ""), item.get("url", ""), item.get("source") or "",
+                         item.get("summary") or "", points,
+                         _iso(published) if published else None, stamp, stamp),
+                    )
+                    fresh.append(item)
+        return fresh
+
+    def recent(
+        self,
+        feed: str,
+        *,
+        seen_since: datetime | None = None,
+        published_since: datetime | None = None,
+        order: str = "published",
+        limit: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """Stored headlines for `feed`, newest first (or best `score` first).
+
+        Items without a pubDate count as published when first seen. Under
+        `order="score"` unscored items come last, newest first, so a feed
+        stored without scores keeps its published-date order.
+        """
+        clauses, params = ["feed = ?"], [feed]
+        if seen_since:
+            clauses.append("last_seen >= ?")
+            params.append(_iso(seen_since))
+        if published_since:
+            clauses.append("COALESCE(published, first_seen) >= ?")
+            params.append(_iso(published_since))
+        ranking = {"published": "COALESCE(published, first_seen) DESC",
+                   "score": "score IS NULL, score DESC, COALESCE(published, first_seen) DESC"}[order]
+        sql = f"SELECT * FROM headlines WHERE {' AND '.join(clauses)} ORDER BY {ranking}, rowid"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        with self._lock:
+            rows = self._connection().execute(sql, params).fetchall()
+        return [{**dict(row), "published": _parse(row["published"]),
+                 "first_seen": _parse(row["first_seen"]), "last_seen": _parse(row["last_seen"])} for row in rows]
+
+    def crawled_at(self, feed: str) -> datetime | None:
+        with self._lock:
+            row = self._connection().execute("SELECT crawled_at FROM crawls WHERE feed = ?", (feed,)).fetchone()
+        return _parse(row["crawled_at"]) if row else None
+
+    def mark_crawled(self, feed: str, now: datetime | None = None) -> None:
+        if abandoned():
+            return
+        with self._lock:
+            db = self._connection()
+            with db:
+                db.execute("INSERT OR REPLACE INTO crawls (feed, crawled_at) VALUES (?, ?)",
+                           (feed, _iso(now or datetime.now(timezone.utc))))
+
+
+HEADLINES = HeadlineStore(CACHE_DIR / "headlines.sqlite3")
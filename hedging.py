@@ -0,0 +1,137 @@
+"""Hedged calls for fetchers that already have an equivalent backup source.
+
+`hedged(primary, backup, key=...)` starts `primary`, and if it has not
+answered by the p90 of its recent latencies it starts `backup` too, keeping
+whichever acceptable answer lands first. Both callables must raise on an
+answer they would reject, so hedging never changes which results are
+accepted. Without enough latency history the backup only runs after the
+primary fails, exactly as before.
+
+The losing call is abandoned, not cancelled: a blocking `requests` call
+cannot be interrupted, so it keeps its worker (and connection) until it
+answers or hits its own timeout, and its answer is dropped. `_pool` is
+sized for that.
+
+Latencies persist in `.cache/latency.json` so the first call of a build
+already knows each primary's p90.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, TypeVar
+
+from response_cache import CACHE_DIR
+from run_trace import TRACE
+
+T = TypeVar("T")
+
+# Samples kept per primary; p90 needs a handful before it means anything.
+LATENCY_WINDOW = 50
+HEDGE_MIN_SAMPLES = 5
+
+
+class LatencyHistory:
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._samples: dict[str, list[float]] | None = None
+
+    def _state(self) -> dict[str, list[float]]:
+        if self._samples is None:
+            try:
+                self._samples = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                self._samples = {}
+        return self._samples
+
+    def record(self, key: str, seconds: float) -> None:
+        with self._lock:
+            samples = self._state().setdefault(key, [])
+            samples.append(round(seconds, 3))
+            del samples[:-LATENCY_WINDOW]
+            snapshot = json.dumps(self._state())
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(snapshot, encoding="utf-8")
+            os.replace(tmp, self.path)
+        except OSError:
+            tmp.unlink(missing_ok=True)
+
+    def p90(self, key: str) -> float | None:
+        with self._lock:
+            samples = sorted(self._state().get(key, []))
+        if len(samples) < HEDGE_MIN_SAMPLES:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * 0.9))]
+
+
+LATENCY = LatencyHistory(CACHE_DIR / "latency.json")
+# Up to five hedged calls overlap in a build (FX latest and dated; TFSA,
+# Kraken and RRSP sheets). Each needs two workers, plus one for a loser that
+# can outlive its call, so a new call never queues behind an abandoned one.
+HEDGE_WORKERS = 16
+_pool = ThreadPoolExecutor(max_workers=HEDGE_WORKERS, thread_name_prefix="hedge")
+_lock = threading.Lock()
+_stats = {"calls": 0, "hedged": 0, "backup_won": 0}
+
+
+def summary() -> dict[str, int]:
+    with _lock:
+        return dict(_stats)
+
+
+def _count(name: str) -> None:
+    with _lock:
+        _stats[name] += 1
+
+
+def hedged(primary: Callable[[], T], backup: Callable[[], T], *, key: str) -> T:
+    """Return the first acceptable answer from `primary` or its hedge `backup`.
+
+    A loser that has not started is cancelled; one already running is
+    abandoned and runs to its own timeout.
+    """
+    _count("calls")
+    started = time.monotonic()
+    first = _pool.submit(contextvars.copy_context().run, primary)
+
+    def remember(future: Future) -> None:
+        if not future.cancelled() and future.exception() is None:
+            LATENCY.record(key, time.monotonic() - started)
+
+    first.add_done_callback(remember)
+    done, _ = wait([first], timeout=LATENCY.p90(key))
+    if first in done:
+        try:
+            return first.result()
+        except Exception as exc:
+            TRACE.fallback("backup", key=key, error=type(exc).__name__)
+            return backup()
+
+    _count("hedged")
+    second = _pool.submit(contextvars.copy_context().run, backup)
+    pending = {first, second}
+    last_error: Exception | None = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            try:
+                result = future.result()
+            except Exception as exc:
+                last_error = exc
+                continue
+            for other in pending:
+                other.cancel()  # no-op once running: the loser is abandoned
+            if future is second:
+                _count("backup_won")
+                TRACE.fallback("hedge", key=key, winner="backup")
+            return result
+    raise last_error or RuntimeError(f"{key}: primary and backup both failed")
@@ -0,0 +1,368 @@
+"""Shared HTTP transport for every Novaire Signal fetcher.
+
+Every request is a coroutine on one background asyncio event loop. When
+`aiohttp` is installed the loop multiplexes all in-flight requests over
+one `aiohttp.ClientSession`, so a fan-out of Yahoo charts, Binance pairs,
+Reddit subs and Google News queries waits on sockets, not threads, and
+repeat calls to a host reuse a kept-alive connection. Fetchers keep
+calling a synchronous `get`/`post` facade with the same arguments they
+passed to `requests` and get a `requests.Response` back; fan-out call
+sites (one request per ticker, pair, subreddit or account) hand the whole
+batch to `get_many`, which gathers it on the loop and returns the
+responses in input order. `call_many` runs clients that bring their own
+blocking HTTP stack (yfinance) on a shared thread pool instead.
+
+GETs for slow-changing sources are served from `response_cache` first,
+hosts that keep failing are skipped by `circuit_breaker`, and
+`rate_limiter` paces each host and backs off on 429s.
+
+Both workflows install `aiohttp`, but it stays optional: without it each
+request runs the blocking `requests` call on the loop's executor (one
+thread per request in flight), so a checkout with only `requests`
+installed still builds.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import contextvars
+import functools
+import ssl
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Coroutine, Iterable
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+try:
+    import aiohttp
+except ImportError:  # Optional: requests on the loop's executor stands in.
+    aiohttp = None
+
+import response_cache
+from circuit_breaker import BREAKER, FAILURE_STATUSES, CircuitOpenError, circuit_key
+from rate_limiter import RATE_LIMITER, retry_after_seconds
+from run_trace import TRACE
+
+# Upper bound on requests in flight across the whole process.
+MAX_CONCURRENCY = 16
+# Extra attempts after a 429, each after the host's Retry-After pause.
+MAX_429_RETRIES = 1
+# Distinct hosts whose pools stay open; a build talks to roughly 30.
+POOL_HOSTS = 64
+
+DEFAULT_HEADERS = {"User-Agent": "NovaireSignal/1.0"}
+# Per-provider defaults; headers passed by the caller always win.
+PROVIDER_HEADERS = {
+    "query1.finance.yahoo.com": {"User-Agent": "Mozilla/5.0 NovaireSignal/1.0"},
+    "www.reddit.com": {"User-Agent": "NovaireSignal/1.0"},
+    "api.binance.com": {"Accept": "application/json"},
+    "api.coingecko.com": {"Accept": "application/json"},
+    "data-api.polymarket.com": {"Accept": "application/json"},
+    "news.google.com": {"Accept": "application/rss+xml, application/xml"},
+}
+
+_pool: ThreadPoolExecutor | None = None
+_pool_lock = threading.Lock()
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+_loop: asyncio.AbstractEventLoop | None = None
+_loop_lock = threading.Lock()
+_client: Any = None  # aiohttp.ClientSession; only touched on the loop thread.
+_host_requests: Counter[str] = Counter()
+_host_failures: Counter[str] = Counter()
+_host_connections: Counter[str] = Counter()
+_deadline: float | None = None
+
+
+def session() -> requests.Session:
+    """Return the keep-alive `requests` session used when aiohttp is missing."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            pooled = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=MAX_CONCURRENCY)
+            pooled.mount("https://", adapter)
+            pooled.mount("http://", adapter)
+            pooled.headers.update(DEFAULT_HEADERS)
+            _session = pooled
+    return _session
+
+
+def set_deadline(deadline: float | None) -> None:
+    """Clamp every later request's timeout to a run-wide `time.monotonic()` deadline."""
+    global _deadline
+    _deadline = deadline
+
+
+def _clamp_timeout(timeout: Any) -> Any:
+    if _deadline is None:
+        return timeout
+    remaining = _deadline - time.monotonic()
+    if remaining <= 0:
+        raise requests.Timeout("run deadline reached")
+    if timeout is None:
+        return remaining
+    if isinstance(timeout, tuple):
+        return tuple(remaining if part is None else min(part, remaining) for part in timeout)
+    return min(timeout, remaining)
+
+
+def _event_loop() -> asyncio.AbstractEventLoop:
+    """Start the transport's event loop on a daemon thread on first use."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            # Only the requests fallback uses the executor: one thread per request in flight.
+            loop.set_default_executor(ThreadPoolExecutor(max_workers=MAX_CONCURRENCY, thread_name_prefix="http-sync"))
+            threading.Thread(target=loop.run_forever, name="http-loop", daemon=True).start()
+            _loop = loop
+    return _loop
+
+
+def _run(coro: Coroutine[Any, Any, Any]) -> Any:
+    """Run `coro` on the transport loop in the caller's context and block for its result.
+
+    Context variables (the fetch stage for the run trace, the abandon
+    event) therefore follow every request onto the loop.
+    """
+    loop = _event_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        raise RuntimeError("blocking http_client call made from the transport loop; await it instead")
+    done: Future = Future()
+
+    def settle(task: asyncio.Task) -> None:
+        if task.cancelled():
+            done.cancel()
+        elif task.exception() is not None:
+            done.set_exception(task.exception())
+        else:
+            done.set_result(task.result())
+
+    def start() -> None:
+        loop.create_task(coro).add_done_callback(settle)
+
+    loop.call_soon_threadsafe(start, context=contextvars.copy_context())
+    return done.result()
+
+
+async def _on_request_start(_client_session: Any, context: Any, params: Any) -> None:
+    context.host = params.url.host or ""
+
+
+async def _on_connection_created(_client_session: Any, context: Any, _params: Any) -> None:
+    with _session_lock:
+        _host_connections[getattr(context, "host", "")] += 1
+
+
+def _aiohttp_client() -> Any:
+    """The shared aiohttp session, created on the loop on first use."""
+    global _client
+    if _client is None:
+        tracing = aiohttp.TraceConfig()
+        tracing.on_request_start.append(_on_request_start)
+        tracing.on_connection_create_end.append(_on_connection_created)
+        connector = aiohttp.TCPConnector(limit=MAX_CONCURRENCY, ssl=ssl.create_default_context(cafile=requests.certs.where()))
+        # Cookies never leak between fetchers; a caller that needs them passes `cookies=`.
+        _client = aiohttp.ClientSession(connector=connector, headers=DEFAULT_HEADERS, trust_env=True,
+                                        cookie_jar=aiohttp.DummyCookieJar(), trace_configs=[tracing])
+    return _client
+
+
+def _client_timeout(timeout: Any) -> Any:
+    """Map a `requests` (connect, read) timeout onto aiohttp, bounded by the run deadline."""
+    connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+    total = None if _deadline is None else max(0.0, _deadline - time.monotonic())
+    return aiohttp.ClientTimeout(total=total, sock_connect=connect, sock_read=read)
+
+
+def _as_response(raw: Any, body: bytes) -> requests.Response:
+    response = requests.Response()
+    response.status_code = raw.status
+    response.reason = raw.reason
+    response.url = str(raw.url)
+    response.headers = CaseInsensitiveDict(raw.headers)
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    response.cookies = requests.cookies.cookiejar_from_dict({name: morsel.value for name, morsel in raw.cookies.items()})
+    response._content = body
+    return response
+
+
+async def _send(method: str, url: str, **kwargs: Any) -> requests.Response:
+    """Perform one HTTP exchange; `requests` exceptions are raised either way."""
+    if aiohttp is None:
+        return await asyncio.get_running_loop().run_in_executor(
+            None, functools.partial(session().request, method, url, **kwargs))
+    timeout = _client_timeout(kwargs.pop("timeout", None))
+    cookies = kwargs.pop("cookies", None)
+    try:
+        async with _aiohttp_client().request(method, url, timeout=timeout,
+                                             cookies=dict(cookies) if cookies else None, **kwargs) as raw:
+            body = await raw.read()
+    except asyncio.TimeoutError as exc:
+        raise requests.Timeout(f"{method} {url} timed out") from exc
+    except aiohttp.InvalidURL as exc:
+        raise requests.exceptions.InvalidURL(str(exc)) from exc
+    except aiohttp.ClientError as exc:
+        raise requests.ConnectionError(str(exc) or type(exc).__name__) from exc
+    return _as_response(raw, body)
+
+
+async def arequest(method: str, url: str, **kwargs: Any) -> requests.Response:
+    params = kwargs.pop("params", None)
+    if params:
+        url = requests.Request(method, url, params=params).prepare().url or url
+    host = urlsplit(url).hostname or ""
+    provider = PROVIDER_HEADERS.get(host)
+    if provider:
+        kwargs["headers"] = {**provider, **(kwargs.get("headers") or {})}
+    timeout = kwargs.get("timeout")
+    # Query strings can carry API keys; the trace keeps scheme, host and path.
+    parts = urlsplit(url)
+    trace_url = f"{parts.scheme}://{parts.netloc}{parts.path}"
+    circuit = circuit_key(url)
+    for attempt in range(MAX_429_RETRIES + 1):
+        try:
+            BREAKER.before_request(circuit)
+        except CircuitOpenError:
+            TRACE.fallback("circuit_open", host=circuit, url=trace_url)
+            raise
+        waited = await RATE_LIMITER.acquire_async(host)
+        kwargs["timeout"] = _clamp_timeout(timeout)
+        with _session_lock:
+            _host_requests[host] += 1
+        started = TRACE.now()
+        record = {"method": method, "host": host, "url": trace_url, "attempt": attempt,
+                  "start": started, "rate_wait": round(waited, 3)}
+        try:
+            response = await _send(method, url, **kwargs)
+        except Exception as exc:
+            with _session_lock:
+                _host_failures[host] += 1
+            BREAKER.record(circuit, ok=False)
+            ended = TRACE.now()
+            TRACE.request(**record, end=ended, seconds=round(ended - started, 3), error=type(exc).__name__)
+            raise
+        ended = TRACE.now()
+        TRACE.request(**record, end=ended, seconds=round(ended - started, 3),
+                      status=response.status_code, bytes=len(response.content or b""))
+        if response.status_code == 429:
+            # Back-pressure: the whole host waits out Retry-After, then this
+            # caller gets one more try.
+            RATE_LIMITER.back_off(host, retry_after_seconds(response.headers.get("Retry-After")))
+            if attempt < MAX_429_RETRIES:
+                continue
+        break
+    BREAKER.record(circuit, ok=not (response.status_code >= 500 or response.status_code in FAILURE_STATUSES))
+    return response
+
+
+async def aget(url: str, **kwargs: Any) -> requests.Response:
+    return await response_cache.cached_get(functools.partial(arequest, "GET"), url, **kwargs)
+
+
+def request(method: str, url: str, **kwargs: Any) -> requests.Response:
+    return _run(arequest(method, url, **kwargs))
+
+
+def get(url: str, **kwargs: Any) -> requests.Response:
+    return _run(aget(url, **kwargs))
+
+
+def post(url: str, **kwargs: Any) -> requests.Response:
+    return _run(arequest("POST", url, **kwargs))
+
+
+@atexit.register
+def _close() -> None:
+    if _loop is not None and _client is not None:
+        try:
+            asyncio.run_coroutine_threadsafe(_client.close(), _loop).result(timeout=2)
+        except Exception:
+            pass
+
+
+def connection_stats() -> dict[str, Any]:
+    """Requests sent vs TCP connections opened, overall and per host."""
+    with _session_lock:
+        counts = dict(_host_requests)
+        failures = dict(_host_failures)
+        opened = Counter(_host_connections)
+        pooled = _session
+    if pooled is not None:
+        for adapter in set(pooled.adapters.values()):
+            for key in list(adapter.poolmanager.pools.keys()):
+                pool = adapter.poolmanager.pools.get(key)
+                if pool is not None:
+                    opened[pool.host] += pool.num_connections
+    hosts = {
+        host: {"requests": count, "failed": failures.get(host, 0), "connections": opened.get(host, 0)}
+        for host, count in sorted(counts.items())
+    }
+    total_requests = sum(counts.values())
+    total_connections = sum(opened.values())
+    return {
+        "requests": total_requests,
+        "failed": sum(failures.values()),
+        "connections": total_connections,
+        "reused": max(0, total_requests - total_connections),
+        "hosts": hosts,
+    }
+
+
+def _workers() -> ThreadPoolExecutor:
+    """Start the shared fetch pool on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=MAX_CONCURRENCY, thread_name_prefix="http")
+    return _pool
+
+
+def _outcome(future: Future) -> Any:
+    try:
+        return future.result()
+    except Exception as exc:
+        return exc
+
+
+def call_many(calls: Iterable[Callable[[], Any]]) -> list[Any]:
+    """Run blocking fetch callables concurrently on the shared pool.
+
+    Each slot holds the result or the exception that call raised, in input
+    order, so one dead symbol never costs the rest of the batch. Every call
+    runs in a copy of the caller's context, so context variables (e.g. the
+    fetch stage for the run trace) follow it onto the worker thread.
+    """
+    calls = list(calls)
+    if not calls:
+        return []
+    pool = _workers()
+    # One context copy per call: a Context can only be entered by one thread at a time.
+    futures = [pool.submit(contextvars.copy_context().run, call) for call in calls]
+    return [_outcome(future) for future in futures]
+
+
+async def _gather(calls: list[Coroutine[Any, Any, Any]]) -> list[Any]:
+    return list(await asyncio.gather(*calls, return_exceptions=True))
+
+
+def get_many(urls: Iterable[str], **kwargs: Any) -> list[requests.Response | Exception]:
+    """GET every URL concurrently on the event loop with shared options.
+
+    Each slot holds the response or the exception that GET raised, in input
+    order, so one dead symbol never costs the rest of the batch.
+    """
+    calls = [aget(url, **kwargs) for url in urls]
+    return _run(_gather(calls)) if calls else []
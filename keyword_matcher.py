@@ -0,0 +1,47 @@
+"""Shared multi-keyword matching for headline ranking.
+
+A `KeywordMatcher` holds its lowercased term set and weights, built once.
+Each headline is lowercased once and every term is tested with `in`, which
+is a C substring search; the hit set is computed once and then shared by
+`score` and any group checks a caller makes on `found`. Matching is the
+same case-insensitive substring test as `term in text.lower()`, overlaps
+included: "foreigner" matches both "foreign" and "foreigner".
+
+At the term-set sizes used here (tens of terms, up to a few hundred), this
+scan beats both a pure-Python Aho-Corasick walk and an `re` alternation.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Iterable, Mapping
+
+
+class KeywordMatcher:
+    def __init__(self, terms: Mapping[str, float] | Iterable[str]) -> None:
+        weights = terms.items() if isinstance(terms, Mapping) else ((term, 1) for term in terms)
+        self.weights: dict[str, float] = {term.lower(): weight for term, weight in weights if term}
+        self._terms = tuple(self.weights)
+
+    def __len__(self) -> int:
+        return len(self.weights)
+
+    def found(self, text: str) -> set[str]:
+        """Every distinct term that occurs in `text`."""
+        lowered = (text or "").lower()
+        return {term for term in self._terms if term in lowered}
+
+    def matches(self, text: str) -> bool:
+        """Whether any term occurs in `text`; stops at the first hit."""
+        lowered = (text or "").lower()
+        return any(term in lowered for term in self._terms)
+
+    def score(self, text: str) -> float:
+        """Sum of the weights of the distinct terms in `text`."""
+        return sum(self.weights[term] for term in self.found(text))
+
+
+@lru_cache(maxsize=64)
+def matcher_for(terms: tuple[str, ...]) -> KeywordMatcher:
+    """Shared matcher for a fixed term tuple, built on first use."""
+    return KeywordMatcher(terms)
@@ -11,7 +11,9 @@ from html import escape
 from pathlib import Path
 from typing import Any
 
-import requests
+import http_client
+from hedging import hedged
+from valuation import value_positions
 
 try:
     from zoneinfo import ZoneInfo
@@ -104,8 +106,6 @@ def parse_rrsp_rows(rows: list[list[str]], usdcad: float = 1.365) -> dict[str, A
         shares = parse_money(row[8])
         if currency not in {"CAD", "USD"} or not symbol or not price or not shares:
             continue
-        value_native = price * shares
-        value_cad = value_native * (usdcad if currency == "USD" else 1.0)
         positions.append({
             "symbol": symbol.split(":")[-1],
             "sheet_symbol": symbol,
@@ -113,12 +113,17 @@ def parse_rrsp_rows(rows: list[list[str]], usdcad: float = 1.365) -> dict[str, A
             "currency": currency,
             "shares": float(shares),
             "sheet_price": float(price),
-            "value_native": value_native,
-            "value_cad": value_cad,
         })
-    total_cad = sum(position["value_cad"] for position in positions)
-    for position in positions:
-        position["weight_pct"] = position["value_cad"] / total_cad * 100 if total_cad else 0.0
+    shares = [position["shares"] for position in positions]
+    prices = [position["sheet_price"] for position in positions]
+    native = value_positions(shares, prices)
+    valued = value_positions(shares, prices, currencies=[position["currency"] for position in positions],
+                             fx={"USD": usdcad})
+    total_cad = valued["total_value"]
+    for index, position in enumerate(positions):
+        position["value_native"] = native["value"][index]
+        position["value_cad"] = valued["value"][index]
+        position["weight_pct"] = valued["weight_pct"][index]
     positions.sort(key=lambda position: position["value_cad"], reverse=True)
     return {
         "account": "rrsp",
@@ -132,22 +137,23 @@ def parse_rrsp_rows(rows: list[list[str]], usdcad: float = 1.365) -> dict[str, A
 
 
 def _fetch_sheet_rows(gid: str, tab_name: str, timeout: int = 20) -> list[list[str]]:
-    """Read a Sheet tab via CSV, then authenticated Sheets API when needed."""
+    """Read a Sheet tab via CSV, hedged with the authenticated Sheets API."""
     url = f"https://docs.google.com/spreadsheets/d/{SHEET_ID}/export?format=csv&gid={gid}&_={int(datetime.now().timestamp())}"
-    try:
-        response = requests.get(url, timeout=timeout)
+
+    def csv_rows() -> list[list[str]]:
+        response = http_client.get(url, timeout=timeout)
         response.raise_for_status()
         rows = list(csv.reader(io.StringIO(response.text)))
-        if any(any(cell.strip() for cell in row) for row in rows):
-            return rows
-    except Exception:
-        pass
-    try:
+        if not any(any(cell.strip() for cell in row) for row in rows):
+            raise ValueError("empty CSV export")
+        return rows
+
+    def api_rows() -> list[list[str]]:
         # Use the stored OAuth token directly so scheduled generation does not
         # depend on optional Google Python packages being installed.
         token_path = Path.home() / ".hermes" / "google_token.json"
         token = json.loads(token_path.read_text())
-        refresh = requests.post(
+        refresh = http_client.post(
             token.get("token_uri") or "https://oauth2.googleapis.com/token",
             data={
                 "client_id": token["client_id"],
@@ -161,21 +167,31 @@ def _fetch_sheet_rows(gid: str, tab_name: str, timeout: int = 20) -> list[list[s
         access_token = refresh.json()["access_token"]
         quoted = tab_name.replace("'", "''")
         api_url = f"https://sheets.googleapis.com/v4/spreadsheets/{SHEET_ID}/values/'{quoted}'!A1:Z200"
-        response = requests.get(
+        response = http_client.get(
             api_url,
             headers={"Authorization": f"Bearer {access_token}"},
             params={"valueRenderOption": "FORMATTED_VALUE"},
             timeout=timeout,
         )
         response.raise_for_status()
-        return response.json().get("values", [])
+        values = response.json().get("values", [])
+        if not values:
+            raise ValueError("empty Sheets API range")
+        return values
+
+    try:
+        return hedged(csv_rows, api_rows, key="google-sheet")
     except Exception as exc:
         print(f"    ⚠️  {tab_name} Sheet unavailable: {exc}")
         return []
 
 
+def fetch_rrsp_rows(timeout: int = 20) -> list[list[str]]:
+    return _fetch_sheet_rows(RRSP_GID, "RRSP", timeout=timeout)
+
+
 def fetch_rrsp_totals(usdcad: float = 1.365, timeout: int = 20) -> dict[str, Any]:
-    rows = _fetch_sheet_rows(RRSP_GID, "RRSP", timeout=timeout)
+    rows = fetch_rrsp_rows(timeout=timeout)
     return parse_rrsp_rows(rows, usdcad=usdcad) if rows else {}
 
 
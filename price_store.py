@@ -0,0 +1,166 @@
+"""Columnar on-disk daily price history, memory-mapped for reading.
+
+Each ticker is a directory holding one version directory of fixed-dtype
+`.npy` columns (timestamp, open, high, low, close, volume) sorted by
+timestamp, plus a `CURRENT` file naming that version. Readers get
+read-only memory maps, so years of bars cost no parsing and only the pages
+actually touched are loaded. Writers merge by timestamp, write every
+column into a fresh version directory, then swap `CURRENT` in one
+`os.replace`, so a reader or a crash never pairs new dates with old
+closes. The superseded version is removed afterwards; a reader still
+mapping it keeps its open files.
+
+A bar's timestamp is its exchange-local session date at 00:00 UTC, so the
+in-progress bar Yahoo stamps with the last trade time is overwritten by
+the completed bar for the same day instead of sitting next to it.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import shutil
+import threading
+import time
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable, Mapping
+
+import numpy as np
+
+from response_cache import CACHE_DIR
+from stage_scheduler import abandoned
+
+FIELDS: dict[str, np.dtype] = {
+    "timestamp": np.dtype("int64"),
+    "open": np.dtype("float64"),
+    "high": np.dtype("float64"),
+    "low": np.dtype("float64"),
+    "close": np.dtype("float64"),
+    "volume": np.dtype("float64"),
+}
+
+
+MANIFEST = "CURRENT"
+
+
+def session_stamp(day: date) -> int:
+    return int(datetime(day.year, day.month, day.day, tzinfo=timezone.utc).timestamp())
+
+
+def stamp_date(stamp: int) -> date:
+    return datetime.fromtimestamp(int(stamp), timezone.utc).date()
+
+
+def _empty() -> dict[str, np.ndarray]:
+    return {field: np.empty(0, dtype=dtype) for field, dtype in FIELDS.items()}
+
+
+class PriceStore:
+    def __init__(self, folder: Path) -> None:
+        self.folder = Path(folder)
+        self._lock = threading.Lock()
+
+    def folder_for(self, ticker: str) -> Path:
+        return self.folder / re.sub(r"[^A-Za-z0-9._=^-]", "_", ticker)
+
+    def tickers(self) -> list[str]:
+        try:
+            return sorted(path.name for path in self.folder.iterdir()
+                          if (path / MANIFEST).exists() or (path / "timestamp.npy").exists())
+        except OSError:
+            return []
+
+    @staticmethod
+    def _version(folder: Path) -> Path | None:
+        try:
+            name = (folder / MANIFEST).read_text(encoding="utf-8").strip()
+        except OSError:
+            return None
+        return folder / name if name else None
+
+    def read(self, ticker: str) -> dict[str, np.ndarray]:
+        """Memory-mapped, read-only columns for `ticker` (empty arrays if unknown)."""
+        folder = self.folder_for(ticker)
+        for _ in range(2):
+            # Stores written before versioning keep their columns at the top level.
+            version = self._version(folder) or folder
+            try:
+                columns = {field: np.load(version / f"{field}.npy", mmap_mode="r") for field in FIELDS}
+            except (OSError, ValueError):
+                continue  # A writer may have just retired this version; re-read CURRENT once.
+            if len({len(column) for column in columns.values()}) != 1:
+                return _empty()  # Corrupt columns; treat as missing rather than misalign fields.
+            return columns
+        return _empty()
+
+    def write(self, ticker: str, columns: Mapping[str, np.ndarray]) -> None:
+        """Publish all columns together: fresh version directory, then one CURRENT swap.
+
+        Skipped for an abandoned stage: the build has already moved on without it.
+        """
+        if abandoned():
+            return
+        folder = self.folder_for(ticker)
+        folder.mkdir(parents=True, exist_ok=True)
+        previous = self._version(folder)
+        version = folder / f"v{time.time_ns()}.{os.getpid()}.{threading.get_ident()}"
+        try:
+            version.mkdir()
+            for field, dtype in FIELDS.items():
+                np.save(version / f"{field}.npy", np.ascontiguousarray(columns[field], dtype=dtype))
+            tmp = folder / f"{MANIFEST}.{os.getpid()}.{threading.get_ident()}.tmp"
+            tmp.write_text(version.name, encoding="utf-8")
+            os.replace(tmp, folder / MANIFEST)
+        except BaseException:
+            shutil.rmtree(version, ignore_errors=True)
+            raise
+        if previous is not None:
+            shutil.rmtree(previous, ignore_errors=True)
+        for field in FIELDS:
+            (folder / f"{field}.npy").unlink(missing_ok=True)
+
+    def upsert(self, ticker: str, bars: Iterable[Mapping[str, Any]], *, replace: bool = False) -> int:
+        """Merge bars (dicts keyed by FIELDS; missing values become NaN) by timestamp.
+
+        Incoming bars win over stored ones with the same timestamp. `replace`
+        discards the stored history first. Returns the stored bar count.
+        """
+        fresh = {field: [] for field in FIELDS}
+        for bar in bars:
+            if bar.get("timestamp") is None:
+                continue
+            for field in FIELDS:
+                value = bar.get(field)
+                fresh[field].append(int(value) if field == "timestamp" else (np.nan if value is None else float(value)))
+        with self._lock:
+            stored = _empty() if replace else {field: np.array(column) for field, column in self.read(ticker).items()}
+            merged = {field: np.concatenate([stored[field], np.asarray(fresh[field], dtype=dtype)])
+                      for field, dtype in FIELDS.items()}
+            # Keep the last occurrence of each timestamp, i.e. the fresh bar.
+            order = np.argsort(merged["timestamp"], kind="stable")
+            stamps = merged["timestamp"][order]
+            keep = np.append(stamps[1:] != stamps[:-1], True) if len(stamps) else np.empty(0, dtype=bool)
+            index = order[keep]
+            self.write(ticker, {field: column[index] for field, column in merged.items()})
+            return int(keep.sum())
+
+
+def bars_from_chart(result: Mapping[str, Any]) -> list[dict[str, Any]]:
+    """Every bar with a close in a Yahoo daily chart result, as store-ready dicts."""
+    from zoneinfo import ZoneInfo
+    tz = ZoneInfo((result.get("meta") or {}).get("exchangeTimezoneName") or "UTC")
+    stamps = result.get("timestamp") or []
+    quote_rows = ((result.get("indicators") or {}).get("quote") or [{}])[0]
+    bars = []
+    for index, stamp in enumerate(stamps):
+        row = {"timestamp": session_stamp(datetime.fromtimestamp(stamp, timezone.utc).astimezone(tz).date())}
+        for field in ("open", "high", "low", "close", "volume"):
+            values = quote_rows.get(field) or []
+            row[field] = values[index] if index < len(values) else None
+        if row["close"] is not None:
+            bars.append(row)
+    return bars
+
+
+PRICE_STORE = PriceStore(CACHE_DIR / "prices")
@@ -0,0 +1,68 @@
+"""Run-wide plan of every symbol the build prices and what each consumer needs.
+
+The TFSA sheet, the RRSP tab and the Evolution Fund overlap, and each used
+to fetch its own quotes. Consumers now declare their symbols and fields up
+front, and the planner fetches every symbol once, picking the cheapest
+request that covers everything asked of it:
+
+- `last`: latest trade or close
+- `close`: latest completed session close and change
+- `range`: completed session high/low
+- `history`: recent daily closes
+
+Only a per-symbol daily chart carries the day range and corporate actions,
+so symbols that need `range` get one. Everything else rides the
+multi-symbol spark batch.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+LAST = "last"
+CLOSE = "close"
+RANGE = "range"
+HISTORY = "history"
+FIELDS = (LAST, CLOSE, RANGE, HISTORY)
+CHART_FIELDS = frozenset({RANGE})
+
+
+class QuotePlan:
+    def __init__(self) -> None:
+        self._fields: dict[str, set[str]] = {}
+        self._consumers: dict[str, list[str]] = {}
+
+    def add(self, consumer: str, symbols: Iterable[str], *fields: str) -> None:
+        unknown = set(fields) - set(FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown quote fields: {sorted(unknown)}")
+        for symbol in dict.fromkeys(symbols):
+            if not symbol:
+                continue
+            self._fields.setdefault(symbol, set()).update(fields)
+            self._consumers.setdefault(symbol, []).append(consumer)
+
+    def symbols(self) -> list[str]:
+        return list(self._fields)
+
+    def fields(self, symbol: str) -> frozenset[str]:
+        return frozenset(self._fields.get(symbol, ()))
+
+    def consumers(self, symbol: str) -> list[str]:
+        return list(self._consumers.get(symbol, ()))
+
+    def chart_symbols(self) -> list[str]:
+        return [symbol for symbol, fields in self._fields.items() if fields & CHART_FIELDS]
+
+    def spark_symbols(self) -> list[str]:
+        return [symbol for symbol, fields in self._fields.items() if not fields & CHART_FIELDS]
+
+    def summary(self) -> dict[str, int]:
+        requested = sum(len(consumers) for consumers in self._consumers.values())
+        return {
+            "symbols": len(self._fields),
+            "requested": requested,
+            "shared": sum(1 for consumers in self._consumers.values() if len(consumers) > 1),
+            "charts": len(self.chart_symbols()),
+            "spark": len(self.spark_symbols()),
+        }
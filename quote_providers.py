@@ -0,0 +1,112 @@
+"""Ordered quote-provider chains shared by every quote surface.
+
+Each asset class registers its providers best first. A provider takes the
+keys it is asked for and returns `{key: quote}` for the ones it could
+price, raising only when the whole source is down. The chain asks the next
+provider only for keys still unresolved: missing, lacking a required field,
+or older than the provider's `max_age`. Wins, misses, stale answers and
+failures are tallied per chain link (`crypto/Binance`) for stats.json.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+from run_trace import TRACE
+
+Quote = dict[str, Any]
+
+
+@dataclass(frozen=True)
+class QuoteProvider:
+    name: str
+    fetch: Callable[[list[str]], dict[str, Quote]]
+    # Reject quotes whose `quote_time` is older than this many seconds.
+    max_age: float | None = None
+    required: tuple[str, ...] = ("price", "change")
+    # Keys this provider can price at all; None means any.
+    covers: frozenset[str] | None = None
+
+
+def quote_age(quote: Quote, now: datetime | None = None) -> float | None:
+    """Seconds since the quote's ISO `quote_time`, or None when it has none."""
+    raw = quote.get("quote_time")
+    if not raw:
+        return None
+    try:
+        stamp = datetime.fromisoformat(str(raw).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if stamp.tzinfo is None:
+        stamp = stamp.replace(tzinfo=timezone.utc)
+    return ((now or datetime.now(timezone.utc)) - stamp).total_seconds()
+
+
+def _usable(provider: QuoteProvider, quote: Quote | None) -> str:
+    if not quote or any(quote.get(field) is None for field in provider.required):
+        return "missed"
+    if provider.max_age is not None:
+        age = quote_age(quote)
+        if age is None or not 0 <= age <= provider.max_age:
+            return "stale"
+    return "served"
+
+
+class QuoteRegistry:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._chains: dict[str, list[QuoteProvider]] = {}
+        self._health: dict[str, dict[str, float]] = {}
+
+    def register(self, asset_class: str, providers: list[QuoteProvider]) -> None:
+        with self._lock:
+            self._chains[asset_class] = list(providers)
+
+    def chain(self, asset_class: str) -> list[QuoteProvider]:
+        with self._lock:
+            return list(self._chains.get(asset_class, []))
+
+    def _tally(self, name: str, outcome: str, count: int = 1, seconds: float = 0.0) -> None:
+        with self._lock:
+            health = self._health.setdefault(
+                name, {"served": 0, "missed": 0, "stale": 0, "failed": 0, "seconds": 0.0})
+            health[outcome] += count
+            health["seconds"] = round(health["seconds"] + seconds, 3)
+
+    def resolve(self, asset_class: str, keys: list[str]) -> dict[str, Quote]:
+        """First acceptable quote per key down the chain; unresolved keys are absent."""
+        resolved: dict[str, Quote] = {}
+        pending = list(dict.fromkeys(keys))
+        for position, provider in enumerate(self.chain(asset_class)):
+            asked = [key for key in pending if provider.covers is None or key in provider.covers]
+            if not asked:
+                continue
+            if position:
+                TRACE.fallback("quote_provider", asset_class=asset_class, provider=provider.name, keys=asked)
+            name = f"{asset_class}/{provider.name}"
+            started = time.monotonic()
+            try:
+                quotes = provider.fetch(asked) or {}
+            except Exception as exc:
+                self._tally(name, "failed", seconds=time.monotonic() - started)
+                print(f"    ⚠️  {provider.name} quotes failed for {asset_class}: {exc}")
+                continue
+            self._tally(name, "served", 0, seconds=time.monotonic() - started)
+            for key in asked:
+                outcome = _usable(provider, quotes.get(key))
+                self._tally(name, outcome)
+                if outcome == "served":
+                    resolved[key] = quotes[key]
+                    pending.remove(key)
+        return resolved
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        with self._lock:
+            return {name: dict(health) for name, health in sorted(self._health.items())}
+
+
+QUOTES = QuoteRegistry()
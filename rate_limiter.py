@@ -0,0 +1,136 @@
+"""Per-host token buckets so a parallel build stays under provider rate limits.
+
+Each host in `RATE_LIMITS` refills `rate` tokens per second up to `burst`;
+every request takes one token and waits when the bucket is empty. A 429
+pauses the whole host for its `Retry-After`, so every in-flight fetcher
+backs off together instead of hammering a provider that already said stop.
+Hosts not listed are not limited.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+# host: (requests per second, burst size)
+RATE_LIMITS: dict[str, tuple[float, int]] = {
+    "query1.finance.yahoo.com": (5.0, 10),
+    "query2.finance.yahoo.com": (5.0, 10),
+    "api.binance.com": (10.0, 20),
+    "www.reddit.com": (1.0, 4),
+    "news.google.com": (2.0, 5),
+    "docs.google.com": (2.0, 4),
+    "sheets.googleapis.com": (2.0, 4),
+}
+
+DEFAULT_RETRY_AFTER = 2.0
+MAX_RETRY_AFTER = 30.0
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take a token if one is free; otherwise return how long to wait."""
+        with self._lock:
+            now = time.monotonic()
+            if now < self.paused_until:
+                return self.paused_until - now
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    def acquire(self) -> float:
+        """Block until a token is available; return seconds spent waiting."""
+        waited = 0.0
+        while True:
+            delay = self._reserve()
+            if not delay:
+                return waited
+            time.sleep(delay)
+            waited += delay
+
+    async def acquire_async(self) -> float:
+        """Like `acquire`, but yields to the event loop while waiting."""
+        waited = 0.0
+        while True:
+            delay = self._reserve()
+            if not delay:
+                return waited
+            await asyncio.sleep(delay)
+            waited += delay
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            self.tokens = 0.0
+
+
+class RateLimiter:
+    def __init__(self, limits: dict[str, tuple[float, int]]) -> None:
+        self._buckets = {host: TokenBucket(rate, burst) for host, (rate, burst) in limits.items()}
+        self._lock = threading.Lock()
+        self.waited: dict[str, float] = {}
+        self.throttled: dict[str, int] = {}
+
+    def acquire(self, host: str) -> float:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            return 0.0
+        return self._tally(host, bucket.acquire())
+
+    async def acquire_async(self, host: str) -> float:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            return 0.0
+        return self._tally(host, await bucket.acquire_async())
+
+    def _tally(self, host: str, waited: float) -> float:
+        if waited:
+            with self._lock:
+                self.waited[host] = self.waited.get(host, 0.0) + waited
+        return waited
+
+    def back_off(self, host: str, seconds: float) -> None:
+        """Pause `host` after a 429 so every caller waits out its Retry-After."""
+        with self._lock:
+            self.throttled[host] = self.throttled.get(host, 0) + 1
+        bucket = self._buckets.get(host)
+        if bucket is not None:
+            bucket.pause(seconds)
+
+    def summary(self) -> dict[str, dict]:
+        with self._lock:
+            return {
+                "waited_s": {host: round(value, 2) for host, value in sorted(self.waited.items())},
+                "throttled": dict(sorted(self.throttled.items())),
+            }
+
+
+def retry_after_seconds(value: str | None) -> float:
+    """Parse a Retry-After header (seconds or HTTP date), capped to MAX_RETRY_AFTER."""
+    if not value:
+        return DEFAULT_RETRY_AFTER
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds()
+        except (TypeError, ValueError):
+            return DEFAULT_RETRY_AFTER
+    return min(MAX_RETRY_AFTER, max(0.0, seconds))
+
+
+RATE_LIMITER = RateLimiter(RATE_LIMITS)
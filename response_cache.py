@@ -0,0 +1,230 @@
+"""On-disk HTTP response cache shared by every build.
+
+Only URLs matched by `CACHE_TTLS` are cached. A fresh entry is served
+without touching the network; an expired one is revalidated with
+`If-None-Match` / `If-Modified-Since`, and an upstream that is down or
+erroring gets the last stored copy (up to `STALE_IF_ERROR`) instead of
+breaking its section. Dated snapshots never change, so they never expire.
+
+The cache lives in `.cache/` at the repo root, which the site workflow
+restores and saves between runs. `prune` deletes entries nobody has used
+for `RETENTION` (a hit counts as use), and stored metadata never keeps
+credentials from the request URL.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from run_trace import TRACE
+
+CACHE_DIR = Path(__file__).resolve().parent / ".cache"
+
+IMMUTABLE = math.inf
+HOUR = 60 * 60
+DAY = 24 * HOUR
+
+# First matching pattern wins. TTL 0 means "always revalidate".
+CACHE_TTLS: list[tuple[re.Pattern[str], float]] = [
+    (re.compile(r"currency-api@\d{4}-\d{2}-\d{2}/"), IMMUTABLE),
+    (re.compile(r"://\d{4}-\d{2}-\d{2}\.currency-api\.pages\.dev/"), IMMUTABLE),
+    (re.compile(r"://openlibrary\.org/search\.json"), 30 * DAY),
+    (re.compile(r"://www\.omdbapi\.com/"), 30 * DAY),
+    (re.compile(r"://www\.youtube\.com/feeds/videos\.xml"), 0),
+    (re.compile(r"://tradingeconomics\.com/commodity/"), 6 * HOUR),
+]
+
+# How old a stored copy may be and still stand in for a failed upstream.
+STALE_IF_ERROR = 3 * DAY
+# Entries unused for this long are deleted; the same horizon as the headline store.
+RETENTION = 30 * DAY
+# Query parameters that carry secrets (e.g. OMDb's `apikey`); never written to disk.
+CREDENTIAL_PARAMS = re.compile(r"^(api_?key|key|token|access_token|auth|secret|client_secret|password|sig|signature)$",
+                               re.IGNORECASE)
+
+_KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+_lock = threading.Lock()
+_stats = {"hits": 0, "revalidated": 0, "stale": 0, "stored": 0, "pruned": 0}
+
+
+def _count(name: str) -> None:
+    with _lock:
+        _stats[name] += 1
+
+
+def summary() -> dict[str, int]:
+    with _lock:
+        return dict(_stats)
+
+
+def ttl_for(url: str) -> float | None:
+    """Return the TTL for a cacheable URL, or None when it is not cached."""
+    for pattern, ttl in CACHE_TTLS:
+        if pattern.search(url):
+            return ttl
+    return None
+
+
+def redact(url: str) -> str:
+    """`url` without credential query parameters or userinfo."""
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    kept = [(name, value) for name, value in query if not CREDENTIAL_PARAMS.match(name)]
+    if len(kept) == len(query) and "@" not in parts.netloc:
+        return url
+    return urlunsplit(parts._replace(netloc=parts.netloc.rsplit("@", 1)[-1], query=urlencode(kept)))
+
+
+def _paths(url: str) -> tuple[Path, Path]:
+    digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    folder = CACHE_DIR / "http"
+    return folder / f"{digest}.json", folder / f"{digest}.body"
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def _load(url: str) -> tuple[dict[str, Any], bytes] | None:
+    meta_path, body_path = _paths(url)
+    try:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        return meta, body_path.read_bytes()
+    except (OSError, ValueError):
+        return None
+
+
+def _store(url: str, response: requests.Response) -> None:
+    meta_path, body_path = _paths(url)
+    meta = {
+        "url": redact(url),
+        "status": response.status_code,
+        "headers": {name: response.headers[name] for name in _KEPT_HEADERS if name in response.headers},
+        "fetched_at": time.time(),
+    }
+    try:
+        _write_atomic(body_path, response.content)
+        _write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+        _count("stored")
+    except OSError:
+        pass
+
+
+def _touch(url: str, meta: dict[str, Any]) -> None:
+    meta_path, _ = _paths(url)
+    try:
+        _write_atomic(meta_path, json.dumps({**meta, "fetched_at": time.time()}).encode("utf-8"))
+    except OSError:
+        pass
+
+
+def _mark_used(url: str) -> None:
+    meta_path, _ = _paths(url)
+    try:
+        os.utime(meta_path)
+    except OSError:
+        pass
+
+
+def prune(now: float | None = None) -> int:
+    """Delete entries unused for `RETENTION`; scrub credentials from older metadata.
+
+    Returns how many entries were deleted.
+    """
+    cutoff = (time.time() if now is None else now) - RETENTION
+    removed = 0
+    for meta_path in (CACHE_DIR / "http").glob("*.json"):
+        try:
+            stat = meta_path.stat()
+            if stat.st_mtime < cutoff:
+                meta_path.unlink()
+                meta_path.with_suffix(".body").unlink(missing_ok=True)
+                removed += 1
+                continue
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            clean = redact(meta.get("url", ""))
+            if clean != meta.get("url", ""):
+                # Entries stored before redaction; keep their last-used time.
+                _write_atomic(meta_path, json.dumps({**meta, "url": clean}).encode("utf-8"))
+                os.utime(meta_path, (stat.st_atime, stat.st_mtime))
+        except (OSError, ValueError):
+            continue
+    with _lock:
+        _stats["pruned"] += removed
+    return removed
+
+
+def _replay(meta: dict[str, Any], body: bytes) -> requests.Response:
+    response = requests.Response()
+    response.status_code = meta.get("status", 200)
+    response.headers = CaseInsensitiveDict(meta.get("headers") or {})
+    response.url = meta.get("url", "")
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    response._content = body
+    response.from_cache = True
+    return response
+
+
+async def cached_get(send: Callable[..., Awaitable[requests.Response]], url: str, **kwargs: Any) -> requests.Response:
+    """GET through the disk cache; `await send(url, **kwargs)` performs the real request."""
+    full_url = requests.Request("GET", url, params=kwargs.get("params")).prepare().url or url
+    ttl = ttl_for(full_url)
+    if ttl is None:
+        return await send(url, **kwargs)
+    trace_url = full_url.split("?", 1)[0]
+
+    cached = _load(full_url)
+    if cached:
+        meta, body = cached
+        age = time.time() - float(meta.get("fetched_at", 0))
+        if age < ttl:
+            _count("hits")
+            _mark_used(full_url)
+            TRACE.cache_event(url=trace_url, result="hit", bytes=len(body))
+            return _replay(meta, body)
+        validators = {}
+        stored_headers = meta.get("headers") or {}
+        if stored_headers.get("ETag"):
+            validators["If-None-Match"] = stored_headers["ETag"]
+        if stored_headers.get("Last-Modified"):
+            validators["If-Modified-Since"] = stored_headers["Last-Modified"]
+        if validators:
+            kwargs = {**kwargs, "headers": {**(kwargs.get("headers") or {}), **validators}}
+
+    try:
+        response = await send(url, **kwargs)
+    except Exception as exc:
+        if cached and time.time() - float(cached[0].get("fetched_at", 0)) < STALE_IF_ERROR:
+            _count("stale")
+            TRACE.fallback("stale_cache", url=trace_url, error=type(exc).__name__)
+            return _replay(*cached)
+        raise
+
+    if response.status_code == 304 and cached:
+        _count("revalidated")
+        TRACE.cache_event(url=trace_url, result="revalidated", bytes=len(cached[1]))
+        _touch(full_url, cached[0])
+        return _replay(*cached)
+    if response.ok:
+        TRACE.cache_event(url=trace_url, result="miss", bytes=len(response.content))
+        _store(full_url, response)
+    elif response.status_code >= 500 and cached and time.time() - float(cached[0].get("fetched_at", 0)) < STALE_IF_ERROR:
+        _count("stale")
+        TRACE.fallback("stale_cache", url=trace_url, status=response.status_code)
+        return _replay(*cached)
+    return response
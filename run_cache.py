@@ -0,0 +1,97 @@
+"""Run-scoped memoization so each upstream is hit once per build.
+
+Outside an active run (tests, the quote audit, ad-hoc calls) memoized
+fetchers call straight through, so nothing is ever reused across builds.
+
+A caller never waits on an entry whose fetching stage has been abandoned
+by the scheduler; it fetches for itself instead, so a stage budget still
+bounds everyone who shares that upstream.
+"""
+
+from __future__ import annotations
+
+import functools
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+
+from stage_scheduler import ABANDON_EVENT
+
+# How often a waiting caller re-checks whether the fetching stage was abandoned.
+ABANDON_POLL_SECONDS = 0.25
+
+
+class RunCache:
+    """Share one result per (fetcher, arguments) for the duration of a run."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # Each entry: the shared answer and the fetching stage's abandon event.
+        self._entries: dict[tuple, tuple[Future, Any]] | None = None
+        self.calls = 0
+        self.saved = 0
+
+    @contextmanager
+    def run(self) -> Iterator["RunCache"]:
+        with self._lock:
+            self._entries = {}
+            self.calls = 0
+            self.saved = 0
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._entries = None
+
+    def memoize(self, func: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            key = (func, args, tuple(sorted(kwargs.items())))
+            try:
+                hash(key)
+            except TypeError:
+                return func(*args, **kwargs)
+            with self._lock:
+                entries = self._entries
+                if entries is None:
+                    future, owner, fetcher = None, False, None
+                elif key in entries:
+                    (future, fetcher), owner = entries[key], False
+                    self.saved += 1
+                else:
+                    future, owner, fetcher = Future(), True, ABANDON_EVENT.get()
+                    entries[key] = (future, fetcher)
+                    self.calls += 1
+            if future is None:
+                return func(*args, **kwargs)
+            if not owner:
+                # A concurrent stage may still be fetching; wait for its answer
+                # unless that stage is abandoned.
+                while not (fetcher is not None and fetcher.is_set()):
+                    try:
+                        return future.result(timeout=None if fetcher is None else ABANDON_POLL_SECONDS)
+                    except FutureTimeout:
+                        continue
+                return func(*args, **kwargs)
+            try:
+                result = func(*args, **kwargs)
+            except BaseException as exc:
+                # Failures are not remembered: a later caller may retry.
+                with self._lock:
+                    if self._entries is entries:
+                        entries.pop(key, None)
+                future.set_exception(exc)
+                raise
+            future.set_result(result)
+            return result
+
+        return wrapper
+
+    def summary(self) -> dict[str, int]:
+        with self._lock:
+            return {"upstream_calls": self.calls, "saved_calls": self.saved}
+
+
+RUN_CACHE = RunCache()
+run_cached = RUN_CACHE.memoize
@@ -0,0 +1,107 @@
+"""Machine-readable trace of one Signal build, written to run_trace.json.
+
+Records every stage and HTTP attempt (timing, status, bytes, retries, which
+stage issued it), every disk-cache decision, every fallback path taken, and
+the render/write phases. Times are seconds since the run started so traces
+from different days line up.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Iterator
+
+# Name of the fetch stage running in the current thread/task, if any.
+CURRENT_STAGE: contextvars.ContextVar[str | None] = contextvars.ContextVar("current_stage", default=None)
+
+
+class RunTrace:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.started_at = datetime.now(timezone.utc)
+            self._t0 = time.monotonic()
+            self._open: dict[str, float] = {}
+            self.phases: list[dict[str, Any]] = []
+            self.stages: list[dict[str, Any]] = []
+            self.requests: list[dict[str, Any]] = []
+            self.cache: list[dict[str, Any]] = []
+            self.fallbacks: list[dict[str, Any]] = []
+
+    def now(self) -> float:
+        return round(time.monotonic() - self._t0, 3)
+
+    def _add(self, bucket: list[dict[str, Any]], record: dict[str, Any]) -> None:
+        stage = CURRENT_STAGE.get()
+        if stage and "stage" not in record:
+            record["stage"] = stage
+        with self._lock:
+            bucket.append(record)
+
+    def request(self, **record: Any) -> None:
+        self._add(self.requests, record)
+
+    def cache_event(self, **record: Any) -> None:
+        self._add(self.cache, record)
+
+    def fallback(self, kind: str, **record: Any) -> None:
+        self._add(self.fallbacks, {"kind": kind, "at": self.now(), **record})
+
+    def stage(self, **record: Any) -> None:
+        self._add(self.stages, record)
+
+    def begin(self, name: str) -> None:
+        with self._lock:
+            self._open[name] = self.now()
+
+    def end(self, name: str) -> None:
+        ended = self.now()
+        with self._lock:
+            start = self._open.pop(name, ended)
+            self.phases.append({"name": name, "start": start, "end": ended, "seconds": round(ended - start, 3)})
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        self.begin(name)
+        try:
+            yield
+        finally:
+            self.end(name)
+
+    def to_dict(self) -> dict[str, Any]:
+        with self._lock:
+            requests_ = list(self.requests)
+            by_host: dict[str, dict[str, float]] = {}
+            for record in requests_:
+                host = by_host.setdefault(record.get("host", ""), {"requests": 0, "seconds": 0.0, "bytes": 0})
+                host["requests"] += 1
+                host["seconds"] = round(host["seconds"] + record.get("seconds", 0.0), 3)
+                host["bytes"] += record.get("bytes", 0)
+            return {
+                "started_utc": self.started_at.isoformat(),
+                "total_seconds": self.now(),
+                "phases": list(self.phases),
+                "stages": sorted(self.stages, key=lambda s: s["start"]),
+                "hosts": dict(sorted(by_host.items(), key=lambda item: -item[1]["seconds"])),
+                "requests": requests_,
+                "cache": list(self.cache),
+                "fallbacks": list(self.fallbacks),
+            }
+
+    def write(self, path: str) -> None:
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=1)
+        os.replace(tmp, path)
+
+
+TRACE = RunTrace()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""Long-running live crypto quote daemon for Novaire Signal.
+
+Keeps one Binance combined-ticker websocket open and atomically rewrites
+`.cache/crypto_stream.json` with the latest quote per coin (plus CoinGecko
+market caps every few minutes), so a build on the same machine prices
+crypto from disk instead of the network. Optional: if the daemon is not
+running, or its snapshot is older than the Binance freshness window,
+generate.py falls back to the REST providers. Needs `websockets`, which
+neither workflow installs, so CI builds always use the REST providers.
+
+Usage:
+  python scripts/crypto_stream.py
+  python scripts/crypto_stream.py --url ws://127.0.0.1:8765/stream   # local stand-in
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+import generate  # noqa: E402
+
+STREAM_URL = "wss://stream.binance.com:9443/stream"
+# Rewriting the snapshot more often than this buys nothing for a build.
+MIN_WRITE_INTERVAL = 1.0
+MARKET_CAP_REFRESH = 10 * 60
+RECONNECT_MAX_DELAY = 60
+
+
+def stream_url(pairs: dict[str, str], base: str = STREAM_URL) -> str:
+    return base + "?streams=" + "/".join(f"{pair.lower()}@ticker" for pair in pairs.values())
+
+
+def parse_ticker_event(message: str | bytes, by_pair: dict[str, str]) -> tuple[str, dict[str, Any]] | None:
+    """(ticker, quote) from one combined-stream 24hrTicker message, else None."""
+    try:
+        data = json.loads(message).get("data") or {}
+        ticker = by_pair.get(data.get("s"))
+        if not ticker:
+            return None
+        return ticker, {
+            "price": float(data["c"]),
+            "change": float(data["P"]),
+            "day_high": float(data["h"]) if data.get("h") is not None else None,
+            "day_low": float(data["l"]) if data.get("l") is not None else None,
+            "source": "Binance",
+            "quote_time": datetime.fromtimestamp(
+                int(data.get("C") or data["E"]) / 1000, timezone.utc
+            ).isoformat().replace("+00:00", "Z"),
+        }
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return None
+
+
+def write_snapshot(path: Path, quotes: dict[str, dict[str, Any]]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps({
+        "updated_at": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+        "quotes": quotes,
+    }), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+async def refresh_market_caps(quotes: dict[str, dict[str, Any]]) -> None:
+    while True:
+        try:
+            rows = await asyncio.to_thread(generate.fetch_coingecko_markets)
+            for row in rows:
+                ticker = generate.CRYPTO_COINGECKO_IDS.get(row.get("id"))
+                if ticker in quotes and row.get("market_cap"):
+                    quotes[ticker]["market_cap"] = row["market_cap"]
+        except Exception as exc:
+            print(f"  ⚠️  CoinGecko market caps unavailable: {exc}")
+        await asyncio.sleep(MARKET_CAP_REFRESH)
+
+
+async def run(
+    url: str,
+    path: Path,
+    pairs: dict[str, str],
+    *,
+    max_messages: int | None = None,
+    market_caps: bool = True,
+) -> dict[str, dict[str, Any]]:
+    """Stream tickers into `path` until interrupted (or `max_messages` arrive)."""
+    import websockets
+
+    by_pair = {pair: ticker for ticker, pair in pairs.items()}
+    quotes: dict[str, dict[str, Any]] = {ticker: {} for ticker in pairs}
+    caps = asyncio.create_task(refresh_market_caps(quotes)) if market_caps else None
+    received = 0
+    delay = 1
+    last_write = 0.0
+    try:
+        while max_messages is None or received < max_messages:
+            try:
+                async with websockets.connect(url, ping_interval=20) as ws:
+                    print(f"  🔌 Streaming {len(pairs)} pairs from {url.split('?')[0]}")
+                    delay = 1
+                    async for message in ws:
+                        received += 1
+                        parsed = parse_ticker_event(message, by_pair)
+                        if parsed:
+                            ticker, quote = parsed
+                            quotes[ticker] = {**quotes[ticker], **quote}
+                        done = max_messages is not None and received >= max_messages
+                        if parsed and (done or time.monotonic() - last_write >= MIN_WRITE_INTERVAL):
+                            write_snapshot(path, {t: q for t, q in quotes.items() if q.get("price")})
+                            last_write = time.monotonic()
+                        if done:
+                            break
+            except (OSError, websockets.exceptions.WebSocketException) as exc:
+                print(f"  ⚠️  Stream dropped ({exc}); reconnecting in {delay}s")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, RECONNECT_MAX_DELAY)
+    finally:
+        if caps:
+            caps.cancel()
+    return quotes
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=STREAM_URL, help="Combined-stream base URL (e.g. a local stand-in)")
+    parser.add_argument("--snapshot", type=Path, default=generate.CRYPTO_STREAM_SNAPSHOT)
+    args = parser.parse_args()
+    try:
+        asyncio.run(run(stream_url(generate.CRYPTO_BINANCE_PAIRS, args.url), args.snapshot,
+                        generate.CRYPTO_BINANCE_PAIRS))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
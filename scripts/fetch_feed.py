@@ -13,7 +13,6 @@ Final output is sorted by engagement score, then recency.
 import json
 import re
 import sys
-import time
 from datetime import datetime, timezone
 from pathlib import Path
 
@@ -24,6 +23,13 @@ except ImportError:
     subprocess.run([sys.executable, "-m", "pip", "install", "requests"], check=True)
     import requests
 
+REPO_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+import http_client
+from circuit_breaker import CircuitOpenError
+from feed_parser import parse_feed
+
 # ── Account lists ─────────────────────────────────────────────────────────────
 
 ENGAGEMENT_ACCOUNTS = [
@@ -58,35 +64,26 @@ HEADERS = {
     'Accept-Language': 'en-US,en;q=0.9',
 }
 
-REPO_ROOT = Path(__file__).parent.parent
 NITTER_BASE = 'https://nitter.net'  # Primary Nitter instance for RSS
 
 # ── Tweet fetcher via Nitter RSS ──────────────────────────────────────────────
 
-def fetch_user_timeline(username: str, session: requests.Session) -> list:
-    """Fetch tweets via Nitter RSS (reliable, no rate-limiting)."""
-    import xml.etree.ElementTree as ET
-    from email.utils import parsedate_to_datetime as parse_rfc822
+def timeline_url(username: str) -> str:
+    return f'{NITTER_BASE}/{username}/rss'
+
 
-    url = f'{NITTER_BASE}/{username}/rss'
+def parse_user_timeline(username: str, resp) -> list:
+    """Parse one account's Nitter RSS response (or the exception its fetch raised)."""
     try:
-        resp = session.get(url, headers=HEADERS, timeout=12)
+        if isinstance(resp, Exception):
+            raise resp
         if not resp.ok:
             print(f'  @{username}: Nitter HTTP {resp.status_code}')
             return []
 
-        root = ET.fromstring(resp.text)
-        items = root.findall('.//item')
         tweets = []
-        for item in items[:20]:
-            title_el = item.find('title')
-            link_el  = item.find('link')
-            pub_el   = item.find('pubDate')
-            desc_el  = item.find('description')
-            if title_el is None:
-                continue
-
-            raw_text = title_el.text or ''
+        for item in parse_feed(resp.content, limit=20):
+            raw_text = item['title']
             # Strip "R to @handle:" and "RT by @handle:" prefixes
             raw_text = re.sub(r'^R to @\S+:\s*', '', raw_text)
             raw_text = re.sub(r'^RT by @\S+:\s*', '', raw_text)
@@ -94,19 +91,11 @@ def fetch_user_timeline(username: str, session: requests.Session) -> list:
             if not text or len(text) < 5:
                 continue
 
-            link = (link_el.text or '').strip() if link_el is not None else ''
+            link = item['link']
             # Normalise nitter link → x.com
             link = re.sub(r'https?://nitter\.[^/]+/', 'https://x.com/', link)
 
-            # Parse timestamp
-            created_dt = None
-            if pub_el is not None and pub_el.text:
-                try:
-                    created_dt = parse_rfc822(pub_el.text)
-                except Exception:
-                    pass
-            if created_dt is None:
-                created_dt = datetime.now(timezone.utc)
+            created_dt = item['published'] or datetime.now(timezone.utc)
 
             tweet_id = re.search(r'/status/(\d+)', link)
             tweet_id_str = tweet_id.group(1) if tweet_id else str(int(created_dt.timestamp()))
@@ -127,6 +116,9 @@ def fetch_user_timeline(username: str, session: requests.Session) -> list:
         print(f'  @{username}: {len(tweets)} tweets via Nitter')
         return tweets
 
+    except CircuitOpenError:
+        print(f'  @{username}: skipped — Nitter circuit open')
+        return []
     except requests.exceptions.Timeout:
         print(f'  @{username}: timeout')
         return []
@@ -179,14 +171,16 @@ def main():
     all_data: dict[str, list] = {}
     errors: list[str] = []
 
-    with requests.Session() as session:
-        print('── Engagement scanner accounts ──')
-        for i, username in enumerate(ENGAGEMENT_ACCOUNTS):
-            all_data[username] = fetch_user_timeline(username, session)
-            if not all_data[username]:
-                errors.append(username)
-            if i < len(ENGAGEMENT_ACCOUNTS) - 1:
-                time.sleep(0.5)
+    print('── Engagement scanner accounts ──')
+    responses = http_client.get_many(
+        [timeline_url(username) for username in ENGAGEMENT_ACCOUNTS],
+        headers=HEADERS,
+        timeout=12,
+    )
+    for username, resp in zip(ENGAGEMENT_ACCOUNTS, responses):
+        all_data[username] = parse_user_timeline(username, resp)
+        if not all_data[username]:
+            errors.append(username)
 
     print(f'\n── Selecting top {SIGNAL_POOL_SIZE} by engagement (last 24h) ──')
     feed: list[dict] = []
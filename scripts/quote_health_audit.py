@@ -13,12 +13,12 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
-import requests
 from bs4 import BeautifulSoup
 
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 import generate  # noqa: E402
+import http_client  # noqa: E402
 
 CANONICAL_URL = "https://novairesignal.com"
 EXPECTED_CRYPTO = {"BTC", "ETH", "SOL", "ADA", "TON", "SUI", "ZEC", "NIGHT"}
@@ -175,13 +175,13 @@ def main() -> int:
     if not args.no_live:
         try:
             separator = "&" if "?" in args.live_url else "?"
-            response = requests.get(f"{args.live_url}{separator}quote-audit={int(datetime.now().timestamp())}", headers={"Cache-Control": "no-cache", "User-Agent": "NovaireSignalQuoteAudit/1.0"}, timeout=30)
+            response = http_client.get(f"{args.live_url}{separator}quote-audit={int(datetime.now().timestamp())}", headers={"Cache-Control": "no-cache", "User-Agent": "NovaireSignalQuoteAudit/1.0"}, timeout=30)
             audit.record(response.status_code == 200, "live HTTP", f"status={response.status_code} bytes={len(response.content)}")
             if response.status_code == 200:
                 audit_html(audit, response.text, "live")
 
             api_url = args.live_url.rstrip("/") + "/api/market-futures"
-            api_response = requests.get(api_url, headers={"Cache-Control": "no-cache", "User-Agent": "NovaireSignalQuoteAudit/1.0"}, timeout=30)
+            api_response = http_client.get(api_url, headers={"Cache-Control": "no-cache", "User-Agent": "NovaireSignalQuoteAudit/1.0"}, timeout=30)
             api_payload = api_response.json()
             futures = api_payload.get("quotes") or []
             indices = api_payload.get("indices") or []
@@ -0,0 +1,227 @@
+"""Dependency-aware fetch scheduler for the Signal build.
+
+Each stage names the stages whose results it needs. Every stage whose inputs
+are ready runs at once (up to `max_workers`), so a build takes as long as its
+longest dependency chain instead of the sum of every upstream's latency.
+Stage budgets and a run-wide deadline keep one stuck upstream from eating the
+whole job.
+
+An abandoned stage's thread cannot be killed, so it is told instead: code
+running on its behalf (including pool threads it fans out to, which copy
+its context) sees `abandoned()` turn true and stops writing shared state.
+"""
+
+from __future__ import annotations
+
+import os
+import pickle
+import queue
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+from run_trace import CURRENT_STAGE, TRACE
+
+# Set on the thread (and copied contexts) of each running stage; fired when it is abandoned.
+ABANDON_EVENT: ContextVar[threading.Event | None] = ContextVar("abandon_event", default=None)
+
+
+def abandoned() -> bool:
+    """Whether the stage this code runs for has been abandoned by `run_stages`."""
+    event = ABANDON_EVENT.get()
+    return event is not None and event.is_set()
+
+
+@dataclass(frozen=True)
+class Stage:
+    """One fetch step. `func` receives the results of `needs`, in order.
+
+    `budget` caps the stage's wall time in seconds; None means unbounded.
+    """
+
+    name: str
+    func: Callable[..., Any]
+    needs: tuple[str, ...] = ()
+    fallback: Any = None
+    budget: float | None = None
+
+
+def _validate(stages: list[Stage]) -> dict[str, Stage]:
+    by_name: dict[str, Stage] = {}
+    for stage in stages:
+        if stage.name in by_name:
+            raise ValueError(f"Duplicate stage name: {stage.name}")
+        by_name[stage.name] = stage
+    for stage in stages:
+        missing = [need for need in stage.needs if need not in by_name]
+        if missing:
+            raise ValueError(f"Stage {stage.name} needs unknown stages: {missing}")
+
+    # Kahn's algorithm: anything left unvisited sits on a cycle.
+    pending = {stage.name: set(stage.needs) for stage in stages}
+    ready = [name for name, needs in pending.items() if not needs]
+    visited = 0
+    while ready:
+        name = ready.pop()
+        visited += 1
+        for other, needs in pending.items():
+            if name in needs:
+                needs.discard(name)
+                if not needs:
+                    ready.append(other)
+    if visited != len(stages):
+        cyclic = sorted(name for name, needs in pending.items() if needs)
+        raise ValueError(f"Stage dependency cycle: {cyclic}")
+    return by_name
+
+
+class LastGoodStore:
+    """Pickle each stage's last successful result so a later run can fall back on it."""
+
+    def __init__(self, folder: Path) -> None:
+        self.folder = Path(folder)
+
+    def _path(self, name: str) -> Path:
+        return self.folder / f"{name}.pickle"
+
+    def load(self, name: str) -> tuple[bool, Any, float | None]:
+        """Return (found, value, saved_at epoch seconds)."""
+        try:
+            with self._path(name).open("rb") as handle:
+                saved = pickle.load(handle)
+            return True, saved["value"], saved["saved_at"]
+        except Exception:
+            return False, None, None
+
+    def save(self, name: str, value: Any) -> None:
+        path = self._path(name)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            self.folder.mkdir(parents=True, exist_ok=True)
+            with tmp.open("wb") as handle:
+                pickle.dump({"value": value, "saved_at": time.time()}, handle)
+            os.replace(tmp, path)
+        except Exception:
+            # Unpicklable or unwritable results simply are not remembered.
+            tmp.unlink(missing_ok=True)
+
+
+def _is_fallback(value: Any, fallback: Any) -> bool:
+    """Fetchers that swallow their own errors return the empty value; never remember it."""
+    if not value:
+        return True
+    try:
+        return bool(value == fallback)
+    except Exception:
+        return False
+
+
+def run_stages(
+    stages: list[Stage],
+    max_workers: int = 8,
+    *,
+    deadline: float | None = None,
+    last_good: LastGoodStore | None = None,
+    degraded: dict[str, dict[str, Any]] | None = None,
+) -> dict[str, Any]:
+    """Run every stage as soon as its inputs exist; return results by name.
+
+    A stage that raises, overruns its `budget`, or is still running at the
+    run-wide `deadline` (a `time.monotonic()` value) is degraded: it gets its
+    last good result from `last_good` when one exists, else its `fallback`,
+    and its dependents run on that value instead of waiting. Overrunning
+    stages are abandoned on daemon threads so they cannot hold up the build.
+    Every degradation is recorded in `degraded` when a dict is passed.
+    """
+    by_name = _validate(stages)
+    results: dict[str, Any] = {}
+    started: dict[str, float] = {}
+    expires: dict[str, float] = {}
+    running: set[str] = set()
+    cancels: dict[str, threading.Event] = {}
+    finished: queue.Queue = queue.Queue()
+    if degraded is None:
+        degraded = {}
+
+    def worker(stage: Stage, args: list[Any], cancel: threading.Event) -> None:
+        CURRENT_STAGE.set(stage.name)
+        ABANDON_EVENT.set(cancel)
+        try:
+            finished.put((stage.name, True, stage.func(*args)))
+        except Exception as exc:
+            finished.put((stage.name, False, exc))
+
+    def submit_ready() -> None:
+        for stage in stages:
+            if len(running) >= max(1, max_workers):
+                return
+            if stage.name in results or stage.name in started:
+                continue
+            if all(need in results for need in stage.needs):
+                now = time.monotonic()
+                started[stage.name] = now
+                limits = [limit for limit in (deadline, now + stage.budget if stage.budget else None) if limit]
+                if limits:
+                    expires[stage.name] = min(limits)
+                running.add(stage.name)
+                args = [results[need] for need in stage.needs]
+                cancels[stage.name] = threading.Event()
+                threading.Thread(target=worker, args=(stage, args, cancels[stage.name]),
+                                 name=f"stage-{stage.name}", daemon=True).start()
+
+    def degrade(name: str, reason: str, elapsed: float) -> None:
+        found, value, saved_at = last_good.load(name) if last_good else (False, None, None)
+        results[name] = value if found else by_name[name].fallback
+        degraded[name] = {
+            "reason": reason,
+            "elapsed_s": round(elapsed, 1),
+            "value": "last_good" if found else "fallback",
+        }
+        if found and saved_at:
+            degraded[name]["as_of"] = datetime.fromtimestamp(saved_at, timezone.utc).isoformat()
+        TRACE.fallback("stage", stage=name, **degraded[name])
+
+    def trace(name: str, outcome: str) -> None:
+        end = TRACE.now()
+        start = round(end - (time.monotonic() - started[name]), 3)
+        TRACE.stage(stage=name, start=start, end=end, seconds=round(end - start, 3), outcome=outcome)
+
+    submit_ready()
+    while running:
+        now = time.monotonic()
+        pending_expiry = [expires[name] for name in running if name in expires]
+        timeout = max(0.0, min(pending_expiry) - now) if pending_expiry else None
+        try:
+            name, ok, value = finished.get(timeout=timeout)
+        except queue.Empty:
+            name = None
+        if name is not None:
+            if name not in running:
+                continue  # Already abandoned; its late result is ignored.
+            running.discard(name)
+            elapsed = time.monotonic() - started[name]
+            trace(name, "ok" if ok else "error")
+            if ok:
+                results[name] = value
+                if last_good and not _is_fallback(value, by_name[name].fallback):
+                    last_good.save(name, value)
+                print(f"    ⏱  {name} done in {elapsed:.1f}s")
+            else:
+                print(f"    ❌ {name} failed after {elapsed:.1f}s: {value}")
+                degrade(name, f"error: {value}", elapsed)
+        now = time.monotonic()
+        for late in sorted(n for n in running if n in expires and expires[n] <= now):
+            running.discard(late)
+            cancels[late].set()
+            elapsed = now - started[late]
+            over_deadline = deadline is not None and expires[late] >= deadline
+            reason = "run deadline" if over_deadline else "budget"
+            trace(late, reason)
+            degrade(late, reason, elapsed)
+            print(f"    ⌛ {late} abandoned after {elapsed:.1f}s ({reason}); using {degraded[late]['value'].replace('_', ' ')}")
+        submit_ready()
+    return results
@@ -0,0 +1,29 @@
+import pytest
+
+import response_cache
+from circuit_breaker import BREAKER
+from headline_store import HEADLINES
+from hedging import LATENCY
+from price_store import PRICE_STORE
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    """Point every persisted store at a fresh temp dir for each test.
+
+    Otherwise one test's network failures open breakers in the real
+    `.cache/` and change what later tests see.
+    """
+    monkeypatch.setattr(response_cache, "CACHE_DIR", tmp_path)
+    monkeypatch.setattr(BREAKER, "path", tmp_path / "circuit_breaker.json")
+    monkeypatch.setattr(BREAKER, "_hosts", None)
+    monkeypatch.setattr(BREAKER, "_dirty", set())
+    monkeypatch.setattr(BREAKER, "skipped", {})
+    monkeypatch.setattr(LATENCY, "path", tmp_path / "latency.json")
+    monkeypatch.setattr(LATENCY, "_samples", None)
+    monkeypatch.setattr(HEADLINES, "path", tmp_path / "headlines.sqlite3")
+    monkeypatch.setattr(HEADLINES, "_db", None)
+    monkeypatch.setattr(PRICE_STORE, "folder", tmp_path / "prices")
+    yield
+    if HEADLINES._db is not None:
+        HEADLINES._db.close()
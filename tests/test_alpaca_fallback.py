@@ -29,7 +29,7 @@ class AlpacaFallbackTests(unittest.TestCase):
             "APCA_API_SECRET_KEY": "",
         }
         with patch.dict(os.environ, empty_credentials, clear=False), patch.object(
-            generate.requests, "get", return_value=response
+            generate.http_client, "get", return_value=response
         ) as get:
             account = generate.fetch_alpaca()
 
@@ -0,0 +1,74 @@
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import generate
+from bar_cache import BarCache
+from price_store import PriceStore
+
+
+def chart(days_ago_closes, events=None):
+    """Yahoo chart response with one bar per (days_ago, close) at 16:00 New York."""
+    # Count from yesterday (UTC) so every bar is a completed New York session whatever the hour.
+    today = datetime.now(timezone.utc).date() - timedelta(days=1)
+    stamps, closes = [], []
+    for days_ago, close in days_ago_closes:
+        day = today - timedelta(days=days_ago)
+        stamps.append(int(datetime(day.year, day.month, day.day, 20, tzinfo=timezone.utc).timestamp()))
+        closes.append(close)
+    result = {
+        "meta": {"exchangeTimezoneName": "America/New_York"},
+        "timestamp": stamps,
+        "indicators": {"quote": [{"close": closes, "high": [c + 1 for c in closes], "low": [c - 1 for c in closes]}]},
+    }
+    if events:
+        result["events"] = events
+    response = Mock()
+    response.json.return_value = {"chart": {"result": [result]}}
+    return response
+
+
+class BarCacheTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        patcher = patch.object(generate, "BAR_CACHE", BarCache(PriceStore(Path(tmp.name))))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_warm_ticker_fetches_recent_days_and_merges(self):
+        year = [(days, 10.0 + days) for days in range(30, 2, -1)]
+        with patch.object(generate.http_client, "aget", return_value=chart(year)) as get:
+            generate.apply_completed_close_changes({}, ["URNJ"])
+        self.assertIn("range=1y", get.call_args.args[0])
+
+        with patch.object(generate.http_client, "aget", return_value=chart([(2, 20.0), (1, 22.0)])) as get:
+            data = generate.apply_completed_close_changes({}, ["URNJ"])
+        self.assertIn("range=5d", get.call_args.args[0])
+        self.assertEqual(data["URNJ"]["close_price"], 22.0)
+        self.assertEqual(data["URNJ"]["previous_close"], 20.0)
+        self.assertAlmostEqual(data["URNJ"]["close_change"], 10.0)
+        self.assertEqual((data["URNJ"]["day_high"], data["URNJ"]["day_low"]), (23.0, 21.0))
+        self.assertEqual(len(generate.BAR_CACHE.load("URNJ")), 30)
+
+    def test_new_dividend_triggers_a_full_refetch(self):
+        with patch.object(generate.http_client, "aget", return_value=chart([(3, 10.0), (2, 11.0)])):
+            generate.apply_completed_close_changes({}, ["GLO.TO"])
+
+        dividend = {"dividends": {"1790000000": {"amount": 0.1}}}
+        responses = [chart([(1, 12.0)], events=dividend), chart([(2, 10.5), (1, 12.0)], events=dividend)]
+        with patch.object(generate.http_client, "aget", side_effect=responses) as get:
+            data = generate.apply_completed_close_changes({}, ["GLO.TO"])
+        self.assertEqual([call.args[0].split("range=")[1][:2] for call in get.call_args_list], ["5d", "1y"])
+        self.assertEqual(data["GLO.TO"]["previous_close"], 10.5)
+        self.assertEqual(generate.BAR_CACHE.known_actions("GLO.TO"), {"dividends:1790000000"})
+
+        with patch.object(generate.http_client, "aget", return_value=chart([(1, 12.0)], events=dividend)) as get:
+            generate.apply_completed_close_changes({}, ["GLO.TO"])
+        get.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import json
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import circuit_breaker
+from circuit_breaker import CircuitBreaker, CircuitOpenError
+
+
+class CircuitBreakerTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name) / "circuit_breaker.json"
+
+    def fail(self, breaker, host, times):
+        for _ in range(times):
+            breaker.before_request(host)
+            breaker.record(host, ok=False)
+
+    def test_repeated_failures_open_the_host_and_persist(self):
+        breaker = CircuitBreaker(self.path)
+        self.fail(breaker, "nitter.net", circuit_breaker.FAILURE_THRESHOLD)
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_request("nitter.net")
+        breaker.before_request("api.binance.com")
+
+        next_run = CircuitBreaker(self.path)
+        with self.assertRaises(CircuitOpenError):
+            next_run.before_request("nitter.net")
+        self.assertEqual(next_run.summary(), {"open": ["nitter.net"], "skipped": {"nitter.net": 1}})
+
+    def test_success_before_threshold_resets_the_count(self):
+        breaker = CircuitBreaker(self.path)
+        self.fail(breaker, "flixpatrol.com", circuit_breaker.FAILURE_THRESHOLD - 1)
+        breaker.record("flixpatrol.com", ok=True)
+        self.fail(breaker, "flixpatrol.com", circuit_breaker.FAILURE_THRESHOLD - 1)
+        breaker.before_request("flixpatrol.com")
+
+    def test_cool_down_lets_the_trial_batch_through(self):
+        breaker = CircuitBreaker(self.path)
+        self.fail(breaker, "api.firecrawl.dev", circuit_breaker.FAILURE_THRESHOLD)
+        later = time.time() + circuit_breaker.COOL_DOWN_SECONDS + 1
+        with patch.object(circuit_breaker.time, "time", return_value=later):
+            # A fan-out batch starts together; none of it is refused.
+            for _ in range(5):
+                breaker.before_request("api.firecrawl.dev")
+            breaker.record("api.firecrawl.dev", ok=True)
+            breaker.before_request("api.firecrawl.dev")
+        self.assertEqual(json.loads(self.path.read_text()), {})
+
+    def test_cool_down_is_shorter_than_the_feed_cadence(self):
+        self.assertLess(circuit_breaker.COOL_DOWN_SECONDS, 4 * 60 * 60)
+
+    def test_nitter_accounts_trip_their_own_breakers(self):
+        breaker = CircuitBreaker(self.path)
+        dead = circuit_breaker.circuit_key("https://nitter.net/quakes99/rss")
+        self.assertEqual(dead, "nitter.net/quakes99")
+        self.assertEqual(circuit_breaker.circuit_key("https://query1.finance.yahoo.com/v8/finance/chart/HG.CN"),
+                         "query1.finance.yahoo.com")
+        self.fail(breaker, dead, circuit_breaker.FAILURE_THRESHOLD)
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_request(dead)
+        breaker.before_request(circuit_breaker.circuit_key("https://nitter.net/zerohedge/rss"))
+
+    def test_failed_trial_reopens_for_another_cool_down(self):
+        breaker = CircuitBreaker(self.path)
+        self.fail(breaker, "www.amazon.com", circuit_breaker.FAILURE_THRESHOLD)
+        later = time.time() + circuit_breaker.COOL_DOWN_SECONDS + 1
+        with patch.object(circuit_breaker.time, "time", return_value=later):
+            breaker.before_request("www.amazon.com")
+            breaker.record("www.amazon.com", ok=False)
+            with self.assertRaises(CircuitOpenError):
+                breaker.before_request("www.amazon.com")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import json
 import time
 import unittest
+from urllib.parse import unquote
 from unittest.mock import patch
 
 import generate
@@ -41,7 +43,7 @@ class CryptoQuoteTests(unittest.TestCase):
                 )
             raise RuntimeError("pair unavailable")
 
-        with patch.object(generate.requests, "get", side_effect=fake_get):
+        with patch.object(generate.http_client, "aget", side_effect=fake_get):
             quotes = generate.fetch_crypto()
 
         self.assertEqual(quotes["TON"]["price"], 1.33)
@@ -65,13 +67,37 @@ class CryptoQuoteTests(unittest.TestCase):
                 )
             raise RuntimeError("pair unavailable")
 
-        with patch.object(generate.requests, "get", side_effect=fake_get):
+        with patch.object(generate.http_client, "aget", side_effect=fake_get):
             quotes = generate.fetch_crypto()
 
         self.assertEqual(generate.CRYPTO_BINANCE_PAIRS["TON"], "GRAMUSDT")
         self.assertEqual(quotes["TON"]["price"], 1.332)
         self.assertEqual(quotes["TON"]["source"], "Binance")
 
+    def test_all_binance_pairs_come_from_one_batched_request(self):
+        now_ms = int(time.time() * 1000)
+        urls = []
+
+        def fake_get(url, **kwargs):
+            urls.append(url)
+            if "coingecko.com" in url:
+                return FakeResponse([{"id": "bitcoin", "current_price": 1.0, "price_change_percentage_24h": 0.0,
+                                      "market_cap": 2_000_000_000_000}])
+            symbols = json.loads(unquote(url.split("symbols=", 1)[1]))
+            return FakeResponse([
+                {"symbol": pair, "lastPrice": "2.5", "priceChangePercent": "1.5", "closeTime": now_ms - 1_000}
+                for pair in symbols
+            ])
+
+        with patch.object(generate.http_client, "aget", side_effect=fake_get):
+            quotes = generate.fetch_crypto()
+
+        self.assertEqual(sum("binance.com" in url for url in urls), 1)
+        for ticker in generate.CRYPTO_BINANCE_PAIRS:
+            self.assertEqual(quotes[ticker]["source"], "Binance", ticker)
+            self.assertIsNone(quotes[ticker]["day_high"])
+        self.assertEqual(quotes["BTC"]["market_cap"], 2_000_000_000_000)
+
 
 if __name__ == "__main__":
     unittest.main()
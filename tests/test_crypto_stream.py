@@ -0,0 +1,82 @@
+import asyncio
+import importlib.util
+import json
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import generate
+
+MODULE_PATH = Path(__file__).resolve().parents[1] / "scripts" / "crypto_stream.py"
+spec = importlib.util.spec_from_file_location("crypto_stream", MODULE_PATH)
+assert spec is not None and spec.loader is not None
+crypto_stream = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(crypto_stream)
+
+
+def ticker_event(pair, price, change):
+    now_ms = int(time.time() * 1000)
+    return json.dumps({"stream": f"{pair.lower()}@ticker", "data": {
+        "e": "24hrTicker", "E": now_ms, "s": pair, "c": str(price), "P": str(change),
+        "h": str(price * 1.1), "l": str(price * 0.9), "C": now_ms,
+    }})
+
+
+@unittest.skipUnless(importlib.util.find_spec("websockets"), "websockets is not installed")
+class CryptoStreamTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.snapshot = Path(tmp.name) / "crypto_stream.json"
+
+    def stream_from_local_stand_in(self, events):
+        import websockets
+
+        async def serve(ws):
+            for event in events:
+                await ws.send(event)
+            await ws.wait_closed()
+
+        async def scenario():
+            async with websockets.serve(serve, "127.0.0.1", 0) as server:
+                port = server.sockets[0].getsockname()[1]
+                url = crypto_stream.stream_url(generate.CRYPTO_BINANCE_PAIRS, f"ws://127.0.0.1:{port}/stream")
+                return await crypto_stream.run(url, self.snapshot, generate.CRYPTO_BINANCE_PAIRS,
+                                               max_messages=len(events), market_caps=False)
+
+        with patch("builtins.print"):
+            return asyncio.run(scenario())
+
+    def test_daemon_writes_latest_quote_per_pair(self):
+        self.stream_from_local_stand_in([
+            ticker_event("BTCUSDT", 100000, 1.0),
+            json.dumps({"result": None, "id": 1}),
+            ticker_event("GRAMUSDT", 1.3, -0.5),
+            ticker_event("BTCUSDT", 101000, 2.0),
+        ])
+        quotes = json.loads(self.snapshot.read_text())["quotes"]
+        self.assertEqual(set(quotes), {"BTC", "TON"})
+        self.assertEqual(quotes["BTC"]["price"], 101000.0)
+        self.assertEqual(quotes["TON"]["change"], -0.5)
+
+    def test_build_prices_streamed_coins_without_binance_rest(self):
+        self.stream_from_local_stand_in([ticker_event("BTCUSDT", 100000, 1.0)])
+        urls = []
+
+        def fake_get(url, **kwargs):
+            urls.append(url)
+            raise RuntimeError("offline")
+
+        with patch.object(generate, "CRYPTO_STREAM_SNAPSHOT", self.snapshot), \
+                patch.object(generate.http_client, "get", side_effect=fake_get), patch("builtins.print"):
+            quotes = generate.fetch_crypto()
+
+        self.assertEqual(quotes["BTC"]["price"], 100000.0)
+        self.assertEqual(quotes["BTC"]["source"], "Binance")
+        self.assertNotIn("BTCUSDT", " ".join(urls))
+
+
+if __name__ == "__main__":
+    unittest.main()
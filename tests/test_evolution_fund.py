@@ -0,0 +1,67 @@
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import generate
+from bar_cache import BarCache
+from price_store import PriceStore
+
+
+def spark(closes_by_symbol):
+    """Spark payload with daily bars at 20:00 UTC ending two days ago, so every session is complete in New York."""
+    last = datetime.now(timezone.utc).date() - timedelta(days=2)
+    result = []
+    for symbol, closes in closes_by_symbol.items():
+        days = [last - timedelta(days=offset) for offset in range(len(closes) - 1, -1, -1)]
+        result.append({"symbol": symbol, "response": [{
+            "meta": {"exchangeTimezoneName": "America/New_York"},
+            "timestamp": [int(datetime(d.year, d.month, d.day, 20, tzinfo=timezone.utc).timestamp()) for d in days],
+            "indicators": {"quote": [{"close": closes}]},
+        }]})
+    response = Mock(status_code=200)
+    response.json.return_value = {"spark": {"result": result}}
+    return response
+
+
+class EvolutionFundTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        patcher = patch.object(generate, "BAR_CACHE", BarCache(PriceStore(Path(tmp.name))))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_one_batched_request_values_every_position(self):
+        crypto = {"BTC": {"price": 100000.0, "change": 2.0}}
+        with patch.object(generate.http_client, "aget", return_value=spark({"PHYS": [40.0, 44.0]})) as get:
+            evo = generate.value_evolution_fund(crypto)
+
+        get.assert_called_once()
+        self.assertIn("/v8/finance/spark?symbols=PHYS,URNM,", get.call_args.args[0])
+        positions = {p["ticker"]: p for p in evo["positions"]}
+        self.assertEqual(len(positions), len(generate.EVO_HOLDINGS) + 1)
+        self.assertEqual(positions["PHYS"]["price"], 44.0)
+        self.assertAlmostEqual(positions["PHYS"]["change"], 10.0)
+        # No quote and no stored bars: marked at cost, no daily change.
+        self.assertEqual(positions["URNM"]["price"], 67.72)
+        self.assertIsNone(positions["URNM"]["change"])
+        self.assertEqual(positions["BTC"]["value"], 6.72 * 100000.0)
+        self.assertEqual(evo["snapshot"]["BTC"], {"price": 100000.0, "gl": round((100000 / 65500 - 1) * 100, 1)})
+        self.assertAlmostEqual(evo["total_value"], sum(p["value"] for p in evo["positions"]))
+
+    def test_failed_batch_falls_back_to_stored_bars(self):
+        with patch.object(generate.http_client, "aget", return_value=spark({"CEG": [300.0, 330.0]})):
+            generate.value_evolution_fund({})
+        with patch.object(generate.http_client, "aget", side_effect=RuntimeError("offline")), \
+                patch("builtins.print"):
+            evo = generate.value_evolution_fund({})
+
+        positions = {p["ticker"]: p for p in evo["positions"]}
+        self.assertEqual(positions["CEG"]["price"], 330.0)
+        self.assertEqual(positions["BTC"]["price"], generate.EVO_BTC["avg_entry"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import feed_parser
+import generate
+import headline_store
+
+RSS = b"""\xef\xbb\xbf
+<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"><channel><title>Feed</title>
+<item>
+  <title>  Visa rules   tighten for long-stay foreigners in Bangkok </title>
+  <link>https://example.com/visa</link>
+  <description><![CDATA[<p>Immigration &amp; <b>overstay</b> fines rise.</p><script>track()</script>]]></description>
+  <pubDate>Fri, 16 Oct 2026 08:30:00 +0700</pubDate>
+  <source url="https://example.com">Example Wire</source>
+</item>
+<item>
+  <title>Second item</title>
+  <guid>https://example.com/second</guid>
+</item>
+"""
+
+ATOM = b"""<?xml version="1.0"?>
+<feed xmlns="http://www.w3.org/2005/Atom" xmlns:yt="http://www.youtube.com/xml/schemas/2015"
+      xmlns:media="http://search.yahoo.com/mrss/">
+  <entry>
+    <yt:videoId>abc123</yt:videoId>
+    <title>Episode one</title>
+    <link rel="alternate" href="https://www.youtube.com/watch?v=abc123"/>
+    <published>2026-10-15T12:00:00Z</published>
+    <media:group>
+      <media:description>This clip comes from episode one.</media:description>
+      <media:community>
+        <media:starRating count="42" average="5.00"/>
+        <media:statistics views="1234"/>
+      </media:community>
+    </media:group>
+  </entry>
+</feed>"""
+
+
+class FeedParserTests(unittest.TestCase):
+    def test_rss_items_are_normalized_and_html_is_stripped(self):
+        first, second = feed_parser.parse_feed(RSS)
+
+        self.assertEqual(first["title"], "Visa rules tighten for long-stay foreigners in Bangkok")
+        self.assertEqual(first["link"], "https://example.com/visa")
+        self.assertEqual(first["summary"], "Immigration & overstay fines rise.")
+        self.assertEqual(first["source"], "Example Wire")
+        self.assertEqual(first["published"], datetime(2026, 10, 16, 1, 30, tzinfo=timezone.utc))
+        self.assertEqual(second["link"], "https://example.com/second")
+        self.assertIsNone(second["published"])
+
+    def test_stops_at_the_limit_without_reading_the_rest(self):
+        # Everything after the first item is malformed; the limit never reaches it.
+        broken = RSS.split(b"<item>\n  <title>Second")[0] + b"<item><title>oops</titel>"
+        items = feed_parser.parse_feed(broken, limit=1)
+        self.assertEqual(len(items), 1)
+        self.assertEqual(len(feed_parser.parse_feed(broken)), 1)
+        with self.assertRaises(feed_parser.FeedError):
+            feed_parser.parse_feed(b"<rss><channel><item><title>x</titel>")
+
+    def test_atom_entries_expose_namespaced_fields_and_attributes(self):
+        (entry,) = feed_parser.parse_feed(ATOM)
+
+        self.assertEqual(entry["fields"]["videoId"], "abc123")
+        self.assertEqual(entry["link"], "https://www.youtube.com/watch?v=abc123")
+        self.assertEqual(entry["summary"], "This clip comes from episode one.")
+        self.assertEqual(entry["attrs"]["statistics"], {"views": "1234"})
+        self.assertEqual(entry["attrs"]["starRating"]["count"], "42")
+        self.assertEqual(entry["published"], datetime(2026, 10, 15, 12, tzinfo=timezone.utc))
+
+    def test_bangkok_post_reads_feed_items_through_the_shared_parser(self):
+        response = Mock(content=RSS)
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        store = headline_store.HeadlineStore(Path(tmp.name) / "headlines.sqlite3")
+        with patch.object(generate.http_client, "get", return_value=response), \
+                patch.object(generate, "HEADLINES", store):
+            headlines = generate.fetch_bangkok_post()
+
+        self.assertEqual(headlines[0]["title"], "Visa rules tighten for long-stay foreigners in Bangkok")
+        self.assertEqual(headlines[0]["url"], "https://example.com/visa")
+        self.assertEqual(headlines[0]["summary"], "Immigration & overstay fines rise.")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+from unittest.mock import Mock, patch
+
+import generate
+from run_cache import RUN_CACHE
+
+RATES = {"cad": 1.38, "thb": 36.2, "aud": 1.6, "cop": 4100.0, "eur": 0.92, "rub": 90.0, "krw": 1390.0, "jpy": 150.0}
+
+
+def snapshot(date, scale=1.0):
+    response = Mock(status_code=200)
+    response.json.return_value = {"date": date, "usd": {key: rate * scale for key, rate in RATES.items()}}
+    return response
+
+
+class FxServiceTests(unittest.TestCase):
+    def test_one_latest_snapshot_serves_portfolio_fx_and_display_pairs(self):
+        def fake_get(url, **kwargs):
+            if "@latest" in url:
+                return snapshot("2026-10-13")
+            if "@2026-10-12" in url:
+                return snapshot("2026-10-12", scale=0.99)
+            raise AssertionError(url)
+
+        with patch.object(generate.http_client, "get", side_effect=fake_get) as get, RUN_CACHE.run():
+            fx = generate.fetch_fx()
+            rates = generate.fetch_fx_rates()
+
+        self.assertEqual(get.call_count, 2)
+        self.assertAlmostEqual(fx["usdcad"], 1.38)
+        self.assertAlmostEqual(fx["audusd"], 0.625)
+        self.assertEqual(set(rates), set(generate.FX_CURRENCIES))
+        self.assertEqual(rates["CAD"]["comparison_date"], "2026-10-12")
+        self.assertAlmostEqual(rates["JPY"]["change"], (1 / 0.99 - 1) * 100)
+
+    def test_unavailable_snapshot_falls_back_to_default_fx(self):
+        with patch.object(generate.http_client, "get", side_effect=RuntimeError("offline")), \
+                patch("builtins.print"):
+            self.assertEqual(generate.fetch_fx(), generate.DEFAULT_FX)
+
+
+if __name__ == "__main__":
+    unittest.main()
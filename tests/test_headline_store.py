@@ -0,0 +1,206 @@
+import asyncio
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import generate
+import headline_store
+
+NOW = datetime(2026, 10, 17, 12, tzinfo=timezone.utc)
+
+
+def google_rss(title, published):
+    return f"""<rss><channel><item>
+<title>{title}</title>
+<link>https://news.example.com/a?utm_source=google</link>
+<pubDate>{published.strftime('%a, %d %b %Y %H:%M:%S +0000')}</pubDate>
+<source url="https://news.example.com">Example Wire</source>
+</item></channel></rss>""".encode()
+
+
+class HeadlineStoreTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.store = headline_store.HeadlineStore(Path(tmp.name) / "headlines.sqlite3")
+        patcher = patch.object(generate, "HEADLINES", self.store)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_fingerprint_ignores_link_decoration_and_title_punctuation(self):
+        base = headline_store.fingerprint("https://example.com/news/visa", "Visa rules tighten")
+        for url, title in [
+            ("HTTPS://www.Example.com/news/visa/?utm_source=rss&utm_medium=feed", "Visa rules tighten"),
+            ("https://example.com/news/visa#comments", "  visa RULES tighten! "),
+            ("https://example.com/news/visa?fbclid=abc", "Visa rules, tighten"),
+        ]:
+            self.assertEqual(headline_store.fingerprint(url, title), base)
+        self.assertNotEqual(headline_store.fingerprint("https://example.com/news/visa?id=2", "Visa rules tighten"), base)
+        self.assertNotEqual(headline_store.fingerprint("https://example.com/news/visa", "Visa rules relax"), base)
+
+    def test_only_unseen_items_are_scored_and_returned(self):
+        score = Mock(return_value=3)
+        first = [{"title": "Visa rules tighten", "url": "https://example.com/visa"}]
+        again = [{"title": "Visa rules tighten", "url": "https://www.example.com/visa?utm_source=x"},
+                 {"title": "Condo prices rise", "url": "https://example.com/condo"}]
+
+        self.assertEqual(self.store.ingest("expat", first, score=score, now=NOW), first)
+        fresh = self.store.ingest("expat", again, score=score, now=NOW + timedelta(hours=1))
+
+        self.assertEqual([item["title"] for item in fresh], ["Condo prices rise"])
+        self.assertEqual(score.call_count, 2)
+        (visa,) = [row for row in self.store.recent("expat") if row["title"] == "Visa rules tighten"]
+        self.assertEqual(visa["first_seen"], NOW)
+        self.assertEqual(visa["last_seen"], NOW + timedelta(hours=1))
+
+    def test_one_unscorable_item_does_not_lose_the_rest_of_the_batch(self):
+        def score(item):
+            if item["title"] == "Broken":
+                raise KeyError("summary")
+            return 1
+
+        fresh = self.store.ingest("expat", [{"title": "Broken", "url": "u0"}, {"title": "Fine", "url": "u1"}],
+                                  score=score, now=NOW)
+
+        self.assertEqual([item["title"] for item in fresh], ["Fine"])
+        self.assertEqual([row["title"] for row in self.store.recent("expat")], ["Fine"])
+        self.assertEqual(len(self.store.ingest("expat", [{"title": "Broken", "url": "u0"}], now=NOW)), 1)
+
+    def test_unscored_feeds_keep_published_order_when_ranked_by_score(self):
+        self.store.ingest("zerohedge", [{"title": "Older", "url": "u1", "published": NOW - timedelta(hours=5)}], now=NOW)
+        self.store.ingest("zerohedge", [{"title": "Newest", "url": "u2", "published": NOW - timedelta(hours=1)},
+                                        {"title": "Oldest", "url": "u3", "published": NOW - timedelta(hours=9)}], now=NOW)
+        for order in ("published", "score"):
+            self.assertEqual([row["title"] for row in self.store.recent("zerohedge", order=order)],
+                             ["Newest", "Older", "Oldest"])
+
+    def test_zerohedge_card_stays_in_published_order_across_runs(self):
+        def feed(*items):
+            body = "".join(f"<item><title>{title} moves markets today</title><link>https://zh.example/{title}</link>"
+                           f"<pubDate>{(datetime.now(timezone.utc) - timedelta(hours=age)).strftime('%a, %d %b %Y %H:%M:%S +0000')}"
+                           f"</pubDate></item>" for title, age in items)
+            return Mock(content=f"<rss><channel>{body}</channel></rss>".encode(), ok=False)
+
+        with patch.object(generate.http_client, "aget", return_value=feed(("Middle", 5))):
+            generate.fetch_zerohedge()
+        with patch.object(generate.http_client, "aget", return_value=feed(("Newest", 1), ("Oldest", 9))):
+            headlines = generate.fetch_zerohedge()
+
+        self.assertEqual([item["title"].split()[0] for item in headlines], ["Newest", "Middle", "Oldest"])
+
+    def test_recent_filters_windows_and_orders_by_score_or_date(self):
+        self.store.ingest("expat", [
+            {"title": "Old but strong", "url": "u1", "published": NOW - timedelta(days=3)},
+            {"title": "New and weak", "url": "u2", "published": NOW - timedelta(hours=1)},
+        ], score=lambda item: 5 if "strong" in item["title"] else 1, now=NOW - timedelta(days=2))
+        self.store.ingest("expat", [{"title": "New and weak", "url": "u2"}], now=NOW)
+
+        self.assertEqual([r["title"] for r in self.store.recent("expat")], ["New and weak", "Old but strong"])
+        self.assertEqual([r["title"] for r in self.store.recent("expat", order="score")],
+                         ["Old but strong", "New and weak"])
+        self.assertEqual([r["title"] for r in self.store.recent("expat", seen_since=NOW)], ["New and weak"])
+        self.assertEqual([r["title"] for r in self.store.recent("expat", published_since=NOW - timedelta(days=1))],
+                         ["New and weak"])
+        self.assertEqual(self.store.recent("other"), [])
+
+    def test_crawl_bookkeeping_round_trips(self):
+        self.assertIsNone(self.store.crawled_at("catalyst:HG.CN"))
+        self.store.mark_crawled("catalyst:HG.CN", now=NOW)
+        self.assertEqual(self.store.crawled_at("catalyst:HG.CN"), NOW)
+
+    def test_bangkok_post_does_not_rescore_headlines_seen_last_run(self):
+        title = "Immigration tightens visa checks for foreigners in Bangkok condos"
+        rss = f"""<rss><channel><item><title>{title}</title>
+<link>https://example.com/visa</link><pubDate>Fri, 16 Oct 2026 08:30:00 +0700</pubDate>
+</item></channel></rss>""".encode()
+        with patch.object(generate.http_client, "aget", return_value=Mock(content=rss)), \
+                patch.object(generate, "expat_score", wraps=generate.expat_score) as score:
+            first = generate.fetch_bangkok_post()
+            second = generate.fetch_bangkok_post()
+
+        self.assertEqual(first[0]["title"], title)
+        self.assertEqual(second, first)
+        score.assert_called_once()
+
+    def test_catalysts_are_served_from_the_store_between_crawls(self):
+        published = datetime.now(timezone.utc) - timedelta(days=1)
+        response = Mock(content=google_rss("Freegold drills Golden Summit", published))
+        with patch.object(generate.http_client, "aget", return_value=response) as get:
+            first = generate.fetch_catalysts(["_FVL_FALLBACK"])
+            second = generate.fetch_catalysts(["_FVL_FALLBACK"])
+
+        self.assertEqual(get.call_count, 1)
+        self.assertEqual(first["_FVL_FALLBACK"]["title"], "Freegold drills Golden Summit")
+        self.assertEqual(second, first)
+
+    def test_stale_catalysts_only_ask_google_for_news_since_the_last_crawl(self):
+        self.store.mark_crawled("catalyst:_FVL_FALLBACK", now=datetime.now(timezone.utc) - timedelta(days=3))
+        self.store.mark_crawled("catalyst:URNJ", now=datetime.now(timezone.utc) - timedelta(days=30))
+        yf = Mock()
+        yf.Ticker.return_value.news = []
+        with patch.dict("sys.modules", yfinance=yf), patch.object(generate, "GOOGLE_NEWS_BATCH_SIZE", 1), \
+                patch.object(generate.http_client, "aget", side_effect=OSError("offline")) as get:
+            generate.fetch_catalysts(["_FVL_FALLBACK", "URNJ"])
+
+        urls = sorted(call.args[0] for call in get.call_args_list)
+        self.assertIn("when%3A5d", urls[0])
+        self.assertIn("when%3A14d", urls[1])
+        yf.Ticker.assert_called_once_with("URNJ")
+
+    def test_batched_google_search_hands_each_item_to_the_ticker_it_names(self):
+        published = datetime.now(timezone.utc) - timedelta(days=1)
+        rss = google_rss("Freegold drills Golden Summit", published).replace(b"</channel>", b"""<item>
+<title>Bannerman advances Etango</title><link>https://news.example.com/b</link>
+<pubDate>""" + published.strftime("%a, %d %b %Y %H:%M:%S +0000").encode() + b"""</pubDate></item></channel>""")
+        tickers = ["_FVL_FALLBACK", "FVL.TO", "BNNLF", "HG.CN"]
+        yf = Mock()
+        yf.Ticker.return_value.news = []
+        with patch.dict("sys.modules", yfinance=yf), \
+                patch.object(generate.http_client, "aget", return_value=Mock(content=rss)) as get:
+            cats = generate.fetch_catalysts(tickers)
+
+        get.assert_called_once()
+        query = get.call_args.args[0]
+        self.assertIn("%22Bannerman+Energy+Etango%22+OR+", query)
+        self.assertEqual(query.count("Freegold"), 1)
+        self.assertEqual(cats["_FVL_FALLBACK"]["title"], "Freegold drills Golden Summit")
+        self.assertEqual(cats["FVL.TO"]["title"], "Freegold drills Golden Summit")
+        self.assertEqual(cats["BNNLF"]["title"], "Bannerman advances Etango")
+        self.assertIsNone(cats["HG.CN"])
+        self.assertEqual(self.store.recent("catalyst:HG.CN"), [])
+
+    def test_google_and_yahoo_catalyst_fan_outs_are_in_flight_together(self):
+        yahoo_started = threading.Event()
+        published = datetime.now(timezone.utc) - timedelta(days=1)
+
+        async def google(url, **kwargs):
+            for _ in range(100):
+                if yahoo_started.is_set():
+                    return Mock(content=google_rss("Freegold drills Golden Summit", published))
+                await asyncio.sleep(0.01)
+            raise OSError("Google finished before Yahoo started")
+
+        def yahoo(yf, symbol):
+            yahoo_started.set()
+            return []
+
+        with patch.dict("sys.modules", yfinance=Mock()), patch.object(generate, "yahoo_news_items", side_effect=yahoo), \
+                patch.object(generate.http_client, "aget", side_effect=google):
+            cats = generate.fetch_catalysts(["FVL.TO"])
+
+        self.assertEqual(cats["FVL.TO"]["title"], "Freegold drills Golden Summit")
+
+    def test_failed_catalyst_crawl_is_retried_next_run(self):
+        with patch.object(generate.http_client, "aget", side_effect=OSError("offline")) as get:
+            self.assertIsNone(generate.fetch_catalysts(["_FVL_FALLBACK"])["_FVL_FALLBACK"])
+            generate.fetch_catalysts(["_FVL_FALLBACK"])
+
+        self.assertEqual(get.call_count, 2)
+        self.assertIsNone(self.store.crawled_at("catalyst:_FVL_FALLBACK"))
+
+
+if __name__ == "__main__":
+    unittest.main()
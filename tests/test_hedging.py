@@ -0,0 +1,69 @@
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import hedging
+from hedging import LatencyHistory, hedged
+
+
+class HedgingTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        history = LatencyHistory(Path(tmp.name) / "latency.json")
+        patcher = patch.object(hedging, "LATENCY", history)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.history = history
+
+    def seed(self, key, seconds):
+        for _ in range(hedging.HEDGE_MIN_SAMPLES):
+            self.history.record(key, seconds)
+
+    def test_backup_only_runs_after_failure_without_history(self):
+        calls = []
+
+        def primary():
+            calls.append("primary")
+            raise ConnectionError("jsdelivr down")
+
+        def backup():
+            calls.append("backup")
+            return "pages.dev"
+
+        self.assertEqual(hedged(primary, backup, key="fx"), "pages.dev")
+        self.assertEqual(calls, ["primary", "backup"])
+
+    def test_slow_primary_is_hedged_after_its_p90(self):
+        self.seed("fx", 0.05)
+        release = threading.Event()
+        self.addCleanup(release.set)
+        started = time.monotonic()
+        result = hedged(lambda: release.wait(2) and "jsdelivr", lambda: "pages.dev", key="fx")
+        self.assertEqual(result, "pages.dev")
+        self.assertLess(time.monotonic() - started, 1.0)
+
+    def test_fast_primary_wins_and_backup_never_starts(self):
+        self.seed("sheet", 1.0)
+        backup_calls = []
+        self.assertEqual(hedged(lambda: "csv", lambda: backup_calls.append(1), key="sheet"), "csv")
+        self.assertEqual(backup_calls, [])
+
+    def test_rejected_backup_answer_does_not_beat_a_valid_primary(self):
+        self.seed("fx", 0.01)
+
+        def primary():
+            time.sleep(0.1)
+            return "jsdelivr"
+
+        def backup():
+            raise ValueError("Malformed FX snapshot")
+
+        self.assertEqual(hedged(primary, backup, key="fx"), "jsdelivr")
+
+
+if __name__ == "__main__":
+    unittest.main()
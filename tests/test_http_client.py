@@ -0,0 +1,127 @@
+import asyncio
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock, patch
+
+import requests
+
+import http_client
+
+
+class HttpClientTests(unittest.TestCase):
+    def test_get_many_returns_responses_in_input_order(self):
+        async def fake_aget(url, **kwargs):
+            # Finish in reverse order to prove results are not completion-ordered.
+            await asyncio.sleep(0.05 if url.endswith("a") else 0)
+            return url
+
+        with patch.object(http_client, "aget", side_effect=fake_aget):
+            self.assertEqual(http_client.get_many(["/a", "/b", "/c"], timeout=5), ["/a", "/b", "/c"])
+
+    def test_get_many_multiplexes_requests_on_the_loop_thread(self):
+        in_flight, peak, threads = 0, 0, set()
+
+        async def fake_aget(url, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            threads.add(threading.current_thread().name)
+            await asyncio.sleep(0.05)
+            in_flight -= 1
+            return url
+
+        with patch.object(http_client, "aget", side_effect=fake_aget):
+            self.assertEqual(len(http_client.get_many([f"/{i}" for i in range(4)])), 4)
+        self.assertEqual(peak, 4)
+        self.assertEqual(threads, {"http-loop"})
+
+    def test_failures_are_returned_per_slot(self):
+        async def fake_aget(url, **kwargs):
+            if "dead" in url:
+                raise requests.Timeout("dead symbol")
+            return url
+
+        with patch.object(http_client, "aget", side_effect=fake_aget):
+            ok, dead = http_client.get_many(["/live", "/dead"])
+        self.assertEqual(ok, "/live")
+        self.assertIsInstance(dead, requests.Timeout)
+
+    def test_call_many_overlaps_calls_and_keeps_failures_per_slot(self):
+        barrier = threading.Barrier(3, timeout=2)
+
+        def fetch(name):
+            barrier.wait()
+            if name == "dead":
+                raise requests.Timeout(name)
+            return name
+
+        first, dead, last = http_client.call_many(lambda name=name: fetch(name) for name in ("a", "dead", "c"))
+        self.assertEqual((first, last), ("a", "c"))
+        self.assertIsInstance(dead, requests.Timeout)
+
+    def test_provider_headers_fill_in_under_caller_headers(self):
+        response = Mock(status_code=200, content=b"")
+        with patch.object(http_client, "_send", return_value=response) as send:
+            self.assertIs(http_client.get("https://api.binance.com/x", headers={"Accept": "text/plain"}, timeout=3), response)
+            http_client.get("https://query1.finance.yahoo.com/v8/finance/chart/HG.CN", timeout=3)
+        self.assertEqual(send.call_args_list[0].kwargs["headers"], {"Accept": "text/plain"})
+        self.assertEqual(send.call_args_list[1].kwargs["headers"]["User-Agent"], "Mozilla/5.0 NovaireSignal/1.0")
+
+    def test_run_deadline_clamps_request_timeouts(self):
+        self.addCleanup(http_client.set_deadline, None)
+        with patch.object(http_client, "_send", return_value=Mock(status_code=200, content=b"")) as send:
+            http_client.set_deadline(time.monotonic() + 5)
+            http_client.post("https://example.com/slow", timeout=60)
+            self.assertLessEqual(send.call_args.kwargs["timeout"], 5)
+            http_client.set_deadline(time.monotonic() - 1)
+            with self.assertRaises(requests.Timeout):
+                http_client.post("https://example.com/slow", timeout=60)
+
+    def serve(self, delay=0.0):
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                time.sleep(delay)
+                body = b"ok"
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return f"http://127.0.0.1:{server.server_port}"
+
+    def test_repeat_requests_to_one_host_reuse_a_connection(self):
+        url = f"{self.serve()}/quote"
+        for _ in range(3):
+            self.assertEqual(http_client.get(url, timeout=5).text, "ok")
+        host = http_client.connection_stats()["hosts"]["127.0.0.1"]
+        self.assertEqual(host, {"requests": 3, "failed": 0, "connections": 1})
+
+    @unittest.skipUnless(http_client.aiohttp, "aiohttp is not installed")
+    def test_slow_fan_out_overlaps_on_real_sockets(self):
+        base = self.serve(delay=0.3)
+        started = time.monotonic()
+        # Five stays within the test server's listen backlog; one at a time would take 1.5s.
+        responses = http_client.get_many([f"{base}/chart/{i}" for i in range(5)], timeout=5)
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertEqual([response.text for response in responses], ["ok"] * 5)
+
+    def test_requests_stands_in_when_aiohttp_is_missing(self):
+        url = f"{self.serve()}/quote"
+        with patch.object(http_client, "aiohttp", None):
+            response = http_client.get(url, timeout=5)
+        self.assertIsInstance(response, requests.Response)
+        self.assertEqual((response.status_code, response.text), (200, "ok"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import random
+import unittest
+
+import daily_brief
+import generate
+from keyword_matcher import KeywordMatcher
+
+
+def loop_bangkok_score(title, summary=""):
+    """The per-term substring scan fetch_bangkok_post used before the matcher."""
+    text = (title + " " + summary).lower()
+    points = sum(3 for term in generate.EXPAT_RELEVANT_TERMS if term in text)
+    points -= sum(4 for term in generate.EXPAT_REJECT_TERMS if term in text)
+    if any(term in text for term in generate.EXPAT_VISA_TERMS):
+        points += 8
+    if any(term in text for term in generate.EXPAT_CRIME_TERMS):
+        points += 5
+    if any(term in text for term in generate.EXPAT_CITY_TERMS):
+        points += 2
+    return points
+
+
+class KeywordMatcherTests(unittest.TestCase):
+    def test_overlapping_and_nested_terms_all_match(self):
+        matcher = KeywordMatcher(["foreign", "foreigner", "he", "she", "hers", "dow "])
+
+        self.assertEqual(matcher.found("Foreigners say SHE hers"), {"foreign", "foreigner", "he", "she", "hers"})
+        self.assertTrue(matcher.matches("Dow jumps"))
+        self.assertFalse(matcher.matches("Dowdy markets"))
+        self.assertEqual(KeywordMatcher({"gold": 2, "gold miners": 5}).score("Gold miners rally on gold"), 7)
+
+    def test_matches_the_substring_scan_on_random_text(self):
+        rng = random.Random(22)
+        terms = ["".join(rng.choice("abc ") for _ in range(rng.randint(1, 4))) for _ in range(60)]
+        matcher = KeywordMatcher(terms)
+        for _ in range(300):
+            text = "".join(rng.choice("abcABC ") for _ in range(rng.randint(0, 40)))
+            self.assertEqual(matcher.found(text), {term.lower() for term in terms if term.lower() in text.lower()})
+
+    def test_expat_scoring_is_unchanged(self):
+        headlines = [
+            ("Foreigner arrested in Pattaya visa overstay crackdown", ""),
+            ("Bangkok condo rents climb as baht weakens", "Tourist arrivals lift demand"),
+            ("Village chief wins lottery at temple fair", "Monk blesses durian harvest"),
+            ("Weather mild", ""),
+        ]
+        for title, summary in headlines:
+            self.assertEqual(generate.expat_score(title, summary), loop_bangkok_score(title, summary))
+
+    def test_daily_pick_prefers_first_matching_headline(self):
+        news = [{"title": "Quiet day", "url": "a"}, {"title": "Stocks slide as yields jump", "url": "b"},
+                {"title": "Oil spikes on Iran strike", "url": "c"}]
+        self.assertEqual(daily_brief._pick(news, daily_brief.MARKET_TERMS)["url"], "b")
+        self.assertEqual(daily_brief._pick(news, daily_brief.GEO_TERMS, {"b"})["url"], "c")
+        self.assertEqual(daily_brief._pick(news, ("nothing",))["url"], "a")
+
+
+if __name__ == "__main__":
+    unittest.main()
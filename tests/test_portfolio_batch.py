@@ -0,0 +1,69 @@
+import sys
+import types
+import unittest
+from unittest.mock import Mock, patch
+
+import generate
+
+
+def spark_item(symbol, closes):
+    return {"symbol": symbol, "response": [{"indicators": {"quote": [{"close": closes}]}}]}
+
+
+class FakeHistory:
+    def __init__(self, closes):
+        self.closes = closes
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return FakeColumn(self.closes)
+        return self
+
+    def __len__(self):
+        return len(self.closes)
+
+
+class FakeColumn:
+    def __init__(self, closes):
+        self.closes = closes
+
+    def notna(self):
+        return self
+
+    @property
+    def iloc(self):
+        return self.closes
+
+
+class PortfolioBatchQuoteTests(unittest.TestCase):
+    def test_batch_prices_known_symbols_and_falls_back_per_ticker(self):
+        holdings = [
+            {"ticker": "GLO.TO", "shares": 100, "currency": "CAD"},
+            {"ticker": "URNJ", "shares": 10, "currency": "USD"},
+            {"ticker": "BNNLF", "shares": 50, "currency": "USD"},
+        ]
+        spark = Mock(status_code=200)
+        spark.json.return_value = {"spark": {"result": [
+            spark_item("GLO.TO", [1.0, None, 2.0, 2.5]),
+            spark_item("URNJ", [20.0]),
+        ]}}
+        fake_yf = types.ModuleType("yfinance")
+        fake_yf.Ticker = Mock(return_value=Mock(history=Mock(return_value=FakeHistory([0.5, 0.55]))))
+
+        with patch.object(generate, "fetch_holdings_from_gsheet", return_value=(holdings, {})), \
+                patch.object(generate, "fetch_official_cse_hg_quote", return_value=None), \
+                patch.object(generate.http_client, "aget", return_value=spark) as get, \
+                patch.dict(sys.modules, {"yfinance": fake_yf}):
+            results, _, _ = generate.fetch_portfolio(usdcad=1.25)
+
+        get.assert_called_once()
+        self.assertIn("symbols=GLO.TO,URNJ,BNNLF", get.call_args.args[0])
+        fake_yf.Ticker.assert_called_once_with("BNNLF")
+        self.assertEqual(results["GLO.TO"], {"price": 2.5, "change": 25.0, "value": 200.0,
+                                             "currency": "CAD", "fallback": False})
+        self.assertEqual(results["URNJ"]["change"], None)
+        self.assertAlmostEqual(results["BNNLF"]["price"], 0.55)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import tempfile
+import unittest
+from datetime import date, datetime, timezone
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+
+import price_store
+from price_store import FIELDS, PriceStore, bars_from_chart, session_stamp
+
+
+class PriceStoreTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.store = PriceStore(Path(tmp.name))
+
+    def test_columns_are_fixed_dtype_memory_maps(self):
+        self.store.upsert("GC=F", [{"timestamp": 200, "open": 1, "high": 2, "low": 0.5, "close": 1.5, "volume": 10},
+                                   {"timestamp": 100, "close": 1.0}])
+        columns = self.store.read("GC=F")
+        self.assertEqual(set(columns), set(FIELDS))
+        for field, column in columns.items():
+            self.assertIsInstance(column, np.memmap)
+            self.assertEqual(column.dtype, FIELDS[field])
+        self.assertEqual(columns["timestamp"].tolist(), [100, 200])
+        self.assertTrue(np.isnan(columns["open"][0]))
+        self.assertEqual(self.store.tickers(), ["GC=F"])
+
+    def test_upsert_lets_fresh_bars_win_and_replace_drops_history(self):
+        self.store.upsert("ES=F", [{"timestamp": 1, "close": 10.0}, {"timestamp": 2, "close": 11.0}])
+        self.assertEqual(self.store.upsert("ES=F", [{"timestamp": 2, "close": 12.0}, {"timestamp": 3, "close": 13.0}]), 3)
+        self.assertEqual(self.store.read("ES=F")["close"].tolist(), [10.0, 12.0, 13.0])
+
+        self.store.upsert("ES=F", [{"timestamp": 3, "close": 14.0}], replace=True)
+        self.assertEqual(self.store.read("ES=F")["close"].tolist(), [14.0])
+
+    def test_a_write_that_dies_midway_leaves_the_previous_version_whole(self):
+        self.store.upsert("GC=F", [{"timestamp": 1, "close": 10.0}])
+        real_save = np.save
+
+        def save(path, array):
+            if Path(path).name == "close.npy":
+                raise OSError("disk full")
+            real_save(path, array)
+
+        with patch.object(price_store.np, "save", side_effect=save), self.assertRaises(OSError):
+            self.store.upsert("GC=F", [{"timestamp": 2, "close": 11.0}])
+
+        columns = self.store.read("GC=F")
+        self.assertEqual(columns["timestamp"].tolist(), [1])
+        self.assertEqual(columns["close"].tolist(), [10.0])
+        self.assertEqual(len([p for p in self.store.folder_for("GC=F").iterdir() if p.is_dir()]), 1)
+
+    def test_unversioned_columns_are_read_then_migrated(self):
+        folder = self.store.folder_for("SI=F")
+        folder.mkdir(parents=True)
+        for field, dtype in FIELDS.items():
+            np.save(folder / f"{field}.npy", np.array([5 if field == "timestamp" else 30.0], dtype=dtype))
+        self.assertEqual(self.store.tickers(), ["SI=F"])
+        self.assertEqual(self.store.upsert("SI=F", [{"timestamp": 6, "close": 31.0}]), 2)
+
+        self.assertEqual(self.store.read("SI=F")["close"].tolist(), [30.0, 31.0])
+        self.assertFalse((folder / "close.npy").exists())
+
+    def test_unknown_ticker_reads_as_empty_columns(self):
+        columns = self.store.read("NOPE")
+        self.assertEqual({len(column) for column in columns.values()}, {0})
+
+    def test_chart_bars_are_keyed_by_exchange_session_date(self):
+        # 01:00 UTC on the 3rd is still the 2nd in New York.
+        late = int(datetime(2026, 3, 3, 1, tzinfo=timezone.utc).timestamp())
+        result = {
+            "meta": {"exchangeTimezoneName": "America/New_York"},
+            "timestamp": [late, late + 86400],
+            "indicators": {"quote": [{"close": [5.0, None], "open": [4.0, None], "volume": [100, None]}]},
+        }
+        bars = bars_from_chart(result)
+        self.assertEqual(len(bars), 1)
+        self.assertEqual(bars[0]["timestamp"], session_stamp(date(2026, 3, 2)))
+        self.assertEqual((bars[0]["open"], bars[0]["volume"]), (4.0, 100))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import sys
+import tempfile
+import types
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import generate
+from bar_cache import BarCache
+from price_store import PriceStore
+from quote_plan import CLOSE, HISTORY, LAST, RANGE, QuotePlan
+
+
+def chart_result(closes):
+    """Chart-style result with daily bars at 20:00 UTC ending two days ago."""
+    last = datetime.now(timezone.utc).date() - timedelta(days=2)
+    days = [last - timedelta(days=offset) for offset in range(len(closes) - 1, -1, -1)]
+    return {
+        "meta": {"exchangeTimezoneName": "America/New_York"},
+        "timestamp": [int(datetime(d.year, d.month, d.day, 20, tzinfo=timezone.utc).timestamp()) for d in days],
+        "indicators": {"quote": [{"close": closes, "high": [c + 1 for c in closes], "low": [c - 1 for c in closes]}]},
+    }
+
+
+def yahoo(url, **_kwargs):
+    response = Mock(status_code=200)
+    if "/spark?" in url:
+        response.json.return_value = {"spark": {"result": [
+            {"symbol": "PHYS", "response": [chart_result([40.0, 44.0])]},
+        ]}}
+    else:
+        response.json.return_value = {"chart": {"result": [chart_result([20.0, 22.0])]}}
+    return response
+
+
+class QuotePlanTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        patcher = patch.object(generate, "BAR_CACHE", BarCache(PriceStore(Path(tmp.name))))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_overlapping_consumers_share_one_fetch_per_symbol(self):
+        plan = QuotePlan()
+        plan.add("portfolio", ["URNJ", "GLO.TO"], LAST, CLOSE, RANGE)
+        plan.add("evolution_fund", ["URNJ", "PHYS"], CLOSE, HISTORY)
+
+        self.assertEqual(plan.chart_symbols(), ["URNJ", "GLO.TO"])
+        self.assertEqual(plan.spark_symbols(), ["PHYS"])
+        self.assertEqual(plan.fields("URNJ"), {LAST, CLOSE, RANGE, HISTORY})
+        self.assertEqual(plan.consumers("URNJ"), ["portfolio", "evolution_fund"])
+        self.assertEqual(plan.summary(), {"symbols": 3, "requested": 4, "shared": 1, "charts": 2, "spark": 1})
+        with self.assertRaises(ValueError):
+            plan.add("portfolio", ["URNJ"], "bid")
+
+    def test_every_page_reads_the_universe_without_refetching(self):
+        holdings = [{"ticker": "URNJ", "shares": 10, "currency": "USD"},
+                    {"ticker": "_OFF_YAHOO", "shares": 5, "currency": "CAD", "fallback_price": 1.0}]
+        rrsp = [{"symbol": "URNJ", "sheet_symbol": "URNJ"}]
+        fake_yf = types.ModuleType("yfinance")
+        fake_yf.Ticker = Mock()
+        with patch.object(generate.http_client, "aget", side_effect=yahoo) as get, \
+                patch.object(generate, "fetch_official_cse_hg_quote", return_value=None), \
+                patch.dict(sys.modules, {"yfinance": fake_yf}):
+            universe = generate.fetch_quote_universe(generate.plan_quotes(holdings, rrsp))
+            fetched = [call.args[0] for call in get.call_args_list]
+
+            results, _, _ = generate.fetch_portfolio(usdcad=1.25, sheet=(holdings, {}), quotes=universe)
+            generate.apply_completed_close_changes(results, ["URNJ"], charts=universe)
+            evo = generate.value_evolution_fund({}, quotes=universe)
+
+        self.assertEqual(get.call_count, len(fetched))
+        charts = [url for url in fetched if "/chart/" in url]
+        self.assertEqual(len(charts), 1)
+        self.assertIn("/chart/URNJ?", charts[0])
+        self.assertTrue(all("URNJ" not in url for url in fetched if "/spark?" in url))
+        fake_yf.Ticker.assert_not_called()
+        self.assertEqual((results["URNJ"]["price"], results["URNJ"]["close_price"]), (22.0, 22.0))
+        self.assertAlmostEqual(results["URNJ"]["change"], 10.0)
+        self.assertEqual(results["URNJ"]["day_high"], 23.0)
+        prices = {position["ticker"]: position["price"] for position in evo["positions"]}
+        self.assertEqual((prices["URNJ"], prices["PHYS"]), (22.0, 44.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
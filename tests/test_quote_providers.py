@@ -0,0 +1,71 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import generate
+from quote_providers import QuoteProvider, QuoteRegistry
+
+
+def iso(seconds_ago):
+    return (datetime.now(timezone.utc) - timedelta(seconds=seconds_ago)).isoformat()
+
+
+class QuoteRegistryTests(unittest.TestCase):
+    def test_later_providers_only_see_unresolved_keys(self):
+        asked = []
+
+        def primary(keys):
+            asked.append(("primary", keys))
+            return {"A": {"price": 1.0, "change": 0.1}, "B": {"price": 2.0, "change": None}}
+
+        def backup(keys):
+            asked.append(("backup", keys))
+            return {key: {"price": 9.0, "change": 0.0, "source": "backup"} for key in keys}
+
+        registry = QuoteRegistry()
+        registry.register("test", [QuoteProvider("primary", primary), QuoteProvider("backup", backup)])
+        quotes = registry.resolve("test", ["A", "B", "C"])
+
+        self.assertEqual(asked, [("primary", ["A", "B", "C"]), ("backup", ["B", "C"])])
+        self.assertEqual(quotes["A"]["price"], 1.0)
+        self.assertEqual(quotes["B"]["source"], "backup")
+        health = registry.summary()
+        self.assertEqual((health["test/primary"]["served"], health["test/primary"]["missed"]), (1, 2))
+
+    def test_stale_quotes_and_failing_providers_fall_through(self):
+        def frozen(keys):
+            return {key: {"price": 1.0, "change": 0.0, "quote_time": iso(3600)} for key in keys}
+
+        def down(keys):
+            raise RuntimeError("offline")
+
+        def last(keys):
+            return {key: {"price": 3.0, "change": 0.0} for key in keys}
+
+        registry = QuoteRegistry()
+        registry.register("test", [QuoteProvider("frozen", frozen, max_age=300),
+                                   QuoteProvider("down", down),
+                                   QuoteProvider("last", last, covers=frozenset({"X"}))])
+        with patch("builtins.print"):
+            quotes = registry.resolve("test", ["X", "Y"])
+
+        self.assertEqual(quotes, {"X": {"price": 3.0, "change": 0.0}})
+        health = registry.summary()
+        self.assertEqual(health["test/frozen"]["stale"], 2)
+        self.assertEqual(health["test/down"]["failed"], 1)
+
+    def test_futures_only_scrape_investing_when_yahoo_misses(self):
+        yahoo = {"price": 7747.25, "previous": 7700.0, "change": 0.61, "quote_time": iso(60)}
+        with patch.object(generate, "yahoo_chart_quotes", return_value={"ES=F": yahoo, "NQ=F": yahoo}), \
+                patch.object(generate, "fetch_investing_futures",
+                             return_value={"YM=F": {"exchange": {"price": 44000.0, "change": 0.2}}}) as investing:
+            futures = generate.fetch_market_futures()
+
+        investing.assert_called_once()
+        self.assertFalse(futures["ES=F"]["is_fallback"])
+        self.assertEqual(futures["YM=F"]["price"], 44000.0)
+        self.assertTrue(futures["YM=F"]["is_fallback"])
+
+
+if __name__ == "__main__":
+    unittest.main()
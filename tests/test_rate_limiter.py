@@ -0,0 +1,55 @@
+import threading
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+import http_client
+import rate_limiter
+from rate_limiter import RateLimiter, TokenBucket, retry_after_seconds
+
+
+class RateLimiterTests(unittest.TestCase):
+    def test_burst_is_free_then_requests_are_paced(self):
+        bucket = TokenBucket(rate=20.0, burst=3)
+        started = time.monotonic()
+        for _ in range(3):
+            self.assertEqual(bucket.acquire(), 0.0)
+        self.assertLess(time.monotonic() - started, 0.05)
+        bucket.acquire()
+        bucket.acquire()
+        self.assertGreaterEqual(time.monotonic() - started, 0.09)
+
+    def test_bucket_is_shared_across_threads(self):
+        limiter = RateLimiter({"query1.finance.yahoo.com": (50.0, 5)})
+        started = time.monotonic()
+        threads = [threading.Thread(target=limiter.acquire, args=("query1.finance.yahoo.com",)) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # Five tokens up front, five more at 50/s.
+        self.assertGreaterEqual(time.monotonic() - started, 0.09)
+        self.assertEqual(limiter.acquire("api.unlisted.example"), 0.0)
+
+    def test_retry_after_accepts_seconds_and_dates_and_is_capped(self):
+        self.assertEqual(retry_after_seconds("3"), 3.0)
+        self.assertEqual(retry_after_seconds(None), rate_limiter.DEFAULT_RETRY_AFTER)
+        self.assertEqual(retry_after_seconds("86400"), rate_limiter.MAX_RETRY_AFTER)
+        self.assertEqual(retry_after_seconds("Wed, 21 Oct 2015 07:28:00 GMT"), 0.0)
+
+    def test_429_pauses_the_host_and_retries_once(self):
+        throttled = Mock(status_code=429, headers={"Retry-After": "0.2"}, content=b"")
+        ok = Mock(status_code=200, headers={}, content=b"{}")
+        limiter = RateLimiter({"www.reddit.com": (100.0, 5)})
+        with patch.object(http_client, "RATE_LIMITER", limiter), patch.object(
+            http_client, "_send", side_effect=[throttled, ok]
+        ) as send:
+            started = time.monotonic()
+            self.assertIs(http_client.get("https://www.reddit.com/r/uraniumsqueeze/hot.json", timeout=5), ok)
+        self.assertEqual(send.call_count, 2)
+        self.assertGreaterEqual(time.monotonic() - started, 0.2)
+        self.assertEqual(limiter.summary()["throttled"], {"www.reddit.com": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
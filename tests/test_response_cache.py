@@ -0,0 +1,121 @@
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import requests
+
+import response_cache
+
+SNAPSHOT_URL = "https://cdn.jsdelivr.net/npm/@fawazahmed0/currency-api@2026-10-16/v1/currencies/usd.min.json"
+FEED_URL = "https://www.youtube.com/feeds/videos.xml?channel_id=UC0"
+URANIUM_URL = "https://tradingeconomics.com/commodity/uranium"
+OMDB_URL = "https://www.omdbapi.com/?apikey=SECRET&t=Dune&y=2024"
+
+
+def cached_get(send, url, **kwargs):
+    return asyncio.run(response_cache.cached_get(send, url, **kwargs))
+
+
+def make_response(body=b"{}", status=200, headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response._content = body
+    response.headers.update(headers or {})
+    return response
+
+
+class ResponseCacheTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        patcher = patch.object(response_cache, "CACHE_DIR", Path(tmp.name))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def age_entry(self, url, seconds):
+        meta_path, _ = response_cache._paths(url)
+        meta = response_cache.json.loads(meta_path.read_text())
+        meta["fetched_at"] -= seconds
+        meta_path.write_text(response_cache.json.dumps(meta))
+
+    def test_uncached_sources_pass_straight_through(self):
+        send = AsyncMock(return_value=make_response())
+        cached_get(send, "https://api.binance.com/api/v3/ticker/24hr")
+        cached_get(send, "https://api.binance.com/api/v3/ticker/24hr")
+        self.assertEqual(send.call_count, 2)
+
+    def test_dated_fx_snapshot_is_kept_forever(self):
+        send = AsyncMock(return_value=make_response(b'{"date": "2026-10-16"}'))
+        cached_get(send, SNAPSHOT_URL, timeout=12)
+        self.age_entry(SNAPSHOT_URL, 365 * response_cache.DAY)
+        cached = cached_get(send, SNAPSHOT_URL, timeout=12)
+        self.assertEqual(cached.json(), {"date": "2026-10-16"})
+        self.assertTrue(cached.from_cache)
+        send.assert_called_once()
+
+    def test_expired_entry_revalidates_with_etag(self):
+        send = AsyncMock(side_effect=[
+            make_response(b"<feed/>", headers={"ETag": '"v1"', "Content-Type": "application/xml"}),
+            make_response(b"", status=304),
+        ])
+        cached_get(send, FEED_URL, headers={"User-Agent": "NovaireSignal/1.0"})
+        revalidated = cached_get(send, FEED_URL, headers={"User-Agent": "NovaireSignal/1.0"})
+        self.assertEqual(revalidated.content, b"<feed/>")
+        self.assertEqual(send.call_args.kwargs["headers"],
+                         {"User-Agent": "NovaireSignal/1.0", "If-None-Match": '"v1"'})
+
+    def test_recent_copy_stands_in_for_a_failed_upstream(self):
+        send = AsyncMock(side_effect=[make_response(b"Uranium at 82.5 USD/Lbs"), requests.ConnectionError("down")])
+        cached_get(send, URANIUM_URL)
+        self.age_entry(URANIUM_URL, 7 * response_cache.HOUR)
+        self.assertEqual(cached_get(send, URANIUM_URL).text, "Uranium at 82.5 USD/Lbs")
+
+        self.age_entry(URANIUM_URL, response_cache.STALE_IF_ERROR)
+        send.side_effect = requests.ConnectionError("still down")
+        with self.assertRaises(requests.ConnectionError):
+            cached_get(send, URANIUM_URL)
+
+    def test_stored_metadata_never_keeps_the_api_key(self):
+        send = AsyncMock(return_value=make_response(b'{"Title": "Dune"}'))
+        cached_get(send, OMDB_URL)
+        meta_path, _ = response_cache._paths(OMDB_URL)
+        self.assertNotIn("SECRET", meta_path.read_text())
+        self.assertEqual(response_cache.json.loads(meta_path.read_text())["url"],
+                         "https://www.omdbapi.com/?t=Dune&y=2024")
+        self.assertEqual(cached_get(send, OMDB_URL).json(), {"Title": "Dune"})
+        send.assert_called_once()
+
+    def test_prune_drops_entries_unused_for_the_retention_window(self):
+        send = AsyncMock(return_value=make_response(b"{}"))
+        cached_get(send, SNAPSHOT_URL)
+        cached_get(send, URANIUM_URL)
+        month_ago = time.time() - response_cache.RETENTION - response_cache.HOUR
+        for url in (SNAPSHOT_URL, URANIUM_URL):
+            meta_path, _ = response_cache._paths(url)
+            os.utime(meta_path, (month_ago, month_ago))
+        cached_get(send, SNAPSHOT_URL)  # A hit counts as use.
+
+        self.assertEqual(response_cache.prune(), 1)
+        self.assertTrue(all(path.exists() for path in response_cache._paths(SNAPSHOT_URL)))
+        self.assertFalse(any(path.exists() for path in response_cache._paths(URANIUM_URL)))
+        self.assertEqual(send.call_count, 2)
+
+    def test_prune_scrubs_keys_left_by_older_builds(self):
+        meta_path, body_path = response_cache._paths(OMDB_URL)
+        meta_path.parent.mkdir(parents=True)
+        body_path.write_bytes(b"{}")
+        meta_path.write_text(response_cache.json.dumps({"url": OMDB_URL, "status": 200, "fetched_at": time.time()}))
+        last_used = time.time() - response_cache.DAY
+        os.utime(meta_path, (last_used, last_used))
+
+        self.assertEqual(response_cache.prune(), 0)
+        self.assertNotIn("SECRET", meta_path.read_text())
+        self.assertAlmostEqual(meta_path.stat().st_mtime, last_used, places=3)
+
+
+if __name__ == "__main__":
+    unittest.main()
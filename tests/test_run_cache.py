@@ -0,0 +1,97 @@
+import os
+import threading
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+import generate
+from run_cache import RunCache
+from stage_scheduler import Stage, run_stages
+
+
+class RunCacheTests(unittest.TestCase):
+    def test_calls_pass_through_outside_a_run(self):
+        cache = RunCache()
+        upstream = Mock(side_effect=[1, 2])
+        fetch = cache.memoize(upstream)
+        self.assertEqual((fetch(), fetch()), (1, 2))
+        self.assertEqual(cache.summary(), {"upstream_calls": 0, "saved_calls": 0})
+
+    def test_duplicate_calls_share_one_result_per_run_and_arguments(self):
+        cache = RunCache()
+        upstream = Mock(side_effect=lambda symbol: {"symbol": symbol})
+        fetch = cache.memoize(upstream)
+        with cache.run():
+            first = fetch("HG.CN")
+            self.assertIs(fetch("HG.CN"), first)
+            fetch("GLO.TO")
+            self.assertEqual(cache.summary(), {"upstream_calls": 2, "saved_calls": 1})
+        self.assertEqual(upstream.call_count, 2)
+        with cache.run():
+            fetch("HG.CN")
+        self.assertEqual(upstream.call_count, 3)
+
+    def test_concurrent_callers_wait_for_the_in_flight_fetch(self):
+        cache = RunCache()
+        calls = []
+
+        @cache.memoize
+        def slow():
+            calls.append(1)
+            time.sleep(0.1)
+            return "quote"
+
+        with cache.run():
+            results = []
+            threads = [threading.Thread(target=lambda: results.append(slow())) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(results, ["quote"] * 4)
+        self.assertEqual(len(calls), 1)
+
+    def test_callers_stop_waiting_once_the_fetching_stage_is_abandoned(self):
+        cache = RunCache()
+        release = threading.Event()
+        self.addCleanup(release.set)
+        calls = []
+
+        def upstream():
+            calls.append(threading.current_thread().name)
+            if len(calls) == 1:
+                release.wait(5)  # the stage's call hangs
+            return len(calls)
+
+        fetch = cache.memoize(upstream)
+        with cache.run():
+            run_stages([Stage("slow", fetch, fallback=0, budget=0.1)])
+            started = time.monotonic()
+            self.assertEqual(fetch(), 2)
+        self.assertLess(time.monotonic() - started, 1.0)
+
+    def test_failures_are_not_remembered(self):
+        cache = RunCache()
+        upstream = Mock(side_effect=[RuntimeError("timeout"), "ok"])
+        fetch = cache.memoize(upstream)
+        with cache.run():
+            with self.assertRaises(RuntimeError):
+                fetch()
+            self.assertEqual(fetch(), "ok")
+
+    def test_alpaca_is_fetched_once_for_both_pages(self):
+        response = Mock()
+        response.raise_for_status.return_value = None
+        response.json.return_value = {"ok": True, "equity": 500.0, "positions": []}
+        empty_credentials = {"ALPACA_API_KEY": "", "APCA_API_KEY_ID": "", "ALPACA_SECRET_KEY": "", "APCA_API_SECRET_KEY": ""}
+        with patch.dict(os.environ, empty_credentials, clear=False), patch.object(
+            generate.http_client, "get", return_value=response
+        ) as get, generate.RUN_CACHE.run():
+            main_page = generate.fetch_alpaca()
+            portfolio_page = generate.fetch_alpaca()
+        self.assertIs(main_page, portfolio_page)
+        get.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
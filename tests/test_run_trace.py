@@ -0,0 +1,52 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+
+import http_client
+from run_trace import TRACE
+from stage_scheduler import Stage, run_stages
+
+
+class RunTraceTests(unittest.TestCase):
+    def setUp(self):
+        TRACE.reset()
+        self.addCleanup(TRACE.reset)
+
+    def test_requests_are_attributed_to_their_stage_and_strip_query_strings(self):
+        response = Mock(status_code=200, content=b"x" * 42)
+
+        def crypto():
+            http_client.get_many(["https://api.binance.com/api/v3/ticker/24hr?symbol=BTCUSDT"])
+            return {}
+
+        with patch.object(http_client, "_send", return_value=response):
+            run_stages([Stage("crypto", crypto)])
+        trace = TRACE.to_dict()
+        [request] = trace["requests"]
+        self.assertEqual(request["stage"], "crypto")
+        self.assertEqual(request["url"], "https://api.binance.com/api/v3/ticker/24hr")
+        self.assertEqual((request["status"], request["bytes"], request["attempt"]), (200, 42, 0))
+        self.assertEqual(trace["hosts"]["api.binance.com"]["bytes"], 42)
+        self.assertEqual([(s["stage"], s["outcome"]) for s in trace["stages"]], [("crypto", "ok")])
+
+    def test_degraded_stages_and_phases_are_recorded(self):
+        def broken():
+            raise RuntimeError("upstream down")
+
+        with TRACE.span("fetch"):
+            run_stages([Stage("fx", broken, fallback={"usdcad": 1.365})])
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "run_trace.json")
+            TRACE.write(path)
+            with open(path, encoding="utf-8") as f:
+                trace = json.load(f)
+        self.assertEqual(trace["fallbacks"][0]["kind"], "stage")
+        self.assertEqual(trace["fallbacks"][0]["stage"], "fx")
+        self.assertEqual(trace["fallbacks"][0]["value"], "fallback")
+        self.assertEqual([phase["name"] for phase in trace["phases"]], ["fetch"])
+
+
+if __name__ == "__main__":
+    unittest.main()
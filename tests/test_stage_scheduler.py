@@ -0,0 +1,151 @@
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import generate
+import price_store
+from stage_scheduler import LastGoodStore, Stage, abandoned, run_stages
+
+
+class StageSchedulerTests(unittest.TestCase):
+    def test_dependents_receive_upstream_results_in_declared_order(self):
+        stages = [
+            Stage("fx", lambda: {"usdcad": 1.4}),
+            Stage("prices", lambda: {"HG.CN": 7.0}),
+            Stage("value", lambda prices, fx: prices["HG.CN"] * 100 / fx["usdcad"], needs=("prices", "fx")),
+        ]
+        results = run_stages(stages, max_workers=2)
+        self.assertAlmostEqual(results["value"], 500.0)
+
+    def test_independent_stages_overlap_instead_of_summing(self):
+        barrier = threading.Barrier(3, timeout=2)
+
+        def slow():
+            barrier.wait()
+            time.sleep(0.2)
+            return True
+
+        started = time.monotonic()
+        results = run_stages([Stage(f"s{i}", slow) for i in range(3)], max_workers=3)
+        self.assertTrue(all(results.values()))
+        self.assertLess(time.monotonic() - started, 0.5)
+
+    def test_failed_stage_degrades_to_fallback_and_dependents_still_run(self):
+        def broken():
+            raise RuntimeError("upstream down")
+
+        stages = [
+            Stage("fx", broken, fallback={"usdcad": 1.365}),
+            Stage("rrsp", lambda fx: fx["usdcad"], needs=("fx",)),
+        ]
+        results = run_stages(stages)
+        self.assertEqual(results["fx"], {"usdcad": 1.365})
+        self.assertEqual(results["rrsp"], 1.365)
+
+    def test_unknown_and_cyclic_dependencies_are_rejected(self):
+        with self.assertRaises(ValueError):
+            run_stages([Stage("a", lambda b: b, needs=("missing",))])
+        with self.assertRaises(ValueError):
+            run_stages([Stage("a", lambda b: b, needs=("b",)), Stage("b", lambda a: a, needs=("a",))])
+
+    def test_overrunning_stage_degrades_to_last_good_without_blocking(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        with tempfile.TemporaryDirectory() as folder:
+            store = LastGoodStore(folder)
+            store.save("commodities", {"GOLD": 4100.0})
+            degraded = {}
+            started = time.monotonic()
+            results = run_stages([
+                Stage("commodities", lambda: release.wait(5), fallback={}, budget=0.2),
+                Stage("page", lambda commodities: sorted(commodities), needs=("commodities",)),
+            ], last_good=store, degraded=degraded)
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertEqual(results["commodities"], {"GOLD": 4100.0})
+        self.assertEqual(results["page"], ["GOLD"])
+        self.assertEqual(degraded["commodities"]["reason"], "budget")
+        self.assertEqual(degraded["commodities"]["value"], "last_good")
+
+    def test_abandoned_stage_is_told_and_its_store_writes_are_dropped(self):
+        release, done = threading.Event(), threading.Event()
+        self.addCleanup(release.set)
+        seen = {}
+        with tempfile.TemporaryDirectory() as folder:
+            store = price_store.PriceStore(Path(folder))
+
+            def slow():
+                seen["before"] = abandoned()
+                release.wait(5)
+                seen["after"] = abandoned()
+                store.upsert("GC=F", [{"timestamp": 1, "close": 4100.0}])
+                done.set()
+
+            run_stages([Stage("slow", slow, budget=0.1)])
+            release.set()
+            self.assertTrue(done.wait(2))
+            self.assertEqual(store.tickers(), [])
+        self.assertEqual(seen, {"before": False, "after": True})
+        self.assertFalse(abandoned())
+
+    def test_run_deadline_caps_unbudgeted_stages_and_successes_are_remembered(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        with tempfile.TemporaryDirectory() as folder:
+            store = LastGoodStore(folder)
+            degraded = {}
+            results = run_stages([
+                Stage("crypto", lambda: {"BTC": 1}),
+                Stage("feed", lambda: release.wait(5), fallback="stale"),
+            ], deadline=time.monotonic() + 0.2, last_good=store, degraded=degraded)
+            self.assertEqual(store.load("crypto")[:2], (True, {"BTC": 1}))
+        self.assertEqual(results["feed"], "stale")
+        self.assertEqual(list(degraded), ["feed"])
+        self.assertEqual((degraded["feed"]["reason"], degraded["feed"]["value"]), ("run deadline", "fallback"))
+
+    def test_run_deadline_also_bounds_instagram_metrics(self):
+        item = generate.load_latest_instagram()
+        self.addCleanup(generate.http_client.set_deadline, None)
+        generate.http_client.set_deadline(time.monotonic() - 1)
+        with patch.object(generate.http_client, "_send") as send:
+            self.assertEqual(generate.fetch_live_instagram_metrics(item), item)
+        send.assert_not_called()
+
+    def test_degraded_portfolio_stage_never_writes_a_close(self):
+        def degraded_run(stages, degraded, **kwargs):
+            results = {stage.name: stage.fallback for stage in stages}
+            # Last-good pickles from an earlier run: complete-looking totals.
+            results["portfolio"] = ({}, generate.HOLDINGS, {"total_cad": 123456.0, "total_usd": 90000.0})
+            results["kraken"] = {"total_cad": 5000.0, "total_usd": 3600.0}
+            degraded["portfolio"] = {"reason": "budget", "value": "last_good"}
+            return results
+
+        class StopBuild(Exception):
+            pass
+
+        with tempfile.TemporaryDirectory() as folder:
+            history_path = Path(folder) / "portfolio_history.json"
+            history_path.write_text('{"schema_version": 1, "snapshots": []}\n', encoding="utf-8")
+            with patch.object(generate, "run_stages", side_effect=degraded_run), \
+                    patch.object(generate, "PORTFOLIO_HISTORY_PATH", history_path), \
+                    patch.object(generate, "build_tracker_model", side_effect=StopBuild):
+                with self.assertRaises(StopBuild):
+                    generate.build_site()
+            self.assertEqual(history_path.read_text(encoding="utf-8"), '{"schema_version": 1, "snapshots": []}\n')
+
+    def test_build_graph_declares_fx_and_portfolio_inputs(self):
+        stages = {stage.name: stage for stage in generate.build_fetch_stages()}
+        self.assertEqual(stages["quotes"].needs, ("holdings", "rrsp_rows"))
+        self.assertEqual(stages["portfolio"].needs, ("fx", "holdings", "quotes"))
+        self.assertEqual(stages["rrsp"].needs, ("fx", "rrsp_rows", "quotes"))
+        self.assertEqual(stages["catalysts"].needs, ("portfolio",))
+        self.assertEqual(stages["weather"].needs, ())
+        # build_site reads wins/losses straight off the win-rate card's result.
+        self.assertEqual(stages["polymarket_win_rate"].fallback, {"win_rate": 0, "wins": 0, "losses": 0, "total": 0})
+        self.assertEqual(stages["portfolio"].fallback[1], generate.HOLDINGS)
+
+
+if __name__ == "__main__":
+    unittest.main()
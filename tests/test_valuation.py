@@ -0,0 +1,73 @@
+import random
+import unittest
+
+import valuation
+
+
+def loop_daily_pnl(values, changes):
+    current_total = previous_total = 0.0
+    for value, change in zip(values, changes):
+        if value is None or change is None or 1.0 + change / 100.0 <= 0:
+            continue
+        current_total += value
+        previous_total += value / (1.0 + change / 100.0)
+    amount = current_total - previous_total
+    return amount, (amount / previous_total * 100.0) if previous_total else 0.0
+
+
+class ValuationTests(unittest.TestCase):
+    def test_values_weights_and_sectors_match_per_position_loop(self):
+        rng = random.Random(19)
+        size = 400
+        shares = [rng.uniform(1, 20000) for _ in range(size)]
+        prices = [None if i % 37 == 0 else rng.uniform(0.05, 80) for i in range(size)]
+        currencies = [rng.choice(["CAD", "USD", "AUD"]) for _ in range(size)]
+        sectors = [rng.choice(["Uranium", "Silver", "Copper", "Gold"]) for _ in range(size)]
+        fx = {"CAD": 1 / 1.37, "AUD": 0.65}
+
+        valued = valuation.value_positions(shares, prices, currencies=currencies, fx=fx, sectors=sectors)
+
+        expected = [None if p is None else s * p * fx.get(c, 1.0) for s, p, c in zip(shares, prices, currencies)]
+        total = sum(v for v in expected if v is not None)
+        self.assertAlmostEqual(valued["total_value"], total, places=6)
+        for got, want in zip(valued["value"], expected):
+            if want is None:
+                self.assertIsNone(got)
+            else:
+                self.assertAlmostEqual(got, want, places=9)
+        self.assertAlmostEqual(sum(w for w in valued["weight_pct"] if w is not None), 100.0, places=9)
+        sector_totals = {}
+        for sector, value in zip(sectors, expected):
+            if value is not None:
+                sector_totals[sector] = sector_totals.get(sector, 0) + value
+        self.assertEqual(list(valued["sector_totals"]), list(sector_totals))
+        for sector, value in sector_totals.items():
+            self.assertAlmostEqual(valued["sector_totals"][sector], value, places=6)
+
+    def test_gain_loss_uses_cost_basis_and_zero_cost_reports_zero(self):
+        valued = valuation.value_positions([10, 5], [12.0, 3.0], avg_costs=[8.0, 0.0])
+
+        self.assertEqual(valued["cost"], [80.0, 0.0])
+        self.assertEqual(valued["gl"], [40.0, 15.0])
+        self.assertEqual(valued["gl_pct"], [50.0, 0.0])
+        self.assertEqual(valued["total_cost"], 80.0)
+
+    def test_daily_pnl_matches_loop_and_skips_unusable_changes(self):
+        values = [1000.0, None, 250.0, 400.0, 90.0]
+        changes = [2.5, 4.0, None, -100.0, -3.0]
+
+        amount, percent = valuation.daily_pnl(values, changes)
+        want_amount, want_percent = loop_daily_pnl(values, changes)
+
+        self.assertAlmostEqual(amount, want_amount, places=9)
+        self.assertAlmostEqual(percent, want_percent, places=9)
+        self.assertEqual(valuation.daily_pnl([], []), (0.0, 0.0))
+
+    def test_group_totals_keeps_first_seen_order_and_drops_empty_keys(self):
+        totals = valuation.group_totals(["Silver", "Uranium", "Silver", "Gold"], [1.5, 2.0, 0.5, None])
+
+        self.assertEqual(totals, {"Silver": 2.0, "Uranium": 2.0})
+
+
+if __name__ == "__main__":
+    unittest.main()
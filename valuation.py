@@ -0,0 +1,103 @@
+"""Vectorized position valuation shared by every portfolio account.
+
+Positions arrive as parallel sequences (shares, prices, currencies, daily %
+changes, average costs, sectors) and are valued in one NumPy pass. A
+missing price or change is NaN and drops out of every total the same way
+the old per-position loops skipped `None`, so a few hundred positions
+across accounts cost the same few array operations as ten.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Mapping, Sequence
+
+import numpy as np
+
+
+def _floats(values: Sequence[Any] | None, size: int) -> np.ndarray:
+    if values is None:
+        return np.full(size, np.nan)
+    floats = []
+    for value in values:
+        try:
+            floats.append(np.nan if value is None else float(value))
+        except (TypeError, ValueError):
+            floats.append(np.nan)
+    return np.array(floats, dtype=float)
+
+
+def _optional(array: np.ndarray) -> list[float | None]:
+    return [None if np.isnan(value) else float(value) for value in array]
+
+
+def fx_multipliers(currencies: Sequence[str], rates: Mapping[str, float]) -> np.ndarray:
+    """Base-currency units per unit of each position's currency (1.0 when unknown)."""
+    codes = np.asarray(currencies, dtype=object)
+    multipliers = np.ones(len(codes))
+    for code, rate in rates.items():
+        multipliers[codes == code] = rate
+    return multipliers
+
+
+def group_totals(keys: Sequence[str], amounts: Sequence[Any]) -> dict[str, float]:
+    """Sum `amounts` per key, ignoring missing amounts; keys in first-seen order."""
+    values = _floats(amounts, len(keys))
+    labels, first, inverse = np.unique(np.asarray(keys, dtype=object), return_index=True, return_inverse=True)
+    sums = np.bincount(inverse, weights=np.nan_to_num(values), minlength=len(labels))
+    present = np.bincount(inverse, weights=~np.isnan(values), minlength=len(labels)) > 0
+    order = np.argsort(first)
+    return {str(labels[i]): float(sums[i]) for i in order if present[i]}
+
+
+def daily_pnl(values: Sequence[Any], changes: Sequence[Any]) -> tuple[float, float]:
+    """Daily dollar P&L and return from current values plus daily % moves."""
+    current = _floats(values, 0)
+    change = _floats(changes, 0)
+    divisor = 1.0 + change / 100.0
+    valid = ~np.isnan(current) & ~np.isnan(change) & (divisor > 0)
+    current_total = float(current[valid].sum())
+    previous_total = float((current[valid] / divisor[valid]).sum())
+    amount = current_total - previous_total
+    percent = (amount / previous_total * 100.0) if previous_total else 0.0
+    return amount, percent
+
+
+def value_positions(
+    shares: Sequence[Any],
+    prices: Sequence[Any],
+    *,
+    currencies: Sequence[str] | None = None,
+    fx: Mapping[str, float] | None = None,
+    changes: Sequence[Any] | None = None,
+    avg_costs: Sequence[Any] | None = None,
+    sectors: Sequence[str] | None = None,
+) -> dict[str, Any]:
+    """Value every position in the base currency of `fx`.
+
+    Per-position results (`value`, `weight_pct`, `cost`, `gl`, `gl_pct`) are
+    lists with None where an input was missing; totals ignore those.
+    """
+    size = len(shares)
+    quantity = _floats(shares, size)
+    multiplier = fx_multipliers(currencies, fx) if currencies is not None and fx else np.ones(size)
+    value = quantity * _floats(prices, size) * multiplier
+    cost = quantity * _floats(avg_costs, size) * multiplier
+    gl = value - cost
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gl_pct = np.where(cost > 0, gl / cost * 100.0, 0.0)
+        gl_pct[np.isnan(gl)] = np.nan
+        total_value = float(np.nansum(value))
+        weight = value / total_value * 100.0 if total_value else np.where(np.isnan(value), np.nan, 0.0)
+    amount, percent = daily_pnl(value, _floats(changes, size)) if changes is not None else (0.0, 0.0)
+    return {
+        "value": _optional(value),
+        "weight_pct": _optional(weight),
+        "cost": _optional(cost),
+        "gl": _optional(gl),
+        "gl_pct": _optional(gl_pct),
+        "total_value": total_value,
+        "total_cost": float(np.nansum(cost)),
+        "daily_pnl": amount,
+        "daily_pct": percent,
+        "sector_totals": group_totals(sectors, value) if sectors is not None else {},
+    }